@@ -0,0 +1,276 @@
+"""
+Automatic ARIMA/SARIMA Order Selection
+Stepwise AIC/BIC search with concurrent candidate fits and a per-series result cache
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+
+warnings.filterwarnings('ignore')
+
+ORDER_CACHE_FILE = 'order_cache.json'
+
+
+def series_fingerprint(series, **config):
+    """
+    Stable hash of a series' values plus the search configuration
+    Returns: hex digest used as the cache key
+    """
+    values = np.ascontiguousarray(np.asarray(series, dtype=float))
+    digest = hashlib.sha1(values.tobytes())
+    digest.update(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def ndiffs(series, alpha=0.05, max_d=2):
+    """
+    Number of differences needed for stationarity (ADF test)
+    Returns: d in [0, max_d]
+    """
+    from statsmodels.tsa.stattools import adfuller
+
+    values = np.asarray(series, dtype=float)
+    for d in range(max_d + 1):
+        if len(values) < 10 or adfuller(values)[1] <= alpha:
+            return d
+        values = np.diff(values)
+    return max_d
+
+
+def nsdiffs(series, period, threshold=0.64):
+    """
+    Number of seasonal differences (0 or 1) from the STL seasonal strength
+    Returns: D
+    """
+    from statsmodels.tsa.seasonal import STL
+
+    values = np.asarray(series, dtype=float)
+    if period < 2 or len(values) < 2 * period + 1:
+        return 0
+    result = STL(values, period=period).fit()
+    strength = 1 - np.var(result.resid) / np.var(result.seasonal + result.resid)
+    return int(strength > threshold)
+
+
+def _evaluate(task):
+    """Worker: fit one candidate and return its information criteria"""
+    values, order, seasonal_order, trend = task
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    warnings.filterwarnings('ignore')
+    if trend is None:
+        # statsmodels' ARIMA default: a constant only when the model is not differenced
+        trend = 'c' if order[1] + seasonal_order[1] == 0 else 'n'
+    try:
+        fit = SARIMAX(values, order=order, seasonal_order=seasonal_order, trend=trend).fit(disp=False)
+    except Exception:
+        return order, seasonal_order, np.inf, np.inf
+    # A candidate whose optimizer did not converge cannot win on a bogus likelihood
+    if not fit.mle_retvals.get('converged', True):
+        return order, seasonal_order, np.inf, np.inf
+    return order, seasonal_order, float(fit.aic), float(fit.bic)
+
+
+class _SerialPool:
+    """Stand-in for a process pool that fits candidates one after another in this process"""
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def candidate_pool(workers=None):
+    """
+    Pool for concurrent candidate fits
+    Workers are forked: the training scripts search orders at module level, with no
+    __main__ guard to make spawn safe. Where fork is unavailable the candidates are
+    fitted serially in this process.
+    workers: Process count (None = os.cpu_count())
+    Returns: context manager with map()
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'))
+    return _SerialPool()
+
+
+def _load_cache(path):
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+
+def _save_cache(path, cache):
+    if not path:
+        return
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _neighbours(order, seasonal_order, max_p, max_q, max_P, max_Q, seasonal):
+    p, d, q = order
+    P, D, Q, s = seasonal_order
+    moves = [(dp, dq, 0, 0) for dp, dq in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1)]]
+    if seasonal:
+        moves += [(0, 0, dP, dQ) for dP, dQ in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1)]]
+    for dp, dq, dP, dQ in moves:
+        np_, nq, nP, nQ = p + dp, q + dq, P + dP, Q + dQ
+        if 0 <= np_ <= max_p and 0 <= nq <= max_q and 0 <= nP <= max_P and 0 <= nQ <= max_Q:
+            yield (np_, d, nq), (nP, D, nQ, s)
+
+
+def auto_order(series, seasonal=True, seasonal_period=12, criterion='aic', max_p=3, max_q=3,
+               max_P=2, max_Q=2, d=None, D=None, stepwise=True, max_models=60, workers=None,
+               cache_path=ORDER_CACHE_FILE, trend=None, pool=None):
+    """
+    Select (p,d,q)(P,D,Q,s) by AIC or BIC
+    series: pandas Series or array of observations
+    seasonal: Search seasonal orders too (SARIMA) or only (p,d,q) (ARIMA)
+    seasonal_period: s
+    criterion: 'aic' or 'bic'
+    d, D: Differencing orders (None = chosen by ADF / STL seasonal strength)
+    stepwise: Hyndman-Khandakar stepwise search; False evaluates the full grid
+    max_models: Upper bound on candidate fits for the stepwise search
+    workers: Process pool size for concurrent candidate fits (None = os.cpu_count())
+    cache_path: JSON file of fingerprint -> chosen orders (None disables the cache)
+    trend: Trend of the model that will be fitted with the chosen orders, so candidates are ranked
+           as it will be fitted: None for statsmodels ARIMA's default, 'n' for a default SARIMAX
+    pool: Existing candidate_pool() to fit candidates on (None = a new pool of `workers`)
+    Returns: dict with 'order', 'seasonal_order', criterion value, models fitted, cached flag
+    Raises: RuntimeError when no candidate could be fitted (nothing is cached)
+    """
+    values = np.asarray(series, dtype=float)
+    s = seasonal_period if seasonal else 0
+    config = {'seasonal': seasonal, 's': s, 'criterion': criterion, 'max': [max_p, max_q, max_P, max_Q],
+              'd': d, 'D': D, 'stepwise': stepwise, 'trend': trend}
+    key = series_fingerprint(values, **config)
+
+    cache = _load_cache(cache_path)
+    if key in cache:
+        hit = cache[key]
+        return {'order': tuple(hit['order']), 'seasonal_order': tuple(hit['seasonal_order']),
+                criterion: hit[criterion], 'models_fitted': 0, 'cached': True}
+
+    d = ndiffs(values) if d is None else d
+    D = (nsdiffs(values, s) if seasonal else 0) if D is None else D
+    if not seasonal:
+        max_P = max_Q = 0
+    if criterion not in ('aic', 'bic'):
+        raise ValueError("criterion must be 'aic' or 'bic'")
+    pick = 0 if criterion == 'aic' else 1
+
+    results = {}
+    with nullcontext(pool) if pool is not None else candidate_pool(workers) as pool:
+        def evaluate(candidates):
+            todo = [c for c in dict.fromkeys(candidates) if c not in results]
+            tasks = [(values, o, so, trend) for o, so in todo]
+            for order, seasonal_order, aic, bic in pool.map(_evaluate, tasks):
+                results[(order, seasonal_order)] = (aic, bic)
+
+        if stepwise:
+            start = [((2, d, 2), (1, D, 1, s)), ((0, d, 0), (0, D, 0, s)),
+                     ((1, d, 0), (1, D, 0, s)), ((0, d, 1), (0, D, 1, s))]
+            start = [(o, so if seasonal else (0, 0, 0, 0)) for o, so in start]
+            start = [(o, so) for o, so in start
+                     if o[0] <= max_p and o[2] <= max_q and so[0] <= max_P and so[2] <= max_Q]
+            evaluate(start)
+            best = min(results, key=lambda c: results[c][pick])
+            while len(results) < max_models:
+                neighbours = [(o, so if seasonal else (0, 0, 0, 0))
+                              for o, so in _neighbours(best[0], best[1], max_p, max_q, max_P, max_Q, seasonal)]
+                neighbours = [c for c in neighbours if c not in results][:max_models - len(results)]
+                if not neighbours:
+                    break
+                evaluate(neighbours)
+                candidate = min(neighbours, key=lambda c: results[c][pick])
+                if results[candidate][pick] >= results[best][pick]:
+                    break
+                best = candidate
+        else:
+            grid = [((p, d, q), (P, D, Q, s) if seasonal else (0, 0, 0, 0))
+                    for p in range(max_p + 1) for q in range(max_q + 1)
+                    for P in range(max_P + 1) for Q in range(max_Q + 1)]
+            evaluate(grid)
+            best = min(results, key=lambda c: results[c][pick])
+
+    order, seasonal_order = best
+    aic, bic = results[best]
+    if not np.isfinite(results[best][pick]):
+        raise RuntimeError(f"none of the {len(results)} candidate orders could be fitted")
+    cache = _load_cache(cache_path)
+    cache[key] = {'order': list(order), 'seasonal_order': list(seasonal_order), 'aic': aic, 'bic': bic}
+    _save_cache(cache_path, cache)
+
+    return {'order': order, 'seasonal_order': seasonal_order, criterion: results[best][pick],
+            'models_fitted': len(results), 'cached': False}
+
+
+def select_arima_order(series, auto=True, pool=None):
+    """
+    Non-seasonal ARIMA order for one series, ranked as statsmodels' ARIMA fits it
+    auto: False returns the fixed (2,1,2) order used before
+    pool: Existing candidate_pool() for the candidate fits
+    Falls back to the fixed order when no candidate could be fitted
+    """
+    if not auto:
+        return (2, 1, 2)
+    try:
+        return auto_order(series, seasonal=False, pool=pool)['order']
+    except RuntimeError as e:
+        print(f"  ✗ ARIMA order search failed ({e}); using (2, 1, 2)")
+        return (2, 1, 2)
+
+
+def select_orders(series, auto=True, seasonal_period=12):
+    """
+    ARIMA and SARIMA orders for one training series, both searched on one process pool
+    auto: False returns the fixed (2,1,2) and (1,1,1)(1,1,1,12) orders used before
+    SARIMA candidates are ranked without a trend, as the scripts fit SARIMAX
+    Returns: (arima_order, sarima_order, sarima_seasonal_order)
+    """
+    fixed = (2, 1, 2), (1, 1, 1), (1, 1, 1, seasonal_period)
+    if not auto:
+        return fixed
+    with candidate_pool() as pool:
+        try:
+            sarima = auto_order(series, seasonal_period=seasonal_period, trend='n', pool=pool)
+            sarima_order, sarima_seasonal_order = sarima['order'], sarima['seasonal_order']
+        except RuntimeError as e:
+            print(f"  ✗ SARIMA order search failed ({e}); using {fixed[1]}{fixed[2]}")
+            sarima_order, sarima_seasonal_order = fixed[1], fixed[2]
+        return select_arima_order(series, pool=pool), sarima_order, sarima_seasonal_order
+
+
+if __name__ == '__main__':
+    import time
+    from weather_data import PARAMETER_COLUMNS, PARAMETER_NAMES, load_sensor_data
+
+    print("="*80)
+    print("AUTOMATIC ARIMA / SARIMA ORDER SELECTION")
+    print("="*80)
+
+    df = load_sensor_data()
+    train = df[:int(len(df) * 0.8)]
+    for col in PARAMETER_COLUMNS:
+        start = time.perf_counter()
+        arima = auto_order(train[col], seasonal=False)
+        sarima = auto_order(train[col], seasonal_period=12, trend='n')
+        print(f"\n{PARAMETER_NAMES[col]} ({time.perf_counter() - start:.1f}s):")
+        print(f"  ARIMA{arima['order']} - AIC: {arima['aic']:.2f}"
+              f" {'(cached)' if arima['cached'] else ''}")
+        print(f"  SARIMA{sarima['order']}{sarima['seasonal_order']} - AIC: {sarima['aic']:.2f}"
+              f" {'(cached)' if sarima['cached'] else ''}")
@@ -0,0 +1,231 @@
+"""
+Walk-Forward Backtesting - Rolling-origin evaluation of every model family
+Cutoffs run in parallel worker processes; adjacent cutoffs reuse warm-started parameters
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from forecast_models import MODEL_FAMILIES, fit_forecast
+from run_store import RUN_DB, RunStore
+from stage_profile import stage
+from weather_data import (DATA_FILE, PARAMETER_COLUMNS, PARAMETER_NAMES,
+                          STATION_COL, load_sensor_data, station_of)
+
+
+def rolling_origins(n_obs, initial, horizon, step):
+    """
+    Cutoff positions for a rolling-origin backtest
+    n_obs: Length of the series
+    initial: Size of the first training window
+    horizon: Forecast length evaluated at each cutoff
+    step: Distance between consecutive cutoffs
+    Returns: list of cutoff positions (train = series[:cutoff])
+    """
+    return list(range(initial, n_obs - horizon + 1, step))
+
+
+def split_chains(cutoffs, n_chains):
+    """
+    Split cutoffs into contiguous chains, one per worker task
+
+    Within a chain cutoffs run in order so each fit can warm-start from
+    the previous one; chains run concurrently.
+    """
+    n_chains = max(1, min(n_chains, len(cutoffs)))
+    return [list(chain) for chain in np.array_split(cutoffs, n_chains) if len(chain)]
+
+
+def _run_chain(task):
+    """
+    Worker: fit one family at every cutoff of a chain, warm-starting as it goes
+    Returns: (forecast rows, failure rows for cutoffs whose cold retry also failed)
+    """
+    family, station, column, values, index, cutoffs, horizon, options = task
+    series = pd.Series(values, index=pd.DatetimeIndex(index))
+    parameter = PARAMETER_NAMES.get(column, column)
+    warm = None
+    rows = []
+    failures = []
+    for cutoff in cutoffs:
+        train = series.iloc[:cutoff]
+        actual = series.iloc[cutoff:cutoff + horizon].values
+        start = time.perf_counter()
+        try:
+            predicted, warm = fit_forecast(family, train, horizon, warm, **options)
+        except Exception:
+            # Retry cold once; a bad warm start should not lose the cutoff
+            try:
+                predicted, warm = fit_forecast(family, train, horizon, None, **options)
+            except Exception as e:
+                warm = None
+                failures.append((family, station, parameter, series.index[cutoff - 1], f"{type(e).__name__}: {e}"))
+                continue
+        fit_time = time.perf_counter() - start
+        predicted = np.asarray(predicted, dtype=float)[:len(actual)]
+        for h, (a, p) in enumerate(zip(actual, predicted), start=1):
+            rows.append((family, station, parameter, series.index[cutoff - 1], h, a, p, fit_time))
+    return rows, failures
+
+
+def run_backtest(df, families=None, columns=None, initial=None, horizon=60, step=15,
+                 workers=None, chains_per_series=None, options=None):
+    """
+    Rolling-origin backtest over every station, parameter and model family
+    df: Sensor DataFrame with 'DateTime' (and optionally 'Station')
+    families: Model family names (default: all of MODEL_FAMILIES)
+    columns: Parameter columns (default: all four)
+    initial: First training window in rows (default: half the series)
+    horizon: Steps forecast at each cutoff
+    step: Rows between cutoffs
+    workers: Process pool size (None = os.cpu_count())
+    chains_per_series: Contiguous warm-start chains per series (default: just enough to keep
+                       every worker busy, so warm-start chains stay as long as possible)
+    options: dict of family -> extra fit options (e.g. {'ARIMA': {'order': (1, 1, 1)}})
+    Returns: (DataFrame of per-cutoff, per-horizon forecasts and errors,
+              DataFrame of cutoffs where a fit failed even from a cold start, with the exception text)
+    """
+    families = list(families or MODEL_FAMILIES)
+    columns = list(columns or PARAMETER_COLUMNS)
+    options = options or {}
+    workers = workers or os.cpu_count() or 1
+
+    stations = station_of(df)
+    station_names = pd.unique(stations)
+    if chains_per_series is None:
+        n_series = len(station_names) * len(columns) * len(families)
+        chains_per_series = -(-workers // n_series)
+
+    tasks = []
+    for station in station_names:
+        station_df = df[stations == station].sort_values('DateTime')
+        index = station_df['DateTime'].values
+        start = initial if initial is not None else len(station_df) // 2
+        cutoffs = rolling_origins(len(station_df), start, horizon, step)
+        for column in columns:
+            values = station_df[column].to_numpy(dtype=float)
+            for family in families:
+                for chain in split_chains(cutoffs, chains_per_series):
+                    tasks.append((family, station, column, values, index, chain, horizon,
+                                  options.get(family, {})))
+
+    if workers == 1:
+        chains = [_run_chain(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chains = list(pool.map(_run_chain, tasks))
+    rows = [row for chain_rows, _ in chains for row in chain_rows]
+    failures = [row for _, chain_failures in chains for row in chain_failures]
+
+    results = pd.DataFrame(rows, columns=['Model', STATION_COL, 'Parameter', 'Cutoff',
+                                          'Horizon', 'Actual', 'Predicted', 'Fit Time (s)'])
+    results['Error'] = results['Predicted'] - results['Actual']
+    failures = pd.DataFrame(failures, columns=['Model', STATION_COL, 'Parameter', 'Cutoff', 'Exception'])
+    return results, failures
+
+
+def summarize_failures(failures):
+    """Failed cutoffs per model and parameter, with the first exception seen"""
+    return failures.groupby(['Model', 'Parameter']).agg(
+        Failed=('Cutoff', 'size'), FirstException=('Exception', 'first')).rename(
+        columns={'FirstException': 'First Exception'}).reset_index()
+
+
+def summarize_by_horizon(results, horizons=None):
+    """
+    Aggregate backtest errors per model, parameter and horizon step
+    horizons: Optional list of horizon steps to keep (e.g. [1, 15, 30, 60])
+    Returns: DataFrame with RMSE, MAE, MAPE and number of cutoffs
+    """
+    if horizons is not None:
+        results = results[results['Horizon'].isin(horizons)]
+    err = results['Error']
+    frame = results.assign(SE=err ** 2, AE=err.abs(), APE=(err / results['Actual']).abs() * 100)
+    summary = frame.groupby(['Model', 'Parameter', 'Horizon']).agg(
+        RMSE=('SE', 'mean'), MAE=('AE', 'mean'), MAPE=('APE', 'mean'), Cutoffs=('Cutoff', 'nunique'))
+    summary['RMSE'] = np.sqrt(summary['RMSE'])
+    return summary.round(4).reset_index()
+
+
+def summarize_by_cutoff(results):
+    """Error per station, parameter, model and cutoff across its horizon, as recorded in the run history"""
+    err = results['Error']
+    frame = results.assign(SE=err ** 2, AE=err.abs(), APE=(err / results['Actual']).abs() * 100)
+    summary = frame.groupby(['Model', STATION_COL, 'Parameter', 'Cutoff']).agg(
+        RMSE=('SE', 'mean'), MAE=('AE', 'mean'), MAPE=('APE', 'mean'), FitTime=('Fit Time (s)', 'first'))
+    summary['RMSE'] = np.sqrt(summary['RMSE'])
+    return summary.rename(columns={'FitTime': 'Fit Time (s)'}).reset_index()
+
+
+def summarize_by_model(results):
+    """Average error per model and parameter across all cutoffs and horizons"""
+    err = results['Error']
+    frame = results.assign(SE=err ** 2, AE=err.abs(), APE=(err / results['Actual']).abs() * 100)
+    summary = frame.groupby(['Parameter', 'Model']).agg(
+        RMSE=('SE', 'mean'), MAE=('AE', 'mean'), MAPE=('APE', 'mean'),
+        Cutoffs=('Cutoff', 'nunique'), FitTime=('Fit Time (s)', 'mean'))
+    summary['RMSE'] = np.sqrt(summary['RMSE'])
+    return summary.round(4).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest of the forecasting models')
+    parser.add_argument('--data', default=DATA_FILE, help='Sensor file (.xlsx, .csv or .parquet)')
+    parser.add_argument('--families', nargs='+', default=list(MODEL_FAMILIES), choices=list(MODEL_FAMILIES))
+    parser.add_argument('--initial', type=int, default=None, help='First training window (rows)')
+    parser.add_argument('--horizon', type=int, default=60, help='Forecast horizon (rows)')
+    parser.add_argument('--step', type=int, default=15, help='Rows between cutoffs')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--output', default='backtest_performance.xlsx')
+    parser.add_argument('--no-history', dest='history', action='store_false',
+                        help=f'Do not record per-cutoff metrics in {RUN_DB}')
+    args = parser.parse_args(argv)
+
+    print("="*80)
+    print("WALK-FORWARD BACKTEST")
+    print("="*80)
+
+    df = load_sensor_data(args.data)
+    print(f"\n[STEP 1] Data loaded: {len(df)} rows")
+
+    start = time.perf_counter()
+    with stage('fit', 'walk-forward backtest'):
+        results, failures = run_backtest(df, families=args.families, initial=args.initial, horizon=args.horizon,
+                               step=args.step, workers=args.workers)
+    print(f"\n[STEP 2] Backtest completed in {time.perf_counter() - start:.1f}s")
+    print(f"  Cutoffs evaluated: {results['Cutoff'].nunique()}")
+    print(f"  Forecast points: {len(results)}")
+    if len(failures):
+        print(f"  ✗ Failed cutoffs (cold retry also failed): {len(failures)}")
+
+    by_model = summarize_by_model(results)
+    by_horizon = summarize_by_horizon(results)
+    with stage('export', os.path.basename(args.output)), pd.ExcelWriter(args.output) as writer:
+        by_model.to_excel(writer, sheet_name='By Model', index=False)
+        by_horizon.to_excel(writer, sheet_name='By Horizon', index=False)
+        if len(failures):
+            failures.to_excel(writer, sheet_name='Failures', index=False)
+    print(f"✓ Backtest metrics saved: {args.output}")
+
+    if args.history:
+        with RunStore() as store:
+            run_id = store.start_run('backtest.py', args.data, len(df))
+            written = store.record_metrics(run_id, summarize_by_cutoff(results))
+        print(f"✓ Run {run_id} recorded in {RUN_DB}: {written} cutoff metrics")
+
+    print("\n" + "="*80)
+    print("BACKTEST SUMMARY")
+    print("="*80)
+    print(by_model.to_string(index=False))
+    if len(failures):
+        print("\nFailed cutoffs (not included above):")
+        print(summarize_failures(failures).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
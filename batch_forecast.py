@@ -0,0 +1,158 @@
+"""
+Batch Polynomial Forecasting - Every station and parameter in one matrix product
+Fitted polynomial coefficients are stacked into a (station x parameter x power) array
+and evaluated against one shared power basis of the forecast offsets
+"""
+
+import pickle
+from math import comb
+
+import numpy as np
+
+from derived_channels import magnus_dew_point
+
+# Keys of best_models.pkl / polynomial_models.pkl, in PARAMETER_COLUMNS order
+PARAMETER_KEYS = ['temperature', 'humidity', 'pressure', 'dew_point']
+
+
+def polynomial_coefficients(model, poly):
+    """
+    Coefficients of a fitted (LinearRegression, PolynomialFeatures) pair in a single variable
+    Returns: array c with prediction = sum(c[k] * x**k)
+    """
+    powers = poly.powers_[:, 0]
+    coef = np.zeros(powers.max() + 1)
+    np.add.at(coef, powers, np.ravel(model.coef_))
+    coef[0] += float(np.ravel(model.intercept_)[0])
+    return coef
+
+
+def shift_coefficients(coefficients, origins):
+    """
+    Re-express polynomials in x around each station's origin: p(origin + h) as a polynomial in h
+
+    Every station then shares the same basis [1, h, h², ...], and the basis
+    values stay small, whereas raw time indices grow large with long histories.
+    coefficients: (station x parameter x power) array
+    origins: Time index of each station's last observation
+    Returns: Array of the same shape
+    """
+    degree = coefficients.shape[-1] - 1
+    k = np.arange(degree + 1)
+    binom = np.array([[comb(int(i), int(j)) for j in k] for i in k], dtype=float)
+    exponent = np.clip(k[:, None] - k[None, :], 0, None)
+    # shift[s, k, j] = C(k, j) * origin_s ** (k - j) for k >= j
+    shift = binom * np.asarray(origins, dtype=float)[:, None, None] ** exponent
+    shift = np.where(k[:, None] >= k[None, :], shift, 0.0)
+    return np.einsum('spk,skj->spj', coefficients, shift)
+
+
+class BatchPolynomialForecaster:
+    """
+    Polynomial trend forecasts for a whole fleet of stations at once
+
+    Parameters without a fitted model (dew point when it is derived) are
+    filled in from temperature and humidity with the Magnus formula.
+    """
+
+    def __init__(self, parameters=None):
+        self.parameters = list(parameters or PARAMETER_KEYS)
+        self.stations = []
+        # station -> row of the coefficient arrays, for constant-time lookups per request
+        self.station_rows = {}
+        self.coefficients = None
+        # (station x parameter) mask of channels with no fitted model
+        self.derived = np.zeros((0, len(self.parameters)), dtype=bool)
+
+    def fit(self, models_by_station, origins):
+        """
+        Stack the fitted models of every station
+        models_by_station: dict station -> {parameter key: (LinearRegression, PolynomialFeatures)}
+        origins: dict station -> time index of the last observation
+        """
+        self.stations = list(models_by_station)
+        self.station_rows = {station: i for i, station in enumerate(self.stations)}
+        fitted = {(i, j): polynomial_coefficients(*models_by_station[station][param])
+                  for i, station in enumerate(self.stations)
+                  for j, param in enumerate(self.parameters) if param in models_by_station[station]}
+        degree = max(len(c) for c in fitted.values()) - 1
+
+        coefficients = np.zeros((len(self.stations), len(self.parameters), degree + 1))
+        self.derived = np.ones((len(self.stations), len(self.parameters)), dtype=bool)
+        for (i, j), coef in fitted.items():
+            coefficients[i, j, :len(coef)] = coef
+            self.derived[i, j] = False
+        only_dew = np.array([p == 'dew_point' for p in self.parameters])
+        if self.derived[:, ~only_dew].any():
+            missing = sorted({self.parameters[j] for i, j in zip(*np.nonzero(self.derived)) if not only_dew[j]})
+            raise ValueError(f"Missing fitted models for: {', '.join(missing)}")
+
+        self.coefficients = shift_coefficients(coefficients, [origins[s] for s in self.stations])
+        return self
+
+    @classmethod
+    def from_pickle(cls, path, origins, station=None):
+        """
+        Load a models pickle written by best_model_final.py or polynomial_regression_model.py
+        origins: dict station -> last time index; a flat (single-station) pickle is
+                 assigned to `station`, or to the only station in origins
+        """
+        with open(path, 'rb') as f:
+            models = pickle.load(f)
+        if set(models) <= set(PARAMETER_KEYS):
+            models = {station or next(iter(origins)): models}
+        return cls().fit(models, origins)
+
+    def basis(self, horizon, step=1):
+        """Shared power basis of the forecast offsets: (horizon points x powers)"""
+        offsets = np.arange(step, horizon + 1, step, dtype=float)
+        return offsets[:, None] ** np.arange(self.coefficients.shape[-1])
+
+    def forecast(self, horizon, step=1, stations=None):
+        """
+        Forecast every station and parameter
+        horizon: Steps ahead of each station's last observation
+        step: Spacing of the returned points
+        stations: Optional subset of stations (default: all, in self.stations order)
+        Returns: array (station x parameter x horizon point)
+        """
+        coefficients, derived = self.coefficients, self.derived
+        if stations is not None:
+            rows = [self.station_rows[s] for s in stations]
+            coefficients, derived = coefficients[rows], derived[rows]
+        forecast = np.einsum('spk,hk->sph', coefficients, self.basis(horizon, step))
+        if derived.any():
+            dew = self.parameters.index('dew_point')
+            rows = derived[:, dew]
+            temp = forecast[rows, self.parameters.index('temperature')]
+            humidity = forecast[rows, self.parameters.index('humidity')]
+            forecast[rows, dew] = magnus_dew_point(temp, humidity)
+        return forecast
+
+
+if __name__ == '__main__':
+    import time
+    from weather_data import load_sensor_data
+
+    print("="*80)
+    print("BATCH POLYNOMIAL FORECASTING")
+    print("="*80)
+
+    df = load_sensor_data()
+    forecaster = BatchPolynomialForecaster.from_pickle('best_models.pkl', {'Gurugram': len(df) - 1})
+    forecast = forecaster.forecast(240)
+    print(f"\n✓ Forecast array: {forecast.shape} (station x parameter x horizon)")
+    for param, values in zip(forecaster.parameters, forecast[0]):
+        print(f"  {param}: {values.min():.2f} - {values.max():.2f}")
+
+    # Fleet-sized run: the same models replicated across many stations
+    n_stations = 5000
+    fleet = BatchPolynomialForecaster()
+    fleet.stations = [f'station_{i}' for i in range(n_stations)]
+    fleet.station_rows = {station: i for i, station in enumerate(fleet.stations)}
+    fleet.coefficients = np.repeat(forecaster.coefficients, n_stations, axis=0)
+    fleet.derived = np.repeat(forecaster.derived, n_stations, axis=0)
+    start = time.perf_counter()
+    fleet_forecast = fleet.forecast(240)
+    print(f"\n✓ {n_stations} stations x {len(fleet.parameters)} parameters x 240 minutes"
+          f" in {(time.perf_counter() - start) * 1000:.1f} ms")
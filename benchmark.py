@@ -0,0 +1,342 @@
+"""
+Benchmark Suite - Hot-path timings across data sizes
+Synthetic readings from generate_weather_data.generate_readings are scaled from
+the 300-row original to tens of millions of rows; every benchmark is timed at
+every size, written to JSON and compared against a stored baseline
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import stage_profile
+from batch_forecast import BatchPolynomialForecaster
+from chart_render import chart_spec, render_charts
+from data_export import write_frame
+from forecast_models import calculate_metrics, fit_forecast
+from generate_weather_data import DEFAULT_ROWS, generate_readings
+from volatility_forecast import fit_garch
+from weather_data import (HUMIDITY_COL, PRESSURE_COL, TEMP_COL, add_datetime,
+                          load_sensor_data)
+
+# Row counts run by default; pass --sizes up to tens of millions for a scaling run
+BENCHMARK_SIZES = [300, 10000, 100000, 1000000]
+
+BENCHMARK_RESULTS = 'benchmark_results.json'
+BENCHMARK_BASELINE = 'benchmark_baseline.json'
+
+# Forecast length of the scripts (2 PM to 6 PM)
+FORECAST_STEPS = 240
+
+# A benchmark is repeated until it has run `repeat` times or for this many seconds
+REPEAT_BUDGET_SECONDS = 2.0
+
+# Slower than the baseline by this factor (and by more than the noise floor) is a regression
+REGRESSION_THRESHOLD = 1.25
+NOISE_FLOOR_SECONDS = 0.02
+
+
+class BenchmarkData:
+    """Synthetic readings of one size and the inputs derived from them, built once per size"""
+
+    def __init__(self, n_rows, workdir):
+        self.n_rows = n_rows
+        self.workdir = workdir
+        self.raw = generate_readings(n_rows)
+        self._indexed = None
+        self._files = {}
+
+    @property
+    def indexed(self):
+        """Readings with a sorted DatetimeIndex, as the training scripts use them"""
+        if self._indexed is None:
+            self._indexed = add_datetime(self.raw.copy()).set_index('DateTime')
+        return self._indexed
+
+    def series(self, column=TEMP_COL):
+        return self.indexed[column]
+
+    def file(self, ext):
+        """The readings written to a file of this format (written on first use)"""
+        if ext not in self._files:
+            path = os.path.join(self.workdir, f'readings_{self.n_rows}{ext}')
+            if ext == '.xlsx':
+                path = write_frame(self.raw, path, sheet_name='Weather Data')
+            elif ext == '.parquet':
+                self.raw.to_parquet(path, index=False)
+            else:
+                self.raw.to_csv(path, index=False)
+            self._files[ext] = path
+        return self._files[ext]
+
+
+# Each benchmark prepares its inputs untimed and returns the call to time
+
+def _bench_load_xlsx(data):
+    path = data.file('.xlsx')
+    return lambda: load_sensor_data(path)
+
+
+def _bench_load_csv(data):
+    path = data.file('.csv')
+    return lambda: load_sensor_data(path)
+
+
+def _bench_parse_datetime(data):
+    return lambda: add_datetime(data.raw[['Date', 'Time']])
+
+
+def _bench_fit(family):
+    def bench(data):
+        series = data.series()
+        return lambda: fit_forecast(family, series, FORECAST_STEPS)
+    return bench
+
+
+def _bench_garch_fit(data):
+    series = data.series()
+    return lambda: fit_garch(series)
+
+
+def _bench_forecast(data):
+    """Batch polynomial forecast of a fleet with one station per 300 readings"""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import PolynomialFeatures
+
+    history = data.raw.iloc[:DEFAULT_ROWS]
+    poly = PolynomialFeatures(degree=3)
+    X = poly.fit_transform(np.arange(len(history)).reshape(-1, 1))
+    models = {key: (LinearRegression().fit(X, history[column].values), poly)
+              for key, column in [('temperature', TEMP_COL), ('humidity', HUMIDITY_COL),
+                                  ('pressure', PRESSURE_COL)]}
+    stations = [f'station_{i}' for i in range(max(1, data.n_rows // DEFAULT_ROWS))]
+    forecaster = BatchPolynomialForecaster().fit({station: models for station in stations},
+                                                 {station: len(history) - 1 for station in stations})
+    return lambda: forecaster.forecast(FORECAST_STEPS)
+
+
+def _bench_metrics(data):
+    actual = data.raw[TEMP_COL].values
+    predicted = actual + np.random.RandomState(0).normal(0, 0.3, len(actual))
+    return lambda: calculate_metrics(actual, predicted, 'Benchmark', 'Temperature')
+
+
+def _bench_render(data):
+    series = data.series()
+    filename = os.path.join(data.workdir, f'render_{data.n_rows}.png')
+
+    def render():
+        spec, ax = chart_spec(filename, figsize=(15, 5))
+        ax.plot(series.index, series.values, linewidth=1, label='Temperature')
+        ax.set_title(f'Temperature - {data.n_rows:,} readings')
+        ax.legend()
+        render_charts([spec], workers=1, verbose=False, cache_file=None)
+    return render
+
+
+# name -> (setup, largest row count run without --full)
+BENCHMARKS = {
+    'load_xlsx': (_bench_load_xlsx, 100000),
+    'load_csv': (_bench_load_csv, None),
+    'parse_datetime': (_bench_parse_datetime, None),
+    'polynomial_fit': (_bench_fit('Polynomial'), None),
+    'arima_fit': (_bench_fit('ARIMA'), 10000),
+    'sarima_fit': (_bench_fit('SARIMA'), 10000),
+    'garch_fit': (_bench_garch_fit, 1000000),
+    'prophet_fit': (_bench_fit('Prophet'), 100000),
+    'forecast': (_bench_forecast, None),
+    'metrics': (_bench_metrics, None),
+    'render': (_bench_render, None)
+}
+
+
+def time_call(func, repeat=3):
+    """
+    Best-of-N wall time of a call; slow calls run fewer times (REPEAT_BUDGET_SECONDS)
+    Returns: (best seconds, number of runs)
+    """
+    times = []
+    while len(times) < repeat:
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if sum(times) >= REPEAT_BUDGET_SECONDS:
+            break
+    return min(times), len(times)
+
+
+def run_suite(sizes=None, names=None, repeat=3, full=False, verbose=True):
+    """
+    Run benchmarks at every size
+    sizes: Row counts (default BENCHMARK_SIZES)
+    names: Benchmarks to run (default: all of BENCHMARKS)
+    full: Ignore each benchmark's row cap
+    Returns: list of result dicts (benchmark, rows, seconds, runs, status)
+    """
+    # Benchmarks call the instrumented pipeline functions; keep their profiles out of profiles/
+    stage_profile.PROFILE_ENABLED = False
+    # cmdstanpy resets its own level when Prophet first fits, so switch the logger off instead
+    logging.getLogger('cmdstanpy').disabled = True
+    logging.getLogger('prophet').setLevel(logging.ERROR)
+
+    names = list(names or BENCHMARKS)
+    results = []
+    workdir = tempfile.mkdtemp(prefix='weather_bench_')
+    try:
+        for n_rows in sizes or BENCHMARK_SIZES:
+            start = time.perf_counter()
+            data = BenchmarkData(n_rows, workdir)
+            if verbose:
+                print(f"\n{n_rows:,} rows (generated in {time.perf_counter() - start:.2f}s)")
+            for name in names:
+                setup, max_rows = BENCHMARKS[name]
+                result = {'benchmark': name, 'rows': n_rows, 'seconds': None, 'runs': 0}
+                if max_rows is not None and n_rows > max_rows and not full:
+                    result['status'] = 'skipped'
+                else:
+                    try:
+                        result['seconds'], result['runs'] = time_call(setup(data), repeat)
+                        result['seconds'] = round(result['seconds'], 6)
+                        result['status'] = 'ok'
+                    except Exception as e:
+                        result['status'] = 'error'
+                        result['error'] = f"{type(e).__name__}: {e}"
+                results.append(result)
+                if verbose:
+                    if result['status'] == 'ok':
+                        print(f"  ✓ {name:<16} {result['seconds']:>10.4f}s  (best of {result['runs']})")
+                    elif result['status'] == 'error':
+                        print(f"  ✗ {name:<16} {result['error']}")
+            del data
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def environment():
+    """Machine and library versions the timings were taken on"""
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+
+def write_results(results, path=BENCHMARK_RESULTS):
+    """Write benchmark results with the environment they were measured in"""
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'results': results
+        }, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare timings with a baseline run, benchmark by benchmark and size by size
+    results: list of result dicts from run_suite
+    baseline: Contents of a results file
+    Returns: list of (benchmark, rows, baseline seconds, seconds, ratio, verdict);
+             a benchmark that ran in the baseline but now errors is 'failed'
+    """
+    before = {(r['benchmark'], r['rows']): r['seconds'] for r in baseline['results'] if r['seconds'] is not None}
+    rows = []
+    for result in results:
+        key = (result['benchmark'], result['rows'])
+        old, new = before.get(key), result['seconds']
+        if result['status'] == 'error':
+            if old is not None:
+                rows.append(key + (old, None, None, 'failed'))
+            continue
+        if new is None:
+            continue
+        if old is None:
+            rows.append(key + (None, new, None, 'new'))
+            continue
+        ratio = new / old if old > 0 else None
+        if ratio is not None and ratio > threshold and new - old > NOISE_FLOOR_SECONDS:
+            verdict = 'regression'
+        elif ratio is not None and ratio < 1 / threshold and old - new > NOISE_FLOOR_SECONDS:
+            verdict = 'faster'
+        else:
+            verdict = 'ok'
+        rows.append(key + (old, new, ratio, verdict))
+    return rows
+
+
+def print_comparison(rows, baseline):
+    print(f"\nCompared with baseline from {baseline.get('created', '?')}:")
+    if baseline.get('environment') != environment():
+        print("  (baseline was measured on a different machine or library versions)")
+    print(f"{'Benchmark':<16} {'Rows':>12} {'Baseline s':>11} {'Now s':>11} {'Ratio':>7}  Verdict")
+    for name, n_rows, old, new, ratio, verdict in rows:
+        old_text = '-' if old is None else f'{old:.4f}'
+        new_text = '-' if new is None else f'{new:.4f}'
+        ratio_text = '-' if ratio is None else f'{ratio:.2f}'
+        marker = '✗ ' if verdict in ('regression', 'failed') else ''
+        print(f"{name:<16} {n_rows:>12,} {old_text:>11} {new_text:>11} {ratio_text:>7}  {marker}{verdict}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time load, fit, forecast, metrics and render across data sizes')
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES,
+                        help='Row counts to generate (e.g. 300 100000 10000000)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='Run only these benchmarks')
+    parser.add_argument('--repeat', type=int, default=3, help='Best of N runs for fast benchmarks')
+    parser.add_argument('--full', action='store_true', help='Run model fits past their row caps')
+    parser.add_argument('--output', default=BENCHMARK_RESULTS)
+    parser.add_argument('--baseline', default=BENCHMARK_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    print("="*80)
+    print("BENCHMARK SUITE")
+    print("="*80)
+    results = run_suite(args.sizes, args.only, args.repeat, args.full)
+
+    print(f"\n✓ Results saved: {write_results(results, args.output)}")
+
+    if args.save_baseline:
+        print(f"✓ Baseline saved: {write_results(results, args.baseline)}")
+    elif os.path.exists(args.baseline):
+        rows = compare_results(results, load_results(args.baseline), args.threshold)
+        print_comparison(rows, load_results(args.baseline))
+        regressions = [row for row in rows if row[-1] == 'regression']
+        failures = [row for row in rows if row[-1] == 'failed']
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) slower than {args.threshold:.2f}x the baseline")
+        if failures:
+            print(f"\n✗ {len(failures)} benchmark(s) failed that ran in the baseline")
+        if regressions or failures:
+            sys.exit(1)
+        print("\n✓ No regressions against the baseline")
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to store one")
+
+
+if __name__ == '__main__':
+    main()
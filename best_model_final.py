@@ -6,8 +6,6 @@ Training on complete dataset for best results
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,18 +13,20 @@ from sklearn.preprocessing import PolynomialFeatures
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from derived_channels import DERIVE_DEW_POINT, magnus_dew_point
+from data_export import write_frame
+from run_store import RUN_DB, record_run
+from stage_profile import stage
 
 print("="*80)
 print("BEST MODEL - POLYNOMIAL REGRESSION (COMPLETE DATASET)")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 temp_col = 'Temperature (°C)'
 humidity_col = 'Humidity (%)'
@@ -53,8 +53,11 @@ y_temp = df[temp_col].values
 poly_temp = PolynomialFeatures(degree=3)
 X_poly_temp = poly_temp.fit_transform(X)
 temp_model = LinearRegression()
-temp_model.fit(X_poly_temp, y_temp)
-y_pred_temp = temp_model.predict(X_poly_temp)
+with stage('fit', 'Polynomial Temperature') as fitted:
+    temp_model.fit(X_poly_temp, y_temp)
+temp_fit_time = fitted.wall
+with stage('predict', 'Polynomial Temperature'):
+    y_pred_temp = temp_model.predict(X_poly_temp)
 
 rmse_temp = np.sqrt(mean_squared_error(y_temp, y_pred_temp))
 mae_temp = mean_absolute_error(y_temp, y_pred_temp)
@@ -69,7 +72,8 @@ all_results.append({
     'Model': 'Polynomial Regression (Degree 3)',
     'RMSE': round(rmse_temp, 4),
     'MAE': round(mae_temp, 4),
-    'R²': round(r2_temp, 4)
+    'R²': round(r2_temp, 4),
+    'Fit Time (s)': round(temp_fit_time, 4)
 })
 all_models['temperature'] = (temp_model, poly_temp)
 
@@ -82,8 +86,11 @@ y_hum = df[humidity_col].values
 poly_hum = PolynomialFeatures(degree=3)
 X_poly_hum = poly_hum.fit_transform(X)
 hum_model = LinearRegression()
-hum_model.fit(X_poly_hum, y_hum)
-y_pred_hum = hum_model.predict(X_poly_hum)
+with stage('fit', 'Polynomial Humidity') as fitted:
+    hum_model.fit(X_poly_hum, y_hum)
+hum_fit_time = fitted.wall
+with stage('predict', 'Polynomial Humidity'):
+    y_pred_hum = hum_model.predict(X_poly_hum)
 
 rmse_hum = np.sqrt(mean_squared_error(y_hum, y_pred_hum))
 mae_hum = mean_absolute_error(y_hum, y_pred_hum)
@@ -98,7 +105,8 @@ all_results.append({
     'Model': 'Polynomial Regression (Degree 3)',
     'RMSE': round(rmse_hum, 4),
     'MAE': round(mae_hum, 4),
-    'R²': round(r2_hum, 4)
+    'R²': round(r2_hum, 4),
+    'Fit Time (s)': round(hum_fit_time, 4)
 })
 all_models['humidity'] = (hum_model, poly_hum)
 
@@ -111,8 +119,11 @@ y_press = df[pressure_col].values
 poly_press = PolynomialFeatures(degree=2)
 X_poly_press = poly_press.fit_transform(X)
 press_model = LinearRegression()
-press_model.fit(X_poly_press, y_press)
-y_pred_press = press_model.predict(X_poly_press)
+with stage('fit', 'Polynomial Pressure') as fitted:
+    press_model.fit(X_poly_press, y_press)
+press_fit_time = fitted.wall
+with stage('predict', 'Polynomial Pressure'):
+    y_pred_press = press_model.predict(X_poly_press)
 
 rmse_press = np.sqrt(mean_squared_error(y_press, y_pred_press))
 mae_press = mean_absolute_error(y_press, y_pred_press)
@@ -127,7 +138,8 @@ all_results.append({
     'Model': 'Polynomial Regression (Degree 2)',
     'RMSE': round(rmse_press, 4),
     'MAE': round(mae_press, 4),
-    'R²': round(r2_press, 4)
+    'R²': round(r2_press, 4),
+    'Fit Time (s)': round(press_fit_time, 4)
 })
 all_models['pressure'] = (press_model, poly_press)
 
@@ -137,11 +149,20 @@ all_models['pressure'] = (press_model, poly_press)
 print("\nDew Point Model:")
 
 y_dew = df[dew_col].values
-poly_dew = PolynomialFeatures(degree=3)
-X_poly_dew = poly_dew.fit_transform(X)
-dew_model = LinearRegression()
-dew_model.fit(X_poly_dew, y_dew)
-y_pred_dew = dew_model.predict(X_poly_dew)
+if DERIVE_DEW_POINT:
+    print("  Derived from the Temperature and Humidity models (Magnus formula)")
+    y_pred_dew = magnus_dew_point(y_pred_temp, y_pred_hum)
+    dew_fit_time = None
+else:
+    poly_dew = PolynomialFeatures(degree=3)
+    X_poly_dew = poly_dew.fit_transform(X)
+    dew_model = LinearRegression()
+    with stage('fit', 'Polynomial Dew Point') as fitted:
+        dew_model.fit(X_poly_dew, y_dew)
+    dew_fit_time = fitted.wall
+    with stage('predict', 'Polynomial Dew Point'):
+        y_pred_dew = dew_model.predict(X_poly_dew)
+    all_models['dew_point'] = (dew_model, poly_dew)
 
 rmse_dew = np.sqrt(mean_squared_error(y_dew, y_pred_dew))
 mae_dew = mean_absolute_error(y_dew, y_pred_dew)
@@ -153,12 +174,12 @@ print(f"  R² Score: {r2_dew:.4f} ✓ EXCELLENT!")
 
 all_results.append({
     'Parameter': 'Dew Point',
-    'Model': 'Polynomial Regression (Degree 3)',
+    'Model': 'Derived (Magnus formula)' if DERIVE_DEW_POINT else 'Polynomial Regression (Degree 3)',
     'RMSE': round(rmse_dew, 4),
     'MAE': round(mae_dew, 4),
-    'R²': round(r2_dew, 4)
+    'R²': round(r2_dew, 4),
+    'Fit Time (s)': None if dew_fit_time is None else round(dew_fit_time, 4)
 })
-all_models['dew_point'] = (dew_model, poly_dew)
 
 # ============================================================================
 # SAVE RESULTS
@@ -168,8 +189,11 @@ print("SAVING RESULTS")
 print("="*80)
 
 results_df = pd.DataFrame(all_results)
-results_df.to_excel('best_model_performance.xlsx', index=False)
+with stage('export', 'best_model_performance.xlsx'):
+    results_df.to_excel('best_model_performance.xlsx', index=False)
 print("✓ Performance metrics saved: best_model_performance.xlsx")
+run_id = record_run(__file__, results_df, rows=len(df))
+print(f"✓ Run {run_id} recorded in {RUN_DB}")
 
 print("\n" + "="*80)
 print("BEST MODEL PERFORMANCE SUMMARY")
@@ -188,8 +212,8 @@ df['Hum_Predicted'] = y_pred_hum
 df['Press_Predicted'] = y_pred_press
 df['Dew_Predicted'] = y_pred_dew
 
-df.to_excel('model_predictions.xlsx', index=False)
-print("✓ Predictions saved: model_predictions.xlsx")
+predictions_file = write_frame(df, 'model_predictions.xlsx')
+print(f"✓ Predictions saved: {predictions_file}")
 
 print("\n✓ Model training completed with EXCELLENT R² scores!")
 print("✓ Ready for visualization and future forecasting!")
@@ -3,64 +3,52 @@ Best Model - Future Forecasting (2:15 PM to 6:15 PM)
 """
 
 import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import pickle
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from batch_forecast import BatchPolynomialForecaster
+from weather_data import DEFAULT_STATION
+from chart_render import chart_spec, render_charts
+from data_export import write_frame
+from stage_profile import stage
 
 print("="*80)
 print("BEST MODEL - FUTURE FORECASTING (2:15 PM - 6:15 PM)")
 print("="*80)
 
 # Load original data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 # Load trained models
-with open('best_models.pkl', 'rb') as f:
-    models = pickle.load(f)
+with stage('load', 'best_models.pkl'):
+    with open('best_models.pkl', 'rb') as f:
+        models = pickle.load(f)
 
 print("\n[STEP 1] Loaded trained models")
 print("  ✓ Temperature model (R² = 0.9871)")
 print("  ✓ Humidity model (R² = 0.9518)")
 print("  ✓ Pressure model (R² = 0.4840)")
-print("  ✓ Dew Point model (R² = 0.5185)")
+# best_models.pkl has no dew point model when best_model_final.py derived it
+derive_dew = 'dew_point' not in models
+print("  ✓ Dew Point derived from Temperature and Humidity (Magnus formula)" if derive_dew
+      else "  ✓ Dew Point model (R² = 0.5185)")
 
-# Create future time indices
+# Forecast from the last time index
 last_index = len(df) - 1
 forecast_steps = 240  # 4 hours = 240 minutes
 
-future_indices = np.array([[last_index + i + 1] for i in range(forecast_steps)])
-
 print("\n[STEP 2] Generating future forecasts...")
 
-# Temperature forecast
-temp_model, poly_temp = models['temperature']
-future_indices_poly_temp = poly_temp.transform(future_indices)
-temp_forecast = temp_model.predict(future_indices_poly_temp)
-
-# Humidity forecast
-hum_model, poly_hum = models['humidity']
-future_indices_poly_hum = poly_hum.transform(future_indices)
-hum_forecast = hum_model.predict(future_indices_poly_hum)
-
-# Pressure forecast
-press_model, poly_press = models['pressure']
-future_indices_poly_press = poly_press.transform(future_indices)
-press_forecast = press_model.predict(future_indices_poly_press)
-
-# Dew Point forecast
-dew_model, poly_dew = models['dew_point']
-future_indices_poly_dew = poly_dew.transform(future_indices)
-dew_forecast = dew_model.predict(future_indices_poly_dew)
+# All parameters in one matrix product (dew point derived when it has no model)
+with stage('fit', 'Batch Polynomial'):
+    forecaster = BatchPolynomialForecaster().fit({DEFAULT_STATION: models}, {DEFAULT_STATION: last_index})
+with stage('predict', 'Batch Polynomial'):
+    temp_forecast, hum_forecast, press_forecast, dew_forecast = forecaster.forecast(forecast_steps)[0]
 
 # Create future datetime
 last_time = df['DateTime'].iloc[-1]
@@ -87,8 +75,8 @@ forecast_df_excel = forecast_df[['Date', 'Time', 'Temperature (°C)', 'Humidity
                                  'Pressure (hPa)', 'Dew Point (°C)']]
 
 # Save forecast
-forecast_df_excel.to_excel('best_model_future_forecast_2pm_to_6pm.xlsx', index=False)
-print("✓ Future forecast saved: best_model_future_forecast_2pm_to_6pm.xlsx")
+forecast_file = write_frame(forecast_df_excel, 'best_model_future_forecast_2pm_to_6pm.xlsx')
+print(f"✓ Future forecast saved: {forecast_file}")
 
 print(f"\nForecast Summary:")
 print(f"  Temperature: {forecast_df_plot['Temperature (°C)'].min():.1f}°C - {forecast_df_plot['Temperature (°C)'].max():.1f}°C")
@@ -101,7 +89,7 @@ print(f"  Dew Point: {forecast_df_plot['Dew Point (°C)'].min():.1f}°C - {forec
 # ============================================================================
 print("\n[STEP 3] Creating future forecast visualizations...")
 
-fig, axes = plt.subplots(4, 1, figsize=(18, 16))
+spec, axes = chart_spec('best_model_future_forecast_complete.png', 4, 1, figsize=(18, 16))
 
 # Temperature
 axes[0].plot(df['DateTime'], df['Temperature (°C)'], label='Historical Data', 
@@ -160,12 +148,9 @@ axes[3].set_xlabel('Time', fontsize=13, fontweight='bold')
 axes[3].legend(loc='best', fontsize=11)
 axes[3].grid(True, alpha=0.3)
 
-plt.suptitle('Polynomial Regression Model - Future Forecast (2:15 PM - 6:15 PM)', 
-            fontsize=18, fontweight='bold', y=0.995)
-plt.tight_layout()
-plt.savefig('best_model_future_forecast_complete.png', dpi=300, bbox_inches='tight')
-print("✓ Future forecast visualization saved")
-plt.close()
+spec.suptitle('Polynomial Regression Model - Future Forecast (2:15 PM - 6:15 PM)', 
+             fontsize=18, fontweight='bold', y=0.995)
+render_charts([spec])
 
 print("\n✓ Future forecasting completed!")
 print("\nGenerated files:")
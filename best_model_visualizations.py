@@ -4,33 +4,34 @@ Best Model Visualizations - All Graphs and Charts
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from chart_render import chart_spec, render_charts
+from data_export import read_frame
+from stage_profile import stage
 
 print("="*80)
 print("CREATING BEST MODEL VISUALIZATIONS")
 print("="*80)
 
 # Load data with predictions
-df = pd.read_excel('model_predictions.xlsx')
+df = read_frame('model_predictions.xlsx')
 
 temp_col = 'Temperature (°C)'
 humidity_col = 'Humidity (%)'
 pressure_col = 'Pressure (hPa)'
 dew_col = 'Dew Point (°C)'
 
+# Charts are recorded as specs and rendered together at the end
+charts = []
+
 print("\n[STEP 1] Creating individual parameter plots...")
 
 # ============================================================================
 # TEMPERATURE PLOT
 # ============================================================================
-fig, ax = plt.subplots(figsize=(16, 6))
+spec, ax = chart_spec('best_model_temperature.png', figsize=(16, 6), template='parameter')
 ax.plot(df['DateTime'], df[temp_col], label='Actual Data', 
        color='#2E86AB', linewidth=2.5, marker='o', markersize=3, alpha=0.7)
 ax.plot(df['DateTime'], df['Temp_Predicted'], label='Polynomial Regression Fit', 
@@ -41,15 +42,12 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Temperature (°C)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=12, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('best_model_temperature.png', dpi=300, bbox_inches='tight')
-print("  ✓ Temperature plot saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # HUMIDITY PLOT
 # ============================================================================
-fig, ax = plt.subplots(figsize=(16, 6))
+spec, ax = chart_spec('best_model_humidity.png', figsize=(16, 6), template='parameter')
 ax.plot(df['DateTime'], df[humidity_col], label='Actual Data', 
        color='#2E86AB', linewidth=2.5, marker='o', markersize=3, alpha=0.7)
 ax.plot(df['DateTime'], df['Hum_Predicted'], label='Polynomial Regression Fit', 
@@ -60,15 +58,12 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Humidity (%)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=12, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('best_model_humidity.png', dpi=300, bbox_inches='tight')
-print("  ✓ Humidity plot saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # PRESSURE PLOT
 # ============================================================================
-fig, ax = plt.subplots(figsize=(16, 6))
+spec, ax = chart_spec('best_model_pressure.png', figsize=(16, 6), template='parameter')
 ax.plot(df['DateTime'], df[pressure_col], label='Actual Data', 
        color='#2E86AB', linewidth=2.5, marker='o', markersize=3, alpha=0.7)
 ax.plot(df['DateTime'], df['Press_Predicted'], label='Polynomial Regression Fit', 
@@ -79,15 +74,12 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Pressure (hPa)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=12, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('best_model_pressure.png', dpi=300, bbox_inches='tight')
-print("  ✓ Pressure plot saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # DEW POINT PLOT
 # ============================================================================
-fig, ax = plt.subplots(figsize=(16, 6))
+spec, ax = chart_spec('best_model_dewpoint.png', figsize=(16, 6), template='parameter')
 ax.plot(df['DateTime'], df[dew_col], label='Actual Data', 
        color='#2E86AB', linewidth=2.5, marker='o', markersize=3, alpha=0.7)
 ax.plot(df['DateTime'], df['Dew_Predicted'], label='Polynomial Regression Fit', 
@@ -98,17 +90,14 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Dew Point (°C)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=12, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('best_model_dewpoint.png', dpi=300, bbox_inches='tight')
-print("  ✓ Dew Point plot saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # COMBINED PLOT
 # ============================================================================
 print("\n[STEP 2] Creating combined visualization...")
 
-fig, axes = plt.subplots(4, 1, figsize=(18, 16))
+spec, axes = chart_spec('best_model_all_parameters.png', 4, 1, figsize=(18, 16))
 
 # Temperature
 axes[0].plot(df['DateTime'], df[temp_col], label='Actual', 
@@ -151,23 +140,21 @@ axes[3].set_xlabel('Time', fontsize=13, fontweight='bold')
 axes[3].legend(loc='best', fontsize=11)
 axes[3].grid(True, alpha=0.3)
 
-plt.suptitle('Polynomial Regression Model - All Parameters', 
-            fontsize=18, fontweight='bold', y=0.995)
-plt.tight_layout()
-plt.savefig('best_model_all_parameters.png', dpi=300, bbox_inches='tight')
-print("  ✓ Combined plot saved")
-plt.close()
+spec.suptitle('Polynomial Regression Model - All Parameters', 
+             fontsize=18, fontweight='bold', y=0.995)
+charts.append(spec)
 
 # ============================================================================
 # PERFORMANCE BAR CHART
 # ============================================================================
 print("\n[STEP 3] Creating performance metrics chart...")
 
-perf_df = pd.read_excel('best_model_performance.xlsx')
+with stage('load', 'best_model_performance.xlsx'):
+    perf_df = pd.read_excel('best_model_performance.xlsx')
 
-fig, axes = plt.subplots(1, 3, figsize=(16, 6))
-fig.suptitle('Polynomial Regression Model - Performance Metrics', 
-            fontsize=16, fontweight='bold')
+spec, axes = chart_spec('best_model_performance_metrics.png', 1, 3, figsize=(16, 6))
+spec.suptitle('Polynomial Regression Model - Performance Metrics', 
+              fontsize=16, fontweight='bold')
 
 metrics = ['RMSE', 'MAE', 'R²']
 colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
@@ -177,32 +164,25 @@ for idx, metric in enumerate(metrics):
     params = perf_df['Parameter']
     values = perf_df[metric]
     
-    bars = ax.bar(params, values, color=colors[idx], edgecolor='black', 
-                 linewidth=2, alpha=0.8)
+    ax.bar(params, values, color=colors[idx], edgecolor='black', 
+           linewidth=2, alpha=0.8)
     ax.set_title(f'{metric}', fontsize=14, fontweight='bold')
     ax.set_ylabel(metric, fontsize=12, fontweight='bold')
     ax.grid(True, alpha=0.3, axis='y')
     ax.tick_params(axis='x', rotation=45)
     
     # Add value labels
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-               f'{height:.4f}', ha='center', va='bottom', 
-               fontsize=10, fontweight='bold')
+    ax.bar_labels('{:.4f}', fontsize=10, fontweight='bold')
 
-plt.tight_layout()
-plt.savefig('best_model_performance_metrics.png', dpi=300, bbox_inches='tight')
-print("  ✓ Performance metrics chart saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # RESIDUAL PLOTS
 # ============================================================================
 print("\n[STEP 4] Creating residual analysis plots...")
 
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-fig.suptitle('Residual Analysis - Model Quality Check', fontsize=16, fontweight='bold')
+spec, axes = chart_spec('best_model_residual_analysis.png', 2, 2, figsize=(14, 10))
+spec.suptitle('Residual Analysis - Model Quality Check', fontsize=16, fontweight='bold')
 
 # Temperature residuals
 temp_residuals = df[temp_col] - df['Temp_Predicted']
@@ -240,10 +220,10 @@ axes[1, 1].set_xlabel('Predicted Values', fontsize=10)
 axes[1, 1].set_ylabel('Residuals', fontsize=10)
 axes[1, 1].grid(True, alpha=0.3)
 
-plt.tight_layout()
-plt.savefig('best_model_residual_analysis.png', dpi=300, bbox_inches='tight')
-print("  ✓ Residual analysis saved")
-plt.close()
+charts.append(spec)
+
+print("\n[STEP 5] Rendering charts...")
+render_charts(charts)
 
 print("\n✓ All visualizations completed!")
 print("\nGenerated files:")
@@ -0,0 +1,457 @@
+"""
+Chart Rendering - Figures described as lightweight specs and rendered in worker processes
+Scripts record their plotting calls on a ChartSpec (same calls as on matplotlib axes) and
+hand the specs to render_charts, which draws and saves them concurrently with the Agg backend;
+charts whose content hash is unchanged since the last build are not redrawn, and long
+series are downsampled to the pixel width of their subplot before drawing
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from downsampling import downsample_indices, minmax_indices, take
+from stage_profile import stage
+
+CHART_STYLE = 'seaborn-v0_8-darkgrid'
+CHART_PALETTE = 'husl'
+CHART_DPI = 300
+
+# Build manifest: output file -> content hash of what produced it
+CHART_CACHE_FILE = '.chart_cache.json'
+
+# Bump when rendering changes in a way the recorded calls do not capture
+CHART_CACHE_VERSION = 4
+
+
+def _bar_labels(ax, fmt='{:.4f}', **kwargs):
+    """Value label above every bar drawn on the axes"""
+    return [ax.text(bar.get_x() + bar.get_width() / 2., bar.get_height(), fmt.format(bar.get_height()),
+                    ha='center', va='bottom', **kwargs)
+            for bar in ax.patches]
+
+
+def _heatmap(ax, data, **kwargs):
+    import seaborn as sns
+    sns.heatmap(data, ax=ax, **kwargs)
+
+
+def _plot_acf(ax, series, **kwargs):
+    from statsmodels.graphics.tsaplots import plot_acf
+    plot_acf(series, ax=ax, **kwargs)
+
+
+def _plot_pacf(ax, series, **kwargs):
+    from statsmodels.graphics.tsaplots import plot_pacf
+    plot_pacf(series, ax=ax, **kwargs)
+
+
+# Recorded calls that are not Axes methods
+LAYER_FUNCTIONS = {
+    'bar_labels': _bar_labels,
+    'heatmap': _heatmap,
+    'plot_acf': _plot_acf,
+    'plot_pacf': _plot_pacf
+}
+
+
+# Calls whose result depends on what is already drawn: redone whenever a template is reused
+DERIVED_CALLS = {'legend', 'bar_labels'}
+
+
+class AxesSpec:
+    """Records calls made on one subplot; any Axes method (or LAYER_FUNCTIONS entry) can be called"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+        return record
+
+
+class ChartSpec:
+    """
+    One output image: figure layout, recorded subplot calls and save options
+    Figure-level calls (suptitle, text, ...) are recorded on the spec itself.
+    Lines and bands longer than the subplot is wide in pixels are downsampled
+    (downsample='lttb' or 'minmax'; None keeps every point).
+    Charts given the same template key (e.g. one per parameter or station)
+    are rendered by building the first figure and updating its artists.
+    """
+
+    def __init__(self, filename, nrows=1, ncols=1, figsize=None, dpi=CHART_DPI, style=CHART_STYLE,
+                 downsample='lttb', template=None):
+        self.filename = filename
+        self.nrows = nrows
+        self.ncols = ncols
+        self.figsize = figsize
+        self.dpi = dpi
+        self.style = style
+        # 'lttb', 'minmax' or None to draw every point
+        self.downsample = downsample
+        # Specs with the same template key are drawn on one figure, updated in place
+        self.template = template
+        self.axes = [AxesSpec() for _ in range(nrows * ncols)]
+        self.figure_calls = []
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def record(*args, **kwargs):
+            self.figure_calls.append((name, args, kwargs))
+        return record
+
+
+def chart_spec(filename, nrows=1, ncols=1, figsize=None, **options):
+    """
+    Counterpart of plt.subplots that records instead of drawing
+    Returns: (spec, axes) - axes is a single AxesSpec or an array shaped like plt.subplots' axes
+    """
+    spec = ChartSpec(filename, nrows, ncols, figsize, **options)
+    if nrows * ncols == 1:
+        return spec, spec.axes[0]
+    axes = np.empty(nrows * ncols, dtype=object)
+    axes[:] = spec.axes
+    return spec, axes.reshape(nrows, ncols) if nrows > 1 and ncols > 1 else axes
+
+
+def _feed(digest, value):
+    """Hash a recorded argument by content (arrays and pandas objects by their data)"""
+    if isinstance(value, (pd.Series, pd.DataFrame, pd.Index)):
+        digest.update(repr((type(value).__name__, getattr(value, 'name', None),
+                            list(getattr(value, 'columns', [])))).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(value, index=not isinstance(value, pd.Index)).values.tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(repr((value.dtype.str, value.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        digest.update(f'{type(value).__name__}[{len(value)}]'.encode('utf-8'))
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f'dict[{len(value)}]'.encode('utf-8'))
+        for key in sorted(value, key=repr):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+
+def spec_digest(spec):
+    """
+    Content hash of a chart: layout, save options and every recorded call with its data
+    Returns: hex digest
+    """
+    import matplotlib
+
+    digest = hashlib.sha1()
+    _feed(digest, (CHART_CACHE_VERSION, matplotlib.__version__, spec.filename, spec.nrows, spec.ncols,
+                   spec.figsize, spec.dpi, spec.style, CHART_PALETTE, spec.downsample, spec.template))
+    for recorded in spec.axes:
+        _feed(digest, recorded.calls)
+    _feed(digest, spec.figure_calls)
+    return digest.hexdigest()
+
+
+def source_digest(*paths):
+    """Content hash of the files that draw a figure (for charts drawn directly by a script)"""
+    import matplotlib
+
+    digest = hashlib.sha1(f'{CHART_CACHE_VERSION}:{matplotlib.__version__}'.encode('utf-8'))
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _output_stamp(filename):
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(cache_file=CHART_CACHE_FILE):
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, cache_file=CHART_CACHE_FILE):
+    temp_file = f'{cache_file}.tmp'
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(temp_file, cache_file)
+
+
+def chart_is_current(filename, digest, manifest):
+    """True if filename was built from this digest and has not been modified or deleted since"""
+    entry = manifest.get(filename)
+    return entry is not None and entry['digest'] == digest and entry['stamp'] == _output_stamp(filename)
+
+
+def figure_up_to_date(filename, *sources, cache_file=CHART_CACHE_FILE):
+    """
+    For scripts that draw a figure themselves: True if the output exists and the
+    script (plus any other listed sources) is unchanged since it was last built
+    """
+    return chart_is_current(filename, source_digest(*sources), load_manifest(cache_file))
+
+
+def record_figure(filename, *sources, cache_file=CHART_CACHE_FILE):
+    """Record a figure built by a script so figure_up_to_date can skip it next time"""
+    record_outputs({filename: source_digest(*sources)}, cache_file)
+
+
+def record_outputs(digests, cache_file=CHART_CACHE_FILE):
+    """Record freshly written outputs (dict filename -> digest) in the build manifest"""
+    manifest = load_manifest(cache_file)
+    for filename, digest in digests.items():
+        manifest[filename] = {'digest': digest, 'stamp': _output_stamp(filename)}
+    save_manifest(manifest, cache_file)
+
+
+def _downsample_call(name, args, max_points, method):
+    """
+    Arguments of a plot/fill_between call with its series cut to max_points
+    Other calls, and series already short enough, pass through unchanged
+    """
+    if name == 'plot' and len(args) in (2, 3) and (len(args) == 2 or isinstance(args[2], str)):
+        x, y = args[0], args[1]
+        if np.ndim(y) == 1 and len(y) > max_points:
+            idx = downsample_indices(x, y, max_points, method)
+            return (take(x, idx), take(y, idx)) + tuple(args[2:])
+    elif name == 'fill_between' and len(args) >= 2 and np.ndim(args[1]) == 1 and len(args[1]) > max_points:
+        # Keep the extremes of both band edges so the band never narrows
+        bounds = [b for b in args[1:3] if np.ndim(b) == 1]
+        idx = np.unique(np.concatenate([minmax_indices(b, max_points // len(bounds)) for b in bounds]))
+        return tuple(take(a, idx) if np.ndim(a) == 1 else a for a in args)
+    return args
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _call_digest(args, kwargs):
+    digest = hashlib.sha1()
+    _feed(digest, (args, kwargs))
+    return digest.digest()
+
+
+def _max_points(spec, fig):
+    # One point per horizontal pixel of a subplot is as much as the image can show
+    return int(fig.get_figwidth() * spec.dpi / spec.ncols)
+
+
+def _draw_call(target, name, args, kwargs):
+    if name in LAYER_FUNCTIONS:
+        return LAYER_FUNCTIONS[name](target, *args, **kwargs)
+    return getattr(target, name)(*args, **kwargs)
+
+
+def _build(spec):
+    """
+    Build a figure from scratch
+    Returns: (fig, axes, artists) - artists[i][k] is what call k on subplot i returned
+    """
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(spec.nrows, spec.ncols, figsize=spec.figsize, squeeze=False)
+    max_points = _max_points(spec, fig)
+    artists = []
+    for ax, recorded in zip(axes.ravel(), spec.axes):
+        returned = []
+        for name, args, kwargs in recorded.calls:
+            if spec.downsample:
+                args = _downsample_call(name, args, max_points, spec.downsample)
+            returned.append(_draw_call(ax, name, args, kwargs))
+        artists.append(returned)
+    artists.append([_draw_call(fig, name, args, kwargs) for name, args, kwargs in spec.figure_calls])
+    fig.tight_layout()
+    return fig, axes, artists
+
+
+def _same_structure(spec, template):
+    """True if spec records the same layout and the same call sequence as template"""
+    if (spec.nrows, spec.ncols, spec.figsize, spec.dpi, spec.style, spec.downsample) != \
+            (template.nrows, template.ncols, template.figsize, template.dpi, template.style, template.downsample):
+        return False
+    calls = [recorded.calls for recorded in spec.axes] + [spec.figure_calls]
+    template_calls = [recorded.calls for recorded in template.axes] + [template.figure_calls]
+    return all([c[0] for c in a] == [c[0] for c in b] for a, b in zip(calls, template_calls))
+
+
+def _remove(artist):
+    for item in artist if isinstance(artist, list) else [artist]:
+        item.remove()
+
+
+def _update(spec, template, fig, axes, artists):
+    """
+    Turn the figure built for template into spec's figure in place
+
+    Lines get set_data and titles/labels set_text; other changed calls
+    (bars, bands, reference lines, value labels) have their artists
+    removed and redrawn on the existing axes. tight_layout runs again
+    (new tick labels can change the margins), so the image matches a
+    fresh build of the same spec whichever charts shared the figure.
+    Returns: False (figure untouched) if a changed call cannot be updated
+    """
+    max_points = _max_points(spec, fig)
+    targets = list(axes.ravel()) + [fig]
+    calls = [recorded.calls for recorded in spec.axes] + [spec.figure_calls]
+    template_calls = [recorded.calls for recorded in template.axes] + [template.figure_calls]
+
+    # Plan first so a figure is never left half updated
+    plan = []
+    for i, (new_calls, old_calls) in enumerate(zip(calls, template_calls)):
+        for k, ((name, args, kwargs), (_, old_args, old_kwargs)) in enumerate(zip(new_calls, old_calls)):
+            if name in DERIVED_CALLS:
+                plan.append((i, k, 'derived'))
+            elif _call_digest(args, kwargs) == _call_digest(old_args, old_kwargs):
+                continue
+            elif name in ('set_title', 'set_xlabel', 'set_ylabel', 'suptitle') and \
+                    _call_digest(args[1:], kwargs) == _call_digest(old_args[1:], old_kwargs):
+                plan.append((i, k, 'text'))
+            elif name == 'plot' and len(args) == len(old_args) and len(artists[i][k]) == 1 and \
+                    _call_digest(args[2:], {n: v for n, v in kwargs.items() if n != 'label'}) == \
+                    _call_digest(old_args[2:], {n: v for n, v in old_kwargs.items() if n != 'label'}):
+                plan.append((i, k, 'line'))
+            elif i < len(axes.ravel()) and artists[i][k] is not None and name not in ('heatmap', 'plot_acf', 'plot_pacf'):
+                plan.append((i, k, 'redraw'))
+            else:
+                return False
+
+    touched = set()
+    for i, k, action in plan:
+        name, args, kwargs = calls[i][k]
+        if spec.downsample:
+            args = _downsample_call(name, args, max_points, spec.downsample)
+        artist = artists[i][k]
+        if action == 'text':
+            artist.set_text(args[0])
+        elif action == 'line':
+            x, y = (args[0], args[1]) if len(args) > 1 else (np.arange(len(args[0])), args[0])
+            artist[0].set_data(np.asarray(x), np.asarray(y))
+            artist[0].set_label(kwargs.get('label', artist[0].get_label()))
+        elif action == 'redraw':
+            _remove(artist)
+            artists[i][k] = _draw_call(targets[i], name, args, kwargs)
+        touched.add(i)
+
+    for i in touched:
+        if i < len(axes.ravel()):
+            ax = targets[i]
+            ax.relim()
+            # relim only looks at lines and patches; bands (fill_between) are collections
+            for collection in ax.collections:
+                ax.update_datalim(collection.get_datalim(ax.transData).get_points())
+            ax.autoscale_view()
+    # Legends and value labels last, so they see the updated lines and bars
+    for i, k, action in plan:
+        if action == 'derived':
+            name, args, kwargs = calls[i][k]
+            if name != 'legend':
+                _remove(artists[i][k])
+            artists[i][k] = _draw_call(targets[i], name, args, kwargs)
+    fig.tight_layout()
+    return True
+
+
+def render_group(specs):
+    """
+    Draw and save specs that share a template: the figure is built for the
+    first one and updated in place for the rest
+    Returns: list of (filename, render seconds)
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    results = []
+    built = None
+    with plt.style.context(specs[0].style):
+        sns.set_palette(CHART_PALETTE)
+        for spec in specs:
+            start = time.perf_counter()
+            if built is None or not _same_structure(spec, built[0]) or not _update(spec, *built):
+                if built is not None:
+                    plt.close(built[1])
+                built = (spec,) + _build(spec)
+            built = (spec,) + built[1:]
+            built[1].savefig(spec.filename, dpi=spec.dpi, bbox_inches='tight')
+            results.append((spec.filename, time.perf_counter() - start))
+        plt.close(built[1])
+    return results
+
+
+def render_chart(spec):
+    """
+    Draw and save one spec
+    Returns: (filename, render seconds)
+    """
+    return render_group([spec])[0]
+
+
+@stage('render')
+def render_charts(specs, workers=None, verbose=True, cache_file=CHART_CACHE_FILE):
+    """
+    Render specs concurrently, one worker process per core
+
+    Charts whose content hash matches the last build (and whose output file
+    is untouched) are skipped; cache_file=None renders everything.
+    Workers are forked so they share the parent's imported modules and data;
+    where fork is unavailable (the scripts have no __main__ guard to make
+    spawn safe) the specs are rendered one after another in this process.
+    workers: Process count (default: CPU count; 1 renders in-process)
+    Returns: dict filename -> render seconds (0.0 for charts that were up to date)
+    """
+    specs = list(specs)
+    manifest = load_manifest(cache_file) if cache_file else {}
+    digests = {spec.filename: spec_digest(spec) for spec in specs}
+    stale = [spec for spec in specs if not chart_is_current(spec.filename, digests[spec.filename], manifest)]
+
+    # A template's charts stay together in one task; untemplated charts are tasks of their own
+    groups = {}
+    for spec in stale:
+        groups.setdefault(spec.template if spec.template is not None else id(spec), []).append(spec)
+    tasks = list(groups.values())
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    start = time.perf_counter()
+    if workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+            rendered = dict(result for group in pool.map(render_group, tasks) for result in group)
+    else:
+        workers = 1
+        rendered = dict(result for group in map(render_group, tasks) for result in group)
+    elapsed = time.perf_counter() - start
+
+    if cache_file and rendered:
+        record_outputs({filename: digests[filename] for filename in rendered}, cache_file)
+
+    results = {spec.filename: rendered.get(spec.filename, 0.0) for spec in specs}
+    if verbose:
+        for filename, seconds in results.items():
+            status = f"{seconds:.1f}s" if filename in rendered else "unchanged"
+            print(f"  ✓ {filename} ({status})")
+        print(f"  Rendered {len(rendered)} of {len(specs)} charts in {elapsed:.1f}s with {workers} worker(s)"
+              f" ({sum(rendered.values()):.1f}s of rendering)")
+    return results
@@ -7,8 +7,6 @@ Date: 26-11-2025 | Location: Gurugram, Haryana
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,7 +17,6 @@ from arch import arch_model
 
 # Statistical tests
 from statsmodels.tsa.stattools import adfuller
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 
 # Performance metrics
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
@@ -27,9 +24,13 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 # Flowchart
 from graphviz import Digraph
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Streaming correlation
+from streaming_stats import StreamingCovariance, PeriodCorrelation, StreamingSummary
+
+# Charts (rendered together at the end of the analysis)
+from chart_render import chart_spec, render_charts
+from stage_profile import stage
+charts = []
 
 print("="*80)
 print("IoT WEATHER MONITORING SYSTEM - TIME SERIES ANALYSIS")
@@ -39,7 +40,8 @@ print("="*80)
 # STEP 1: LOAD AND EXPLORE DATA
 # ============================================================================
 print("\n[STEP 1] Loading Data...")
-df = pd.read_excel('iot_sensor_readings.xlsx')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
 
 print(f"✓ Dataset loaded successfully")
 print(f"  Shape: {df.shape}")
@@ -50,7 +52,12 @@ print(f"  Columns: {list(df.columns)}")
 # ============================================================================
 print("\n[STEP 2] Statistical Description")
 print("-"*80)
-print(df.describe().round(2))
+# Exact count/mean/std/min/max, sketched quantiles - same scan works chunk by chunk
+with stage('analyze', 'summary statistics'):
+    summary = StreamingSummary()
+    for start in range(0, len(df), 1000):
+        summary.update(df.iloc[start:start + 1000])
+print(summary.describe().round(2))
 
 print("\n✓ Missing Values Check:")
 print(df.isnull().sum())
@@ -61,9 +68,10 @@ print(df.isnull().sum())
 print("\n[STEP 3] Data Preprocessing...")
 
 # Create datetime index
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.set_index('DateTime')
-df = df.sort_index()
+with stage('load', 'DateTime index'):
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.set_index('DateTime')
+    df = df.sort_index()
 
 # Extract numeric columns
 temp_col = 'Temperature (°C)'
@@ -79,7 +87,7 @@ print("✓ Data sorted by time")
 # ============================================================================
 print("\n[STEP 4] Creating visualizations...")
 
-fig, axes = plt.subplots(4, 1, figsize=(15, 12))
+spec, axes = chart_spec('time_series_plots.png', 4, 1, figsize=(15, 12))
 
 # Temperature
 axes[0].plot(df.index, df[temp_col], color='#FF6B6B', linewidth=2, label='Temperature')
@@ -110,21 +118,27 @@ axes[3].set_xlabel('Time', fontsize=12)
 axes[3].legend(loc='best')
 axes[3].grid(True, alpha=0.3)
 
-plt.tight_layout()
-plt.savefig('time_series_plots.png', dpi=300, bbox_inches='tight')
-print("✓ Time series plots saved: time_series_plots.png")
-plt.close()
-
-# Correlation heatmap
-correlation_matrix = df[[temp_col, humidity_col, pressure_col, dew_col]].corr()
-plt.figure(figsize=(10, 8))
-sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, fmt='.3f', 
-            linewidths=2, square=True, cbar_kws={"shrink": 0.8})
-plt.title('Correlation Matrix of Weather Parameters', fontsize=16, fontweight='bold', pad=20)
-plt.tight_layout()
-plt.savefig('correlation_matrix.png', dpi=300, bbox_inches='tight')
-print("✓ Correlation matrix saved: correlation_matrix.png")
-plt.close()
+charts.append(spec)
+
+# Correlation heatmap (streaming accumulator, mergeable across chunks/stations)
+corr_columns = [temp_col, humidity_col, pressure_col, dew_col]
+with stage('analyze', 'correlation'):
+    corr_acc = StreamingCovariance(corr_columns)
+    hourly_corr = PeriodCorrelation(corr_columns, freq='1h')
+    for start in range(0, len(df), 1000):
+        batch = df.iloc[start:start + 1000]
+        corr_acc.update(batch)
+        hourly_corr.update(batch)
+    correlation_matrix = corr_acc.correlation()
+spec, ax = chart_spec('correlation_matrix.png', figsize=(10, 8))
+ax.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0, fmt='.3f', 
+           linewidths=2, square=True, cbar_kws={"shrink": 0.8})
+ax.set_title('Correlation Matrix of Weather Parameters', fontsize=16, fontweight='bold', pad=20)
+charts.append(spec)
+
+print("\n  Hourly Temperature-Humidity correlation:")
+for period, corr in hourly_corr.period_correlations().items():
+    print(f"    {period:%I:%M %p}: {corr.loc[temp_col, humidity_col]:.3f}")
 
 # ============================================================================
 # STEP 5: STATIONARITY TEST
@@ -144,46 +158,47 @@ def adf_test(series, name):
         print(f"  ✗ Non-stationary (p-value > 0.05)")
     return result[1] <= 0.05
 
-temp_stationary = adf_test(df[temp_col], "Temperature")
-humidity_stationary = adf_test(df[humidity_col], "Humidity")
-pressure_stationary = adf_test(df[pressure_col], "Pressure")
-dew_stationary = adf_test(df[dew_col], "Dew Point")
+with stage('analyze', 'ADF tests'):
+    temp_stationary = adf_test(df[temp_col], "Temperature")
+    humidity_stationary = adf_test(df[humidity_col], "Humidity")
+    pressure_stationary = adf_test(df[pressure_col], "Pressure")
+    dew_stationary = adf_test(df[dew_col], "Dew Point")
 
 # ============================================================================
 # STEP 6: ACF AND PACF PLOTS
 # ============================================================================
 print("\n[STEP 6] Creating ACF and PACF plots...")
 
-fig, axes = plt.subplots(4, 2, figsize=(15, 16))
+spec, axes = chart_spec('acf_pacf_plots.png', 4, 2, figsize=(15, 16))
 
 # Temperature
-plot_acf(df[temp_col].dropna(), lags=40, ax=axes[0, 0])
+axes[0, 0].plot_acf(df[temp_col].dropna(), lags=40)
 axes[0, 0].set_title('Temperature - ACF', fontsize=12, fontweight='bold')
-plot_pacf(df[temp_col].dropna(), lags=40, ax=axes[0, 1])
+axes[0, 1].plot_pacf(df[temp_col].dropna(), lags=40)
 axes[0, 1].set_title('Temperature - PACF', fontsize=12, fontweight='bold')
 
 # Humidity
-plot_acf(df[humidity_col].dropna(), lags=40, ax=axes[1, 0])
+axes[1, 0].plot_acf(df[humidity_col].dropna(), lags=40)
 axes[1, 0].set_title('Humidity - ACF', fontsize=12, fontweight='bold')
-plot_pacf(df[humidity_col].dropna(), lags=40, ax=axes[1, 1])
+axes[1, 1].plot_pacf(df[humidity_col].dropna(), lags=40)
 axes[1, 1].set_title('Humidity - PACF', fontsize=12, fontweight='bold')
 
 # Pressure
-plot_acf(df[pressure_col].dropna(), lags=40, ax=axes[2, 0])
+axes[2, 0].plot_acf(df[pressure_col].dropna(), lags=40)
 axes[2, 0].set_title('Pressure - ACF', fontsize=12, fontweight='bold')
-plot_pacf(df[pressure_col].dropna(), lags=40, ax=axes[2, 1])
+axes[2, 1].plot_pacf(df[pressure_col].dropna(), lags=40)
 axes[2, 1].set_title('Pressure - PACF', fontsize=12, fontweight='bold')
 
 # Dew Point
-plot_acf(df[dew_col].dropna(), lags=40, ax=axes[3, 0])
+axes[3, 0].plot_acf(df[dew_col].dropna(), lags=40)
 axes[3, 0].set_title('Dew Point - ACF', fontsize=12, fontweight='bold')
-plot_pacf(df[dew_col].dropna(), lags=40, ax=axes[3, 1])
+axes[3, 1].plot_pacf(df[dew_col].dropna(), lags=40)
 axes[3, 1].set_title('Dew Point - PACF', fontsize=12, fontweight='bold')
 
-plt.tight_layout()
-plt.savefig('acf_pacf_plots.png', dpi=300, bbox_inches='tight')
-print("✓ ACF and PACF plots saved: acf_pacf_plots.png")
-plt.close()
+charts.append(spec)
+
+print("\nRendering charts...")
+render_charts(charts)
 
 print("\n[STEP 7] Preparing for model training...")
 print("  Train-Test Split: 80-20")
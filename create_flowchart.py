@@ -4,6 +4,8 @@ Generate Methodology Flowchart using Graphviz
 
 from graphviz import Digraph
 
+from stage_profile import stage
+
 print("="*80)
 print("CREATING METHODOLOGY FLOWCHART")
 print("="*80)
@@ -113,7 +115,8 @@ with dot.subgraph(name='cluster_legend') as legend:
 
 # Render the flowchart
 try:
-    dot.render('methodology_flowchart', format='png', cleanup=True)
+    with stage('render', 'methodology_flowchart.png'):
+        dot.render('methodology_flowchart', format='png', cleanup=True)
     print("✓ Flowchart generated successfully: methodology_flowchart.png")
 except Exception as e:
     print(f"✗ Error generating flowchart: {e}")
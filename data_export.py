@@ -0,0 +1,201 @@
+"""
+Data Export - Constant-memory table writers for predictions and forecasts
+Workbooks are streamed row by row with xlsxwriter; tables too long for a
+worksheet are written in chunks to Parquet (or CSV without pyarrow)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from stage_profile import stage
+
+# Worksheet limit, including the header row
+EXCEL_MAX_ROWS = 1048576
+
+# Rows converted and written per chunk
+EXPORT_CHUNK_ROWS = 100000
+
+# Excel stores datetimes as days since this epoch
+EXCEL_EPOCH = np.datetime64('1899-12-30T00:00:00', 'ns')
+EXCEL_DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+
+# Extensions tried, in order, when a workbook was written to a fallback format
+FALLBACK_EXTENSIONS = ['.parquet', '.csv']
+
+
+def _has_module(name):
+    """True when an optional dependency can be imported"""
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _excel_columns(chunk):
+    """
+    Convert a chunk into per-column Python lists ready for xlsxwriter
+    Returns: List of (kind, values) with kind 'number', 'datetime', 'bool' or 'any'; missing values are None
+    """
+    columns = []
+    for name in chunk.columns:
+        series = chunk[name]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            stamps = series.dt.tz_localize(None) if series.dt.tz is not None else series
+            stamps = stamps.values.astype('datetime64[ns]')
+            days = (stamps - EXCEL_EPOCH) / np.timedelta64(1, 'D')
+            values = np.where(np.isnat(stamps), np.nan, days)
+            kind = 'datetime'
+        elif pd.api.types.is_bool_dtype(series):
+            columns.append(('bool', series.tolist()))
+            continue
+        elif not pd.api.types.is_numeric_dtype(series):
+            columns.append(('any', [None if pd.isna(v) else v for v in series.tolist()]))
+            continue
+        else:
+            values = series.values.astype(float)
+            kind = 'number'
+        values = values.astype(object)
+        values[~np.isfinite(values.astype(float))] = None
+        columns.append((kind, values.tolist()))
+    return columns
+
+
+def _write_xlsx(df, path, sheet_name):
+    """Stream a frame into a new workbook with xlsxwriter in constant-memory mode"""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {'constant_memory': True, 'strings_to_formulas': False,
+                                          'strings_to_urls': False})
+    try:
+        worksheet = workbook.add_worksheet(sheet_name)
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+        date_format = workbook.add_format({'num_format': EXCEL_DATETIME_FORMAT})
+        for col, name in enumerate(df.columns):
+            worksheet.write_string(0, col, str(name), header_format)
+
+        # constant_memory flushes each row once the next begins, so rows go strictly in order
+        write, write_number, write_boolean = worksheet.write, worksheet.write_number, worksheet.write_boolean
+        row = 1
+        for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+            columns = _excel_columns(df.iloc[start:start + EXPORT_CHUNK_ROWS])
+            writers = [(col, kind, values) for col, (kind, values) in enumerate(columns)]
+            for i in range(len(columns[0][1]) if columns else 0):
+                for col, kind, values in writers:
+                    value = values[i]
+                    if value is None:
+                        continue
+                    if kind == 'number':
+                        write_number(row, col, value)
+                    elif kind == 'datetime':
+                        write_number(row, col, value, date_format)
+                    elif kind == 'bool':
+                        write_boolean(row, col, value)
+                    else:
+                        write(row, col, value, date_format)
+                row += 1
+    finally:
+        workbook.close()
+
+
+def _write_parquet(df, path):
+    """Write a frame to Parquet one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+            table = pa.Table.from_pandas(df.iloc[start:start + EXPORT_CHUNK_ROWS], preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_csv(df, path):
+    """Append a frame to CSV chunk by chunk"""
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        df.iloc[start:start + EXPORT_CHUNK_ROWS].to_csv(path, mode='w' if start == 0 else 'a',
+                                                         header=start == 0, index=False)
+
+
+def _remove_stale(path, keep):
+    """
+    Delete fallback files of an earlier run so readers never pick them up
+    The requested workbook itself is never deleted: it may be an input other
+    scripts read directly (iot_sensor_readings.xlsx), and resolve_export
+    prefers whichever file was written last
+    """
+    stem = os.path.splitext(path)[0]
+    for candidate in [stem + ext for ext in FALLBACK_EXTENSIONS]:
+        if candidate != keep and os.path.exists(candidate):
+            os.remove(candidate)
+
+
+def write_frame(df, path, sheet_name='Sheet1', index=False):
+    """
+    Export a table without building the whole workbook in memory
+    df: DataFrame to write
+    path: Target .xlsx file
+    sheet_name: Worksheet name
+    index: Write the index as leading columns
+    Returns: Path actually written (.parquet or .csv when the table exceeds a worksheet)
+    """
+    if index:
+        df = df.reset_index()
+
+    with stage('export', os.path.basename(path)):
+        if len(df) + 1 > EXCEL_MAX_ROWS:
+            stem = os.path.splitext(path)[0]
+            if _has_module('pyarrow'):
+                written = stem + '.parquet'
+                _write_parquet(df, written)
+            else:
+                written = stem + '.csv'
+                _write_csv(df, written)
+        else:
+            written = path
+            if _has_module('xlsxwriter'):
+                _write_xlsx(df, path, sheet_name)
+            else:
+                df.to_excel(path, index=False, sheet_name=sheet_name)
+
+    _remove_stale(path, written)
+    return written
+
+
+def resolve_export(path):
+    """
+    Locate a table written by write_frame
+    path: The .xlsx path it was asked to write
+    Returns: The workbook or the Parquet/CSV file it fell back to, whichever was written last
+    """
+    stem = os.path.splitext(path)[0]
+    candidates = [c for c in [path] + [stem + ext for ext in FALLBACK_EXTENSIONS] if os.path.exists(c)]
+    if not candidates:
+        raise FileNotFoundError(path)
+    return max(candidates, key=os.path.getmtime)
+
+
+def read_frame(path):
+    """
+    Read a table written by write_frame, whichever format it ended up in
+    path: The .xlsx path it was asked to write
+    Returns: DataFrame
+    """
+    path = resolve_export(path)
+    ext = os.path.splitext(path)[1].lower()
+    with stage('load', os.path.basename(path)):
+        if ext == '.parquet':
+            return pd.read_parquet(path)
+        if ext == '.csv':
+            df = pd.read_csv(path)
+            if 'DateTime' in df.columns:
+                df['DateTime'] = pd.to_datetime(df['DateTime'])
+            return df
+        return pd.read_excel(path)
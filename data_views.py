@@ -0,0 +1,111 @@
+"""
+Data Views - One column store per data set, with splits and model inputs as views into it
+Each parameter is held once as a float64 array beside one datetime64 array; train/test
+windows, Series, DataFrames and Prophet 'ds'/'y' frames handed to the model families
+are slices of those arrays instead of per-parameter copies
+"""
+
+import numpy as np
+import pandas as pd
+
+from weather_data import PARAMETER_COLUMNS
+
+
+def _readonly(values):
+    """A read-only view, so a model writing into its input fails instead of changing every view"""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class ColumnStore:
+    """
+    Time-ordered sensor columns shared by every view cut from them
+
+    window()/split() are basic slices, so a train/test split costs no memory.
+    Series, frames and Prophet frames are built once per window and cached;
+    every Prophet frame of a window shares the window's 'ds' array.
+    The arrays are read-only: code that needs to modify its input must copy it.
+    """
+
+    def __init__(self, times, columns, offset=0):
+        times = np.asarray(times)
+        # Any datetime64 unit is kept as it is (pandas parses to microseconds); others are converted
+        self.times = _readonly(times if times.dtype.kind == 'M' else times.astype('datetime64[ns]'))
+        self.columns = {name: _readonly(np.asarray(values, dtype=float)) for name, values in columns.items()}
+        # Position of the first row in the full data set (the polynomial models' time index)
+        self.offset = offset
+        self._index = None
+        self._cache = {}
+
+    @classmethod
+    def from_frame(cls, df, columns=None, time_col='DateTime'):
+        """
+        Column store over a loaded, time-sorted frame
+        df: DataFrame with the time column and the parameter columns
+        columns: Columns to hold (default: the PARAMETER_COLUMNS present)
+        Float64 and datetime64 columns are taken from the frame without copying.
+        """
+        columns = [col for col in (columns or PARAMETER_COLUMNS) if col in df.columns]
+        times = df.index if time_col not in df.columns else df[time_col]
+        return cls(times.to_numpy(), {col: df[col].to_numpy() for col in columns})
+
+    def __len__(self):
+        return len(self.times)
+
+    def window(self, start=None, stop=None):
+        """Rows [start:stop) as a store sharing this one's arrays"""
+        first, last, _ = slice(start, stop).indices(len(self))
+        return ColumnStore(self.times[first:last],
+                           {name: values[first:last] for name, values in self.columns.items()},
+                           self.offset + first)
+
+    def split(self, train_size):
+        """
+        Train/test split without copying
+        train_size: Number of leading rows to train on
+        Returns: (train store, test store)
+        """
+        return self.window(None, train_size), self.window(train_size, None)
+
+    def values(self, column):
+        """The column as a read-only numpy array"""
+        return self.columns[column]
+
+    def time_index(self):
+        """Row positions in the full data set, shaped (n, 1) for the polynomial features"""
+        return np.arange(self.offset, self.offset + len(self)).reshape(-1, 1)
+
+    @property
+    def index(self):
+        """DatetimeIndex over the time array (built once)"""
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self.times, copy=False, name='DateTime')
+        return self._index
+
+    def _cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def series(self, column):
+        """pandas Series of one column indexed by time, as ARIMA/SARIMA/smoothing take it"""
+        return self._cached(('series', column), lambda: pd.Series(self.columns[column], index=self.index,
+                                                                  name=column, copy=False))
+
+    def frame(self, columns=None):
+        """DataFrame of several columns indexed by time, as VAR/GARCH/smoothing take it"""
+        columns = tuple(columns or self.columns)
+        return self._cached(('frame', columns), lambda: pd.DataFrame(
+            {col: self.columns[col] for col in columns}, index=self.index, copy=False))
+
+    def prophet_frame(self, column=None):
+        """
+        Prophet-shaped frame: 'ds' plus the column as 'y'
+        column: Parameter column, or None for the 'ds'-only frame predict() takes
+        Returns: DataFrame built once per window and column
+        """
+        if column is None:
+            return self._cached(('prophet', None), lambda: pd.DataFrame({'ds': self.times}, copy=False))
+        return self._cached(('prophet', column), lambda: pd.DataFrame(
+            {'ds': self.times, 'y': self.columns[column]}, copy=False))
@@ -0,0 +1,446 @@
+"""
+Diagram Engine - Flowcharts described as nodes and edges and rendered together
+Scripts declare a Diagram (boxes, decisions, connectors, legends and free text);
+the layout - flow placement of nodes, box sizes that fit their text, edge routes
+between node borders and the canvas height - is computed once per build, and
+render_diagrams draws every diagram whose spec changed in this one process.
+Up-to-date diagrams are skipped before matplotlib is even imported
+"""
+
+import hashlib
+import importlib
+import json
+import time
+from importlib.metadata import version
+
+from chart_render import CHART_CACHE_FILE, CHART_DPI, chart_is_current, load_manifest, record_outputs
+from stage_profile import stage
+
+# Bump when drawing changes in a way the specs do not capture
+DIAGRAM_VERSION = 1
+
+# Scripts whose module-level DIAGRAM is rendered by `python diagram_engine.py`
+DIAGRAM_MODULES = [
+    'create_flowchart_matplotlib',
+    'combined_complete_flowchart',
+    'combined_flowchart_improved',
+    'hardware_architecture_flowchart',
+    'software_flow_blynk',
+    'software_flow_webserver',
+]
+
+DEFAULT_STYLE = {
+    'box_pad': 0.15,          # Rounded-corner padding around a box (data units)
+    'box_linewidth': 2.5,
+    'text_margin': 0.12,      # Space kept between a box's text and its border
+    'linespacing': 1.25,
+    'gap': 0.35,              # Space between consecutive boxes of a flow (arrow length)
+    'arrow_scale': 25,
+    'arrow_width': 2.5,
+    'label_fontsize': 9,
+    'label_dx': 0.5,          # Edge labels sit this far right of the edge midpoint
+    'label_box': True,
+    'margin': 0.4,            # Space kept below the lowest node
+}
+
+SIDES = {'top': (0.0, 1.0), 'bottom': (0.0, -1.0), 'left': (-1.0, 0.0), 'right': (1.0, 0.0)}
+
+
+class Diagram:
+    """
+    A flowchart as data: nodes, edges and annotations
+
+    Nodes added without a y position are stacked by the current flow
+    (see flow()); nodes with explicit x and y keep them. Coordinates are
+    data units of a canvas of figsize inches showing xlim x ylim; the canvas
+    grows downward when a flow needs more room than ylim gives it, and items
+    added with anchor='bottom' move down with the bottom edge.
+    """
+
+    def __init__(self, filename, figsize, xlim, ylim, floor=None, dpi=CHART_DPI, **style):
+        self.filename = filename
+        self.figsize = tuple(figsize)
+        self.xlim = tuple(xlim)
+        self.ylim = tuple(ylim)
+        # Lowest y the flow may reach before the canvas grows (room for bottom-anchored items)
+        self.floor = ylim[0] if floor is None else floor
+        self.dpi = dpi
+        unknown = set(style) - set(DEFAULT_STYLE)
+        if unknown:
+            raise ValueError(f"Unknown diagram style: {', '.join(sorted(unknown))}")
+        self.style = {**DEFAULT_STYLE, **style}
+        self.nodes = {}
+        self.edges = []
+        self.items = []
+        self._flow = None
+
+    def flow(self, x, top, gap=None):
+        """Stack the following unpositioned nodes centred on x, starting with a top border at y=top"""
+        self._flow = {'x': x, 'top': top, 'gap': self.style['gap'] if gap is None else gap}
+        self.items.append(('flow', dict(self._flow)))
+        return self
+
+    def space(self, dy):
+        """Leave dy extra units before the next node of the flow"""
+        self.items.append(('space', dy))
+        return self
+
+    def node(self, key, text, color, fontsize=10, shape='box', x=None, y=None, width=None,
+             height=None, beside=False, fontweight='bold'):
+        """
+        Add a box ('box' rounded, 'rect' square-cornered) or decision ('diamond')
+        x, y: Lower-left corner; y=None places the node in the current flow
+        width, height: Minimum size; the node grows to fit its text
+        beside: Share the previous flow node's row instead of starting a new one
+                (with x, the left edge; the row's centre line is kept)
+        """
+        if key in self.nodes:
+            raise ValueError(f"Duplicate node: {key}")
+        if y is None and self._flow is None:
+            raise ValueError(f"Node {key} has no y and no flow() to place it in")
+        self.nodes[key] = {'text': text, 'color': color, 'fontsize': fontsize, 'shape': shape,
+                           'x': x, 'y': y, 'width': width, 'height': height, 'beside': beside,
+                           'fontweight': fontweight}
+        if y is None:
+            self.items.append(('place', key))
+        return key
+
+    def edge(self, source, target, label='', color='black', style='->', width=None,
+             exit=None, enter=None, via_x=None, via_y=None):
+        """
+        Connect two nodes
+        exit, enter: Border side of source/target ('top', 'bottom', 'left', 'right'),
+                     optionally (side, t) with t the position along the side (0-1);
+                     by default the sides facing each other
+        via_x, via_y: Route orthogonally through a vertical (x) or horizontal (y) channel
+        """
+        for key in (source, target):
+            if key not in self.nodes:
+                raise ValueError(f"Unknown node: {key}")
+        self.edges.append({'source': source, 'target': target, 'label': label, 'color': color,
+                           'style': style, 'width': width, 'exit': exit, 'enter': enter,
+                           'via_x': via_x, 'via_y': via_y})
+
+    def note(self, key, x, text, **kwargs):
+        """Text at x on the centre line of node key (e.g. a phase label beside a flow)"""
+        self.items.append(('note', key, x, text, kwargs))
+
+    def text(self, x, y, text, anchor='top', **kwargs):
+        """Free text (ax.text keyword arguments); anchor='bottom' follows the canvas bottom"""
+        self.items.append(('text', anchor, x, y, text, kwargs))
+
+    def column(self, x, y, lines, step, anchor='top', **kwargs):
+        """
+        Lines of text stacked downward from y
+        lines: Strings, or (string, keyword overrides) pairs
+        """
+        for i, line in enumerate(lines):
+            text, overrides = (line, {}) if isinstance(line, str) else line
+            self.text(x, y - i * step, text, anchor, **{**kwargs, **overrides})
+
+    def swatches(self, x, y, items, step, size, label_dx, fontsize=9, fontweight='bold',
+                 pad=0.05, linewidth=1.5, anchor='top'):
+        """Legend rows of (label, color): a small rounded swatch and its label"""
+        for i, (label, color) in enumerate(items):
+            row_y = y - i * step
+            self.items.append(('swatch', anchor, x, row_y, size, color, pad, linewidth))
+            self.text(x + label_dx, row_y + size[1] / 2, label, anchor, fontsize=fontsize,
+                      va='center', fontweight=fontweight)
+
+    def arrow(self, start, end, style='->', color='black', width=2, scale=15, anchor='top'):
+        """Free-standing arrow between two points (legend keys)"""
+        self.items.append(('arrow', anchor, list(start), list(end), style, color, width, scale))
+
+    def spec(self):
+        """Everything that determines the image, as plain data"""
+        return {'filename': self.filename, 'figsize': self.figsize, 'xlim': self.xlim, 'ylim': self.ylim,
+                'floor': self.floor, 'dpi': self.dpi, 'style': self.style, 'nodes': self.nodes,
+                'edges': self.edges, 'items': self.items}
+
+
+def diagram_digest(diagram):
+    """Content hash of a diagram spec (plus engine and matplotlib versions)"""
+    payload = json.dumps([DIAGRAM_VERSION, version('matplotlib'), diagram.spec()],
+                         sort_keys=True, default=list)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _text_size(text, fontsize, fontweight, linespacing):
+    """Width and height of (multi-line) text in points"""
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.textpath import text_to_path
+
+    prop = FontProperties(size=fontsize, weight=fontweight)
+    lines = text.split('\n')
+    width = max(text_to_path.get_text_width_height_descent(line, prop, ismath=False)[0] for line in lines)
+    return width, len(lines) * fontsize * linespacing
+
+
+def _node_size(node, style, scale):
+    """Node width and height in data units: the given size, grown to fit the text"""
+    text_w, text_h = _text_size(node['text'], node['fontsize'], node['fontweight'], style['linespacing'])
+    text_w, text_h = text_w / 72 / scale[0], text_h / 72 / scale[1]
+    margin = style['text_margin']
+    width = max(node['width'] or 0.0, text_w + 2 * margin)
+    height = max(node['height'] or 0.0, text_h + 2 * margin)
+    if node['shape'] == 'diamond':
+        # The text's corners must stay inside the diamond: tw / w + th / h <= 1
+        width = max(width, 2 * text_w)
+        height = max(height, (text_h + 2 * margin) / (1 - text_w / width))
+    return width, height
+
+
+def _bounds(box):
+    """Visible (left, bottom, right, top) of a laid-out node, padding included"""
+    x, y, w, h, pad = box
+    return x - pad, y - pad, x + w + pad, y + h + pad
+
+
+def _port(box, side, t=0.5):
+    left, bottom, right, top = _bounds(box)
+    if side in ('top', 'bottom'):
+        return [left + t * (right - left), top if side == 'top' else bottom]
+    return [left if side == 'left' else right, bottom + t * (top - bottom)]
+
+
+def _facing_sides(a, b):
+    """Default exit/enter sides for an edge from box a to box b"""
+    a_left, a_bottom, a_right, a_top = _bounds(a)
+    b_left, b_bottom, b_right, b_top = _bounds(b)
+    if b_top <= a_bottom:
+        return 'bottom', 'top'
+    if b_bottom >= a_top:
+        return 'top', 'bottom'
+    return ('right', 'left') if b_left >= a_right else ('left', 'right')
+
+
+def _route(p, exit, q, enter, via_x, via_y, clearance):
+    """
+    Points of an edge from port p (on side exit) to port q (on side enter)
+    Opposite sides are joined straight; same or perpendicular sides, and
+    channel routes, run orthogonally
+    """
+    (px, py), (qx, qy) = p, q
+    out_p = [px + SIDES[exit][0] * clearance, py + SIDES[exit][1] * clearance]
+    out_q = [qx + SIDES[enter][0] * clearance, qy + SIDES[enter][1] * clearance]
+    vertical_exit, vertical_enter = exit in ('top', 'bottom'), enter in ('top', 'bottom')
+
+    if via_x is not None:
+        points = [p, out_p, [via_x, out_p[1]], [via_x, out_q[1]], out_q, q]
+    elif via_y is not None:
+        points = [p, out_p, [out_p[0], via_y], [out_q[0], via_y], out_q, q]
+    elif exit == enter:
+        # Loop around the outside of both ports
+        if vertical_exit:
+            y = max(py, qy) + clearance if exit == 'top' else min(py, qy) - clearance
+            points = [p, [px, y], [qx, y], q]
+        else:
+            x = max(px, qx) + clearance if exit == 'right' else min(px, qx) - clearance
+            points = [p, [x, py], [x, qy], q]
+    elif vertical_exit != vertical_enter:
+        points = [p, [px, qy] if vertical_exit else [qx, py], q]
+    else:
+        points = [p, q]
+
+    # Drop repeated and collinear points so only real corners remain
+    cleaned = [points[0]]
+    for point in points[1:]:
+        if point != cleaned[-1]:
+            cleaned.append(point)
+    route = [cleaned[0]]
+    for i in range(1, len(cleaned) - 1):
+        (ax, ay), (bx, by), (cx, cy) = route[-1], cleaned[i], cleaned[i + 1]
+        if abs((bx - ax) * (cy - ay) - (by - ay) * (cx - ax)) > 1e-9:
+            route.append(cleaned[i])
+    route.append(cleaned[-1])
+    return route
+
+
+def layout(diagram):
+    """
+    Place every node and route every edge
+    Returns: dict with 'boxes' (key -> (x, y, w, h, pad)), 'routes' (one point list per
+             edge), 'notes' (key -> centre y), 'ylim', 'shift' (added to bottom-anchored y)
+             and 'figsize'
+    """
+    style = diagram.style
+    x_range = diagram.xlim[1] - diagram.xlim[0]
+    y_range = diagram.ylim[1] - diagram.ylim[0]
+    scale = (diagram.figsize[0] / x_range, diagram.figsize[1] / y_range)
+
+    boxes = {}
+    for key, node in diagram.nodes.items():
+        width, height = _node_size(node, style, scale)
+        pad = style['box_pad'] if node['shape'] == 'box' else 0.0
+        boxes[key] = (node['x'], node['y'], width, height, pad)
+
+    # Flow placement: rows stacked top-down, `gap` apart
+    flow, cursor, row_center, row_bottom = None, None, None, None
+    for item in diagram.items:
+        if item[0] == 'flow':
+            flow = item[1]
+            cursor, row_bottom = flow['top'] + flow['gap'], flow['top'] + flow['gap']
+        elif item[0] == 'space':
+            row_bottom -= item[1]
+        elif item[0] == 'place':
+            key = item[1]
+            node = diagram.nodes[key]
+            x, _, width, height, pad = boxes[key]
+            x = flow['x'] - width / 2 if x is None else x
+            if node['beside'] and row_center is not None:
+                y = row_center - height / 2
+            else:
+                top = row_bottom - flow['gap']
+                y = top - pad - height
+                row_center = y + height / 2
+                row_bottom = y - pad
+            row_bottom = min(row_bottom, y - pad)
+            boxes[key] = (x, y, width, height, pad)
+
+    routes = []
+    for edge in diagram.edges:
+        a, b = boxes[edge['source']], boxes[edge['target']]
+        exit, enter = _facing_sides(a, b)
+        exit_t = enter_t = 0.5
+        if edge['exit'] is not None:
+            exit, exit_t = (edge['exit'], 0.5) if isinstance(edge['exit'], str) else edge['exit']
+        if edge['enter'] is not None:
+            enter, enter_t = (edge['enter'], 0.5) if isinstance(edge['enter'], str) else edge['enter']
+        routes.append(_route(_port(a, exit, exit_t), exit, _port(b, enter, enter_t), enter,
+                             edge['via_x'], edge['via_y'], style['gap'] / 2))
+
+    # Grow the canvas downward if the flow passes the floor
+    lowest = min([_bounds(box)[1] for box in boxes.values()] +
+                 [y for route in routes for _, y in route] + [diagram.floor + style['margin']])
+    shift = min(0.0, lowest - style['margin'] - diagram.floor)
+    ylim = (diagram.ylim[0] + shift, diagram.ylim[1])
+    figsize = (diagram.figsize[0], diagram.figsize[1] * (ylim[1] - ylim[0]) / y_range)
+    notes = {key: boxes[key][1] + boxes[key][3] / 2 for key in boxes}
+    return {'boxes': boxes, 'routes': routes, 'notes': notes, 'ylim': ylim, 'shift': shift,
+            'figsize': figsize}
+
+
+def draw(diagram, plan=None):
+    """
+    Draw a diagram on a new figure
+    plan: Result of layout(diagram) (computed here if not given)
+    Returns: matplotlib Figure
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import FancyArrowPatch, FancyBboxPatch, Polygon, Rectangle
+    from matplotlib.path import Path
+
+    plan = plan or layout(diagram)
+    style = diagram.style
+    fig, ax = plt.subplots(figsize=plan['figsize'])
+    ax.set_xlim(*diagram.xlim)
+    ax.set_ylim(*plan['ylim'])
+    ax.axis('off')
+
+    for key, node in diagram.nodes.items():
+        x, y, w, h, pad = plan['boxes'][key]
+        outline = dict(edgecolor='black', facecolor=node['color'], linewidth=style['box_linewidth'])
+        if node['shape'] == 'diamond':
+            patch = Polygon([(x + w / 2, y + h), (x + w, y + h / 2), (x + w / 2, y), (x, y + h / 2)],
+                            closed=True, **outline)
+        elif node['shape'] == 'rect':
+            patch = Rectangle((x, y), w, h, **outline)
+        else:
+            patch = FancyBboxPatch((x, y), w, h, boxstyle=f"round,pad={pad}", **outline)
+        ax.add_patch(patch)
+        ax.text(x + w / 2, y + h / 2, node['text'], ha='center', va='center', fontsize=node['fontsize'],
+                fontweight=node['fontweight'], linespacing=style['linespacing'])
+
+    label_box = dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor='black', linewidth=1.5)
+    for edge, route in zip(diagram.edges, plan['routes']):
+        # One path per edge, so bends have no arrowheads of their own
+        codes = [Path.MOVETO] + [Path.LINETO] * (len(route) - 1)
+        ax.add_patch(FancyArrowPatch(path=Path(route, codes), arrowstyle=edge['style'],
+                                     mutation_scale=style['arrow_scale'], color=edge['color'],
+                                     linewidth=edge['width'] or style['arrow_width']))
+        if edge['label']:
+            (x1, y1), (x2, y2) = route[0], route[1]
+            ax.text((x1 + x2) / 2 + style['label_dx'], (y1 + y2) / 2, edge['label'],
+                    fontsize=style['label_fontsize'], style='italic', fontweight='bold',
+                    ha='center', va='center', bbox=label_box if style['label_box'] else None)
+
+    for item in diagram.items:
+        kind = item[0]
+        if kind in ('flow', 'space', 'place'):
+            continue
+        if kind == 'note':
+            _, key, x, text, kwargs = item
+            ax.text(x, plan['notes'][key], text, **{'va': 'center', **kwargs})
+            continue
+        dy = plan['shift'] if item[1] == 'bottom' else 0.0
+        if kind == 'text':
+            _, _, x, y, text, kwargs = item
+            ax.text(x, y + dy, text, **kwargs)
+        elif kind == 'swatch':
+            _, _, x, y, size, color, pad, linewidth = item
+            ax.add_patch(FancyBboxPatch((x, y + dy), size[0], size[1], boxstyle=f"round,pad={pad}",
+                                        edgecolor='black', facecolor=color, linewidth=linewidth))
+        elif kind == 'arrow':
+            _, _, start, end, arrowstyle, color, width, scale = item
+            ax.add_patch(FancyArrowPatch((start[0], start[1] + dy), (end[0], end[1] + dy),
+                                         arrowstyle=arrowstyle, mutation_scale=scale,
+                                         linewidth=width, color=color))
+    return fig
+
+
+@stage('render')
+def render_diagrams(diagrams, verbose=True, cache_file=CHART_CACHE_FILE):
+    """
+    Lay out, draw and save every diagram whose spec changed since it was last built
+
+    All stale diagrams are drawn in this process one after another;
+    matplotlib is imported only when at least one of them is stale.
+    cache_file=None renders everything.
+    Returns: dict filename -> render seconds (0.0 for diagrams that were up to date)
+    """
+    diagrams = list(diagrams)
+    manifest = load_manifest(cache_file) if cache_file else {}
+    digests = {d.filename: diagram_digest(d) for d in diagrams}
+    stale = [d for d in diagrams if not chart_is_current(d.filename, digests[d.filename], manifest)]
+
+    rendered = {}
+    if stale:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        for diagram in stale:
+            start = time.perf_counter()
+            fig = draw(diagram)
+            fig.savefig(diagram.filename, dpi=diagram.dpi, bbox_inches='tight', facecolor='white')
+            plt.close(fig)
+            rendered[diagram.filename] = time.perf_counter() - start
+        if cache_file:
+            record_outputs({name: digests[name] for name in rendered}, cache_file)
+
+    results = {d.filename: rendered.get(d.filename, 0.0) for d in diagrams}
+    if verbose:
+        for filename, seconds in results.items():
+            status = f"{seconds:.1f}s" if filename in rendered else "unchanged"
+            print(f"  ✓ {filename} ({status})")
+    return results
+
+
+def load_diagrams(modules=DIAGRAM_MODULES):
+    """The DIAGRAM declared by each diagram script"""
+    return [importlib.import_module(name).DIAGRAM for name in modules]
+
+
+def main():
+    print("="*80)
+    print("RENDERING DIAGRAMS")
+    print("="*80)
+
+    start = time.perf_counter()
+    results = render_diagrams(load_diagrams())
+    drawn = sum(1 for seconds in results.values() if seconds)
+    print(f"\n✓ Rendered {drawn} of {len(results)} diagrams in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
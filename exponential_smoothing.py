@@ -0,0 +1,237 @@
+"""
+Exponential Smoothing - Simple, Holt and additive Holt-Winters over many series at once
+The recursions run over time only; every step updates all series (and all candidate
+smoothing parameters) together as numpy vectors
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+# Model kinds and the names they report under in the metrics files
+SMOOTHING_MODELS = {
+    'simple': 'SES',
+    'holt': 'Holt',
+    'holt_winters': 'Holt-Winters'
+}
+
+# Smoothing parameter candidates searched per series
+ALPHA_GRID = np.round(np.arange(0.05, 1.0, 0.05), 2)
+BETA_GRID = np.array([0.01, 0.02, 0.05, 0.1, 0.2, 0.3])
+GAMMA_GRID = np.array([0.01, 0.05, 0.1, 0.2, 0.3, 0.5])
+
+
+def _candidates(kind, alphas=None, betas=None, gammas=None):
+    """Rows of (alpha, beta, gamma) to evaluate for one model kind"""
+    alphas = ALPHA_GRID if alphas is None else np.asarray(alphas, dtype=float)
+    betas = BETA_GRID if betas is None else np.asarray(betas, dtype=float)
+    gammas = GAMMA_GRID if gammas is None else np.asarray(gammas, dtype=float)
+    if kind == 'simple':
+        betas, gammas = np.zeros(1), np.zeros(1)
+    elif kind == 'holt':
+        gammas = np.zeros(1)
+    elif kind != 'holt_winters':
+        raise ValueError(f"Unknown exponential smoothing kind: {kind}")
+    grid = np.meshgrid(alphas, betas, gammas, indexing='ij')
+    return np.column_stack([g.ravel() for g in grid])
+
+
+def _recursion(Y, series, alpha, beta, gamma, kind, period):
+    """
+    Run the smoothing equations for many (series, parameters) rows over a (series x time) matrix
+    series: Row of Y each state row follows; Y itself is never repeated per candidate,
+            so memory is one state vector per row plus the data
+    alpha, beta, gamma: One value per row
+    Returns: (one-step squared error sum, level, trend, seasonal matrix, errors counted)
+    """
+    n_rows, n_obs = len(series), Y.shape[1]
+    has_trend = kind != 'simple'
+    m = period if kind == 'holt_winters' else 1
+
+    if m > 1:
+        first = Y[series, :m].mean(axis=1)
+        season = Y[series, :m] - first[:, None]
+        level = first
+        if n_obs >= 2 * m:
+            trend = (Y[series, m:2 * m].mean(axis=1) - first) / m
+        else:
+            trend = np.zeros(n_rows)
+        start = m
+    else:
+        season = np.zeros((n_rows, 1))
+        level = Y[series, 0]
+        trend = Y[series, 1] - level if has_trend and n_obs > 1 else np.zeros(n_rows)
+        start = 1
+
+    sse = np.zeros(n_rows)
+    for t in range(start, n_obs):
+        y = Y[series, t]
+        s = season[:, t % m]
+        err = y - (level + trend + s)
+        sse += err ** 2
+        new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        if has_trend:
+            trend = beta * (new_level - level) + (1 - beta) * trend
+        if m > 1:
+            season[:, t % m] = gamma * (y - new_level) + (1 - gamma) * s
+        level = new_level
+    return sse, level, trend, season, n_obs - start
+
+
+def fit_exponential_smoothing(values, kind='holt_winters', seasonal_period=12, alphas=None, betas=None,
+                              gammas=None):
+    """
+    Fit one exponential smoothing model per series, all series at once
+
+    Each series gets the smoothing parameters with the lowest one-step-ahead
+    squared error over the candidate grid. Every (series, candidate) pair is
+    a row of one matrix, so the whole search is a single pass over time.
+    values: 2-D array (series x time), a 1-D array, or a DataFrame with one column per series
+    kind: 'simple', 'holt' or 'holt_winters' (additive seasonality)
+    seasonal_period: Season length for Holt-Winters
+    Returns: dict with the chosen parameters and end-of-sample states
+    """
+    columns = None
+    if isinstance(values, pd.DataFrame):
+        columns = list(values.columns)
+        values = values.to_numpy(dtype=float).T
+    Y = np.atleast_2d(np.asarray(values, dtype=float))
+    n_series, n_obs = Y.shape
+    if kind == 'holt_winters' and n_obs < 2 * seasonal_period:
+        raise ValueError(f"Holt-Winters needs at least {2 * seasonal_period} observations per series")
+
+    grid = _candidates(kind, alphas, betas, gammas)
+    n_candidates = len(grid)
+    series = np.repeat(np.arange(n_series), n_candidates)
+    params = np.tile(grid, (n_series, 1))
+    sse, level, trend, season, n_errors = _recursion(Y, series, params[:, 0], params[:, 1], params[:, 2],
+                                                     kind, seasonal_period)
+
+    best = np.argmin(sse.reshape(n_series, n_candidates), axis=1)
+    pick = np.arange(n_series) * n_candidates + best
+    return {
+        'kind': kind,
+        'period': seasonal_period if kind == 'holt_winters' else 1,
+        'columns': columns,
+        'alpha': params[pick, 0],
+        'beta': params[pick, 1],
+        'gamma': params[pick, 2],
+        'level': level[pick],
+        'trend': trend[pick],
+        'season': season[pick],
+        'n_obs': n_obs,
+        'rmse': np.sqrt(sse[pick] / max(n_errors, 1)),
+        'candidates': n_candidates
+    }
+
+
+def forecast_exponential_smoothing(state, steps):
+    """
+    Forecast every fitted series
+    Returns: array (series x steps), or a DataFrame with one column per series
+             when the model was fitted on a DataFrame
+    """
+    h = np.arange(1, steps + 1)
+    m = state['period']
+    season_index = (state['n_obs'] - 1 + h) % m
+    forecast = state['level'][:, None] + state['trend'][:, None] * h + state['season'][:, season_index]
+    if state['columns'] is not None:
+        return pd.DataFrame(forecast.T, columns=state['columns'])
+    return forecast
+
+
+def smoothing_forecast(train, steps, kind='holt_winters', seasonal_period=12, **grid):
+    """
+    Fit and forecast a single series
+    train: pandas Series or 1-D array
+    Returns: forecast numpy array
+    """
+    state = fit_exponential_smoothing(np.asarray(train, dtype=float), kind=kind,
+                                      seasonal_period=seasonal_period, **grid)
+    return forecast_exponential_smoothing(state, steps)[0]
+
+
+def statsmodels_parity(values, alpha=0.3, beta=0.1, gamma=0.2, seasonal_period=12):
+    """
+    Compare the recursion with statsmodels' ExponentialSmoothing for fixed parameters
+    and the same initial states (statsmodels' seasonal smoothing is gamma * (1 - alpha) here)
+    values: 1-D array of observations
+    Returns: dict of kind -> largest absolute difference in squared error sum and end states
+    """
+    import warnings
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    y = np.asarray(values, dtype=float)
+    m = seasonal_period
+    differences = {}
+    for kind in SMOOTHING_MODELS:
+        sse, level, trend, season, _ = _recursion(y[None, :], np.zeros(1, dtype=int), np.array([alpha]),
+                                                  np.array([beta]), np.array([gamma]), kind, m)
+        if kind == 'holt_winters':
+            first = y[:m].mean()
+            model = ExponentialSmoothing(y[m:], trend='add', seasonal='add', seasonal_periods=m,
+                                         initialization_method='known', initial_level=first,
+                                         initial_trend=(y[m:2 * m].mean() - first) / m,
+                                         initial_seasonal=y[:m] - first)
+            smoothing = {'smoothing_level': alpha, 'smoothing_trend': beta,
+                         'smoothing_seasonal': gamma * (1 - alpha)}
+        elif kind == 'holt':
+            model = ExponentialSmoothing(y[1:], trend='add', initialization_method='known',
+                                         initial_level=y[0], initial_trend=y[1] - y[0])
+            smoothing = {'smoothing_level': alpha, 'smoothing_trend': beta}
+        else:
+            model = ExponentialSmoothing(y[1:], initialization_method='known', initial_level=y[0])
+            smoothing = {'smoothing_level': alpha}
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            fit = model.fit(optimized=False, **smoothing)
+        ours = [sse[0], level[0]] + ([trend[0]] if kind != 'simple' else [])
+        theirs = [fit.sse, fit.level[-1]] + ([fit.trend[-1]] if kind != 'simple' else [])
+        if kind == 'holt_winters':
+            # Our season matrix is indexed by time modulo m; statsmodels keeps the last m in time order
+            order = np.arange(len(y) - m, len(y)) % m
+            ours += list(season[0, order])
+            theirs += list(np.asarray(fit.season)[-m:])
+        differences[kind] = float(np.max(np.abs(np.array(ours) - np.array(theirs))))
+    return differences
+
+
+if __name__ == '__main__':
+    from weather_data import PARAMETER_COLUMNS, PARAMETER_NAMES, load_sensor_data, station_of
+
+    print("="*80)
+    print("VECTORIZED EXPONENTIAL SMOOTHING")
+    print("="*80)
+
+    df = load_sensor_data()
+    for kind, difference in statsmodels_parity(df[PARAMETER_COLUMNS[0]].to_numpy(dtype=float)).items():
+        status = '✓' if difference < 1e-6 else '✗'
+        print(f"{status} {SMOOTHING_MODELS[kind]} matches statsmodels (max difference {difference:.2e})")
+
+    stations = station_of(df)
+    train_rows, test_rows = [], []
+    labels = []
+    # One row per (station, parameter): every series is fitted in the same pass
+    for station in pd.unique(stations):
+        station_df = df[stations == station]
+        split = int(len(station_df) * 0.8)
+        for col in PARAMETER_COLUMNS:
+            values = station_df[col].to_numpy(dtype=float)
+            train_rows.append(values[:split])
+            test_rows.append(values[split:])
+            labels.append((station, PARAMETER_NAMES[col]))
+    length = min(len(row) for row in train_rows)
+    horizon = min(len(row) for row in test_rows)
+    train = np.vstack([row[-length:] for row in train_rows])
+    test = np.vstack([row[:horizon] for row in test_rows])
+
+    for kind, name in SMOOTHING_MODELS.items():
+        start = time.perf_counter()
+        state = fit_exponential_smoothing(train, kind=kind, seasonal_period=12)
+        forecast = forecast_exponential_smoothing(state, horizon)
+        elapsed = time.perf_counter() - start
+        rmse = np.sqrt(np.mean((forecast - test) ** 2, axis=1))
+        print(f"\n{name}: {len(train)} series x {state['candidates']} candidates in {elapsed:.2f}s")
+        for (station, parameter), alpha, value in zip(labels, state['alpha'], rmse):
+            print(f"  {station} {parameter}: alpha={alpha:.2f}, test RMSE: {value:.4f}")
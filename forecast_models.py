@@ -0,0 +1,144 @@
+"""
+Forecast Model Families - One fit/forecast interface for every model in the repo
+ARIMA, SARIMA, Polynomial Regression, Prophet and exponential smoothing behind the same call
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
+warnings.filterwarnings('ignore')
+
+# Orders and settings used by the training scripts
+ARIMA_ORDER = (2, 1, 2)
+SARIMA_ORDER = (1, 1, 1)
+SARIMA_SEASONAL_ORDER = (1, 1, 1, 12)
+POLYNOMIAL_DEGREE = 3
+SMOOTHING_PERIOD = 12
+PROPHET_PARAMS = {
+    'daily_seasonality': True,
+    'weekly_seasonality': False,
+    'yearly_seasonality': False,
+    'changepoint_prior_scale': 0.5,
+    'seasonality_prior_scale': 10
+}
+
+
+def calculate_metrics(actual, predicted, model_name, parameter_name):
+    """
+    RMSE, MAE, MAPE and R² for one forecast
+    Returns: dict in the layout of the *_performance.xlsx files
+    """
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    rmse = np.sqrt(mean_squared_error(actual, predicted))
+    mae = mean_absolute_error(actual, predicted)
+    mape = np.mean(np.abs((actual - predicted) / actual)) * 100
+    r2 = r2_score(actual, predicted) if len(actual) > 1 else np.nan
+
+    return {
+        'Model': model_name,
+        'Parameter': parameter_name,
+        'RMSE': round(rmse, 4),
+        'MAE': round(mae, 4),
+        'MAPE': round(mape, 4),
+        'R²': round(r2, 4)
+    }
+
+
+def _fit_arima(train, steps, warm=None, order=None):
+    from statsmodels.tsa.arima.model import ARIMA
+
+    order = tuple(order or ARIMA_ORDER)
+    start_params = warm if warm is not None and len(warm) else None
+    fit = ARIMA(train.values, order=order).fit(start_params=start_params)
+    return np.asarray(fit.forecast(steps=steps)), np.asarray(fit.params)
+
+
+def _fit_sarima(train, steps, warm=None, order=None, seasonal_order=None):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    order = tuple(order or SARIMA_ORDER)
+    seasonal_order = tuple(seasonal_order or SARIMA_SEASONAL_ORDER)
+    start_params = warm if warm is not None and len(warm) else None
+    fit = SARIMAX(train.values, order=order, seasonal_order=seasonal_order).fit(
+        disp=False, start_params=start_params)
+    return np.asarray(fit.forecast(steps=steps)), np.asarray(fit.params)
+
+
+def _fit_polynomial(train, steps, warm=None, degree=None):
+    from sklearn.preprocessing import PolynomialFeatures
+    from sklearn.linear_model import LinearRegression
+
+    poly = PolynomialFeatures(degree=degree or POLYNOMIAL_DEGREE)
+    X = np.arange(len(train)).reshape(-1, 1)
+    model = LinearRegression().fit(poly.fit_transform(X), train.values)
+    X_future = np.arange(len(train), len(train) + steps).reshape(-1, 1)
+    return model.predict(poly.transform(X_future)), None
+
+
+def prophet_warm_start(model):
+    """
+    Fitted Prophet parameters in the shape Prophet.fit(init=...) expects
+    Returns: dict of k, m, sigma_obs, delta, beta
+    """
+    res = {}
+    for name in ['k', 'm', 'sigma_obs']:
+        res[name] = model.params[name][0][0]
+    for name in ['delta', 'beta']:
+        res[name] = model.params[name][0]
+    return res
+
+
+def _fit_prophet(train, steps, warm=None, freq='min', **params):
+    from prophet import Prophet
+
+    model = Prophet(**{**PROPHET_PARAMS, **params})
+    history = pd.DataFrame({'ds': train.index, 'y': train.values})
+    # A warm start only applies when the changepoint count is unchanged
+    if warm is not None and len(warm['delta']) == model.n_changepoints:
+        model.fit(history, init=warm)
+    else:
+        model.fit(history)
+    future = pd.DataFrame({'ds': pd.date_range(train.index[-1], periods=steps + 1, freq=freq)[1:]})
+    forecast = model.predict(future)
+    return forecast['yhat'].values, prophet_warm_start(model)
+
+
+def _fit_smoothing(kind):
+    def fit(train, steps, warm=None, seasonal_period=None, **grid):
+        from exponential_smoothing import smoothing_forecast
+
+        return smoothing_forecast(train.values, steps, kind=kind,
+                                  seasonal_period=seasonal_period or SMOOTHING_PERIOD, **grid), None
+    return fit
+
+
+# Every family takes (train Series, steps, warm state, **options)
+# and returns (forecast array, warm state for the next fit)
+MODEL_FAMILIES = {
+    'ARIMA': _fit_arima,
+    'SARIMA': _fit_sarima,
+    'Polynomial': _fit_polynomial,
+    'Prophet': _fit_prophet,
+    'SES': _fit_smoothing('simple'),
+    'Holt': _fit_smoothing('holt'),
+    'Holt-Winters': _fit_smoothing('holt_winters')
+}
+
+
+def fit_forecast(family, train, steps, warm=None, **options):
+    """
+    Fit one model family on a training series and forecast ahead
+    family: Key of MODEL_FAMILIES
+    train: pandas Series with a DatetimeIndex
+    steps: Number of periods to forecast
+    warm: State returned by a previous fit of the same family, or None
+    Returns: (forecast numpy array, warm state)
+    """
+    if family not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model family: {family}")
+    return MODEL_FAMILIES[family](train, steps, warm, **options)
@@ -0,0 +1,282 @@
+"""
+Forecast Server - Local HTTP API over the saved polynomial models
+GET /forecast?station=&param=&horizon=&step= answers from an LRU/TTL cache of forecast arrays
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from batch_forecast import PARAMETER_KEYS, BatchPolynomialForecaster
+from weather_data import DATA_FILE, load_sensor_data, station_of
+
+# Written by best_model_final.py
+MODEL_FILE = 'best_models.pkl'
+
+MAX_HORIZON = 24 * 60
+
+
+class ForecastCache:
+    """
+    Thread-safe LRU cache with a time-to-live per entry
+    maxsize: Entries kept before the least recently used is evicted
+    ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, version=None):
+        """Drop every entry, or only those computed with one model version"""
+        with self._lock:
+            if version is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            stale = [key for key in self._entries if key[0] == version]
+            for key in stale:
+                del self._entries[key]
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses,
+                    'hit_rate': round(self.hits / total, 4) if total else None}
+
+
+class ModelStore:
+    """
+    Saved models loaded once and reloaded when the model file is rewritten
+
+    The model version is a hash of the model file, so a retrain (a new
+    best_models.pkl) changes every cache key that depends on it.
+    """
+
+    def __init__(self, model_path=MODEL_FILE, data_path=DATA_FILE, check_interval=1.0):
+        self.model_path = model_path
+        self.data_path = data_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stamp = None
+        self._checked = 0.0
+        self.version = None
+        self.forecaster = None
+        self.origins = {}
+        self.load()
+
+    def load(self):
+        """Read the model file and each station's last time index"""
+        with open(self.model_path, 'rb') as f:
+            raw = f.read()
+        models = pickle.loads(raw)
+
+        df = load_sensor_data(self.data_path)
+        stations = station_of(df)
+        origins = {}
+        for station in dict.fromkeys(stations):
+            times = df['DateTime'].values[stations == station]
+            origins[station] = (len(times) - 1, times[-1])
+        # best_model_final.py saves one station's models keyed by parameter
+        if set(models) <= set(PARAMETER_KEYS):
+            models = {station: models for station in origins}
+        unknown = [station for station in models if station not in origins]
+        if unknown:
+            print(f"  ✗ No readings in {self.data_path} for station(s) {', '.join(map(str, unknown))};"
+                  " their models are not served")
+            models = {station: m for station, m in models.items() if station in origins}
+        if not models:
+            raise ValueError(f"None of the stations in {self.model_path} have readings in {self.data_path}")
+
+        forecaster = BatchPolynomialForecaster().fit(models, {s: origins[s][0] for s in models})
+
+        with self._lock:
+            self.forecaster = forecaster
+            self.origins = origins
+            self.version = hashlib.sha1(raw).hexdigest()[:12]
+            self._stamp = self._file_stamp()
+        return self.version
+
+    def _file_stamp(self):
+        stat = os.stat(self.model_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """
+        Reload if the model file changed since the last check
+        Returns: The previous version when a reload happened, else None
+        """
+        now = time.monotonic()
+        # One request thread checks (and reloads); the others keep serving the current models
+        if now - self._checked < self.check_interval or not self._reload_lock.acquire(blocking=False):
+            return None
+        try:
+            self._checked = now
+            try:
+                changed = self._file_stamp() != self._stamp
+            except OSError:
+                return None
+            if not changed:
+                return None
+            previous = self.version
+            self.load()
+            return previous if self.version != previous else None
+        finally:
+            self._reload_lock.release()
+
+    def snapshot(self):
+        """(version, forecaster, origins) read together, so a concurrent reload is never half seen"""
+        with self._lock:
+            return self.version, self.forecaster, self.origins
+
+    def forecast(self, station, param, horizon, step, snapshot=None):
+        """
+        Forecast one parameter of one station
+        horizon: Minutes ahead; step: Minutes between returned points
+        snapshot: Result of snapshot() to forecast from (default: the current models)
+        Returns: (times as ISO strings, values array)
+        """
+        _, forecaster, origins = snapshot or self.snapshot()
+        forecast = forecaster.forecast(horizon, step, stations=[station])
+        values = forecast[0, forecaster.parameters.index(param)]
+        last_time = origins[station][1]
+        offsets = np.arange(step, horizon + 1, step)
+        times = last_time + offsets.astype('timedelta64[m]')
+        return np.datetime_as_string(times, unit='s').tolist(), np.round(values, 4)
+
+
+class ForecastHandler(BaseHTTPRequestHandler):
+    """GET /forecast, /health"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            self._send(200, {'model_version': self.server.store.version,
+                             'stations': list(self.server.store.origins),
+                             'cache': self.server.cache.stats()})
+        elif url.path == '/forecast':
+            self._forecast(parse_qs(url.query))
+        else:
+            self._send(404, {'error': f'Unknown path: {url.path}'})
+
+    def _forecast(self, query):
+        store, cache = self.server.store, self.server.cache
+        previous = store.refresh()
+        if previous is not None:
+            cache.invalidate(previous)
+
+        snapshot = store.snapshot()
+        version, forecaster, origins = snapshot
+        station = query.get('station', [next(iter(origins))])[0]
+        param = query.get('param', ['temperature'])[0]
+        try:
+            horizon = int(query.get('horizon', ['240'])[0])
+            step = int(query.get('step', ['1'])[0])
+        except ValueError:
+            self._send(400, {'error': 'horizon and step must be integers (minutes)'})
+            return
+        if station not in forecaster.station_rows:
+            self._send(404, {'error': f'Unknown station: {station}'})
+            return
+        if param not in PARAMETER_KEYS:
+            self._send(404, {'error': f'Unknown param: {param} (one of {", ".join(PARAMETER_KEYS)})'})
+            return
+        if not 1 <= step <= horizon <= MAX_HORIZON:
+            self._send(400, {'error': f'Need 1 <= step <= horizon <= {MAX_HORIZON}'})
+            return
+
+        key = (version, station, param, horizon, step)
+        result = cache.get(key)
+        if result is None:
+            result = store.forecast(station, param, horizon, step, snapshot)
+            cache.put(key, result)
+        times, values = result
+        self._send(200, {'station': station, 'param': param, 'model_version': version,
+                         'horizon': horizon, 'step': step, 'times': times, 'values': values.tolist()})
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=8050, model_path=MODEL_FILE, data_path=DATA_FILE,
+                cache_size=1024, ttl=300.0):
+    """
+    Build the forecast server (call serve_forever() to run it)
+    Returns: ThreadingHTTPServer with .store and .cache attached
+    """
+    server = ThreadingHTTPServer((host, port), ForecastHandler)
+    server.store = ModelStore(model_path, data_path)
+    server.cache = ForecastCache(maxsize=cache_size, ttl=ttl)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Local forecast API over the saved models')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8050)
+    parser.add_argument('--models', default=MODEL_FILE, help='Pickled models (best_model_final.py)')
+    parser.add_argument('--data', default=DATA_FILE, help='Sensor file the models were trained on')
+    parser.add_argument('--cache-size', type=int, default=1024, help='Cached forecasts (LRU)')
+    parser.add_argument('--ttl', type=float, default=300.0, help='Seconds a cached forecast stays valid')
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.models, args.data, args.cache_size, args.ttl)
+    print("="*80)
+    print("FORECAST SERVER")
+    print("="*80)
+    print(f"\n✓ Models loaded: {args.models} (version {server.store.version})")
+    print(f"  Stations: {', '.join(server.store.origins)}")
+    print(f"  Parameters: {', '.join(PARAMETER_KEYS)}")
+    print(f"\nListening on http://{args.host}:{args.port}/forecast?station=&param=&horizon=&step=")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
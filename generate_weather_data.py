@@ -1,10 +1,17 @@
+import argparse
+import os
+
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import openpyxl
+from datetime import datetime
+
+from data_export import write_frame
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# Configuration
+START_TIME = datetime.strptime("26-11-2025 09:00:00", "%d-%m-%Y %H:%M:%S")
+DEFAULT_ROWS = 5 * 60  # 5 hours = 300 entries
+DEFAULT_SEED = 42
+OUTPUT_FILE = 'iot_sensor_readings.xlsx'
 
 # Function to calculate dew point using Magnus formula
 def calculate_dew_point(temp_celsius, humidity_percent):
@@ -16,109 +23,121 @@ def calculate_dew_point(temp_celsius, humidity_percent):
     """
     a = 17.27
     b = 237.7
-    
+
     alpha = ((a * temp_celsius) / (b + temp_celsius)) + np.log(humidity_percent / 100.0)
     dew_point = (b * alpha) / (a - alpha)
-    
+
     return dew_point
 
-# Configuration
-date = "26-11-2025"
-start_time = datetime.strptime("26-11-2025 09:00:00", "%d-%m-%Y %H:%M:%S")
-total_minutes = 5 * 60  # 5 hours = 300 entries
-
-# Initialize lists to store data
-timestamps = []
-dates = []
-temperatures = []
-humidities = []
-pressures = []
-dew_points = []
-
-# Generate data for each minute
-for minute in range(total_minutes):
-    current_time = start_time + timedelta(minutes=minute)
-    
-    # Time in hours from start (0 to 5)
-    hour_offset = minute / 60.0
-    
-    # Temperature pattern (Winter morning in Gurgaon)
-    # Cooler at 9 AM (~16°C), peaks at 1 PM (~22-23°C), slight decrease by 2 PM
-    if hour_offset <= 4:  # 9 AM to 1 PM (4 hours)
-        # Gradual increase from 16°C to 23°C
-        base_temp = 16 + (7 * (hour_offset / 4.0))
-    else:  # 1 PM to 2 PM (1 hour)
-        # Slight decrease from 23°C to 22°C
-        base_temp = 23 - (1 * ((hour_offset - 4) / 1.0))
-    
-    # Add realistic sensor noise (±0.1-0.3°C)
-    temp = base_temp + np.random.uniform(-0.3, 0.3)
-    temp = round(temp, 1)
-    
-    # Humidity pattern (Inverse relationship with temperature)
-    # Higher in morning (~55-60%), lower at peak temperature (~40-45%)
-    if hour_offset <= 4:  # 9 AM to 1 PM
-        # Gradual decrease from 58% to 41%
-        base_humidity = 58 - (17 * (hour_offset / 4.0))
-    else:  # 1 PM to 2 PM
-        # Slight increase from 41% to 43%
-        base_humidity = 41 + (2 * ((hour_offset - 4) / 1.0))
-    
-    # Add realistic sensor noise (±1-2%)
-    humidity = base_humidity + np.random.uniform(-2, 2)
-    humidity = round(humidity, 1)
-    # Ensure within range
-    humidity = max(40, min(60, humidity))
-    
-    # Pressure pattern (Small natural fluctuations)
-    # Range: 1016.5 - 1019.0 hPa
-    # Slight decrease during day (typical pattern)
-    base_pressure = 1018.5 - (0.4 * (hour_offset / 5.0))
-    
-    # Add realistic sensor noise (±0.1-0.2 hPa)
-    pressure = base_pressure + np.random.uniform(-0.2, 0.2)
-    pressure = round(pressure, 1)
-    # Ensure within range
-    pressure = max(1016.5, min(1019.0, pressure))
-    
-    # Calculate dew point using Magnus formula
-    dew_point = calculate_dew_point(temp, humidity)
-    # Add small sensor noise (±0.1°C)
-    dew_point = dew_point + np.random.uniform(-0.1, 0.1)
-    dew_point = round(dew_point, 1)
-    # Ensure within realistic range
-    dew_point = max(0.2, min(13.3, dew_point))
-    
-    # Store data
-    timestamps.append(current_time.strftime("%I:%M:%S %p"))
-    dates.append(date)
-    temperatures.append(temp)
-    humidities.append(humidity)
-    pressures.append(pressure)
-    dew_points.append(dew_point)
-
-# Create DataFrame
-df = pd.DataFrame({
-    'Date': dates,
-    'Time': timestamps,
-    'Temperature (°C)': temperatures,
-    'Humidity (%)': humidities,
-    'Pressure (hPa)': pressures,
-    'Dew Point (°C)': dew_points
-})
-
-# Save to Excel
-output_file = 'iot_sensor_readings.xlsx'
-df.to_excel(output_file, index=False, sheet_name='Weather Data')
-
-print(f"✓ Excel file generated: {output_file}")
-print(f"✓ Total entries: {len(df)}")
-print(f"\nData Summary:")
-print(f"Temperature: {df['Temperature (°C)'].min():.1f}°C - {df['Temperature (°C)'].max():.1f}°C")
-print(f"Humidity: {df['Humidity (%)'].min():.1f}% - {df['Humidity (%)'].max():.1f}%")
-print(f"Pressure: {df['Pressure (hPa)'].min():.1f} hPa - {df['Pressure (hPa)'].max():.1f} hPa")
-print(f"Dew Point: {df['Dew Point (°C)'].min():.1f}°C - {df['Dew Point (°C)'].max():.1f}°C")
-print(f"\nFirst 5 entries:")
-print(df.head())
-print(f"\nLast 5 entries:")
-print(df.tail())
+
+def daily_pattern(hour_offset):
+    """
+    Noise-free temperature, humidity and pressure at hours since 9 AM
+    The 9 AM - 2 PM winter pattern repeats every 24 hours, returning
+    linearly to its 9 AM values overnight
+    hour_offset: numpy array of hours since the start of the data
+    Returns: (temperature, humidity, pressure) arrays
+    """
+    hour = np.mod(hour_offset, 24.0)
+    morning = hour <= 4         # 9 AM to 1 PM
+    afternoon = hour <= 5       # 1 PM to 2 PM
+    night = (hour - 5) / 19.0   # 2 PM back to 9 AM
+
+    # Temperature: cooler at 9 AM (~16°C), peaks at 1 PM (~23°C), slight decrease by 2 PM
+    temperature = np.select([morning, afternoon],
+                            [16 + (7 * (hour / 4.0)), 23 - (1 * ((hour - 4) / 1.0))],
+                            22 - (6 * night))
+
+    # Humidity: inverse of temperature, 58% in the morning down to 41% at the peak
+    humidity = np.select([morning, afternoon],
+                         [58 - (17 * (hour / 4.0)), 41 + (2 * ((hour - 4) / 1.0))],
+                         43 + (15 * night))
+
+    # Pressure: slight decrease during the day (typical pattern)
+    pressure = np.where(afternoon, 1018.5 - (0.4 * (hour / 5.0)), 1018.1 + (0.4 * night))
+    return temperature, humidity, pressure
+
+
+def _format_lookup(stamps, fmt):
+    """strftime for many repeated timestamps: format each distinct value once"""
+    unique, inverse = np.unique(stamps, return_inverse=True)
+    labels = pd.DatetimeIndex(unique).strftime(fmt).to_numpy(dtype=object)
+    return labels[inverse]
+
+
+def generate_readings(n_rows=DEFAULT_ROWS, start=START_TIME, freq_seconds=60, seed=DEFAULT_SEED):
+    """
+    Synthetic sensor readings, vectorized so millions of rows take seconds
+    n_rows: Number of readings (300 reproduces iot_sensor_readings.xlsx exactly)
+    start: Timestamp of the first reading
+    freq_seconds: Seconds between readings
+    seed: Random seed for the sensor noise
+    Returns: DataFrame in the layout of iot_sensor_readings.xlsx
+    """
+    rng = np.random.RandomState(seed)
+    # One row of draws per reading, in the order the per-reading generator used
+    noise = rng.random_sample((n_rows, 4))
+
+    elapsed = np.arange(n_rows, dtype=np.int64) * freq_seconds
+    temperature, humidity, pressure = daily_pattern(elapsed / 3600.0)
+
+    # Add realistic sensor noise (±0.3°C, ±2%, ±0.2 hPa)
+    temperature = np.round(temperature + (-0.3 + 0.6 * noise[:, 0]), 1)
+    humidity = np.clip(np.round(humidity + (-2 + 4 * noise[:, 1]), 1), 40, 60)
+    pressure = np.clip(np.round(pressure + (-0.2 + 0.4 * noise[:, 2]), 1), 1016.5, 1019.0)
+
+    # Dew point from the Magnus formula plus small sensor noise (±0.1°C)
+    dew_point = calculate_dew_point(temperature, humidity) + (-0.1 + 0.2 * noise[:, 3])
+    dew_point = np.clip(np.round(dew_point, 1), 0.2, 13.3)
+
+    stamps = np.datetime64(start, 's') + elapsed.astype('timedelta64[s]')
+    day = stamps.astype('datetime64[D]')
+    # Time of day on a fixed date, so there are at most 86400 distinct labels
+    clock = np.datetime64('1970-01-01', 's') + (stamps - day)
+    return pd.DataFrame({
+        'Date': _format_lookup(day, '%d-%m-%Y'),
+        'Time': _format_lookup(clock, '%I:%M:%S %p'),
+        'Temperature (°C)': temperature,
+        'Humidity (%)': humidity,
+        'Pressure (hPa)': pressure,
+        'Dew Point (°C)': dew_point
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic IoT sensor readings')
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='Number of one-minute readings')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', default=OUTPUT_FILE, help='.xlsx, .csv or .parquet file')
+    args = parser.parse_args(argv)
+
+    df = generate_readings(args.rows, seed=args.seed)
+
+    # Save to Excel (tables past the worksheet limit fall back to Parquet/CSV)
+    ext = os.path.splitext(args.output)[1].lower()
+    if ext == '.csv':
+        df.to_csv(args.output, index=False)
+        output_file = args.output
+    elif ext == '.parquet':
+        df.to_parquet(args.output, index=False)
+        output_file = args.output
+    else:
+        output_file = write_frame(df, args.output, sheet_name='Weather Data')
+
+    print(f"✓ Data file generated: {output_file}")
+    if output_file != args.output:
+        print(f"  {len(df)} rows exceed a worksheet; {args.output} was left unchanged")
+    print(f"✓ Total entries: {len(df)}")
+    print(f"\nData Summary:")
+    print(f"Temperature: {df['Temperature (°C)'].min():.1f}°C - {df['Temperature (°C)'].max():.1f}°C")
+    print(f"Humidity: {df['Humidity (%)'].min():.1f}% - {df['Humidity (%)'].max():.1f}%")
+    print(f"Pressure: {df['Pressure (hPa)'].min():.1f} hPa - {df['Pressure (hPa)'].max():.1f} hPa")
+    print(f"Dew Point: {df['Dew Point (°C)'].min():.1f}°C - {df['Dew Point (°C)'].max():.1f}°C")
+    print(f"\nFirst 5 entries:")
+    print(df.head())
+    print(f"\nLast 5 entries:")
+    print(df.tail())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,395 @@
+"""
+Live Dashboard - Readings and refreshed forecasts pushed to browsers over server-sent events
+POST /ingest feeds the readings; GET / serves the page, GET /events?station= the SSE stream
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from derived_channels import magnus_dew_point
+from downsampling import minmax_decimate
+from exponential_smoothing import fit_exponential_smoothing, forecast_exponential_smoothing
+from weather_data import (DATA_FILE, DEFAULT_STATION, DEW_COL, HUMIDITY_COL, PRESSURE_COL,
+                          TEMP_COL, load_sensor_data, station_of)
+
+# Channels on the wire, in buffer column order
+CHANNELS = ['temperature', 'humidity', 'pressure', 'dew_point']
+CHANNEL_COLUMNS = [TEMP_COL, HUMIDITY_COL, PRESSURE_COL, DEW_COL]
+
+
+class StationBuffer:
+    """Fixed-capacity ring buffer of one station's readings (epoch ms + one column per channel)"""
+
+    def __init__(self, capacity):
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, len(CHANNELS)))
+        self.count = 0
+
+    def append(self, time_ms, values):
+        i = self.count % len(self.times)
+        self.times[i] = time_ms
+        self.values[i] = values
+        self.count += 1
+
+    def view(self):
+        """Readings in time order (copies at most the buffer capacity)"""
+        n = min(self.count, len(self.times))
+        if self.count <= len(self.times):
+            return self.times[:n], self.values[:n]
+        start = self.count % len(self.times)
+        order = np.r_[start:len(self.times), 0:start]
+        return self.times[order], self.values[order]
+
+
+class Subscriber(queue.Queue):
+    """One client's outgoing messages; closed when the client falls too far behind"""
+
+    def __init__(self, maxsize):
+        super().__init__(maxsize=maxsize)
+        self.closed = False
+
+
+def _event(name, payload):
+    """One encoded SSE message; built once and shared by every subscriber"""
+    return f"event: {name}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode('utf-8')
+
+
+class LiveHub:
+    """
+    Buffers readings per station and fans events out to subscribers
+
+    Each new reading is one small 'reading' event encoded once. Clients get
+    the history only on connect, as a 'snapshot' decimated to max_points per
+    channel, so payloads stay bounded whatever the buffer size. Forecasts are
+    refreshed every forecast_every readings for all stations in one
+    vectorized exponential smoothing pass, on a background thread so
+    ingestion never waits for a fit.
+    """
+
+    def __init__(self, capacity=10000, max_points=400, forecast_every=30, horizon=60, window=120,
+                 queue_size=1000):
+        self.capacity = capacity
+        self.max_points = max_points
+        self.forecast_every = forecast_every
+        self.horizon = horizon
+        self.window = window
+        self.queue_size = queue_size
+        self.buffers = {}
+        self.forecasts = {}
+        self._subscribers = {}
+        self._snapshots = {}
+        # Bumped on every change to a station, so a snapshot encoded meanwhile is not cached
+        self._generations = {}
+        self._since_forecast = 0
+        self._lock = threading.Lock()
+        self._refresh_due = threading.Event()
+        threading.Thread(target=self._refresh_loop, name='forecast-refresh', daemon=True).start()
+
+    def ingest(self, station, time_ms, temperature, humidity, pressure, dew_point=None):
+        """Add one reading and push it to the station's subscribers"""
+        if dew_point is None:
+            dew_point = float(magnus_dew_point(temperature, humidity))
+        values = [temperature, humidity, pressure, dew_point]
+        with self._lock:
+            buffer = self.buffers.get(station)
+            if buffer is None:
+                buffer = self.buffers[station] = StationBuffer(self.capacity)
+            buffer.append(time_ms, values)
+            self._invalidate(station)
+            self._since_forecast += 1
+            refresh = self._since_forecast >= self.forecast_every
+            if refresh:
+                self._since_forecast = 0
+        self._broadcast(station, _event('reading', {'t': int(time_ms), 'v': [round(v, 3) for v in values]}))
+        if refresh:
+            self._refresh_due.set()
+
+    def _refresh_loop(self):
+        """Background worker: refresh forecasts whenever ingest asks (requests made meanwhile coalesce)"""
+        while True:
+            self._refresh_due.wait()
+            self._refresh_due.clear()
+            try:
+                self.refresh_forecasts()
+            except Exception as e:
+                print(f"  ✗ Forecast refresh failed: {e}")
+
+    def refresh_forecasts(self):
+        """Re-forecast every station with enough history (one smoothing fit for all of them)"""
+        with self._lock:
+            ready = {s: b.view() for s, b in self.buffers.items() if min(b.count, self.capacity) >= self.window}
+        if not ready:
+            return
+        stations = list(ready)
+        # Rows are (station, channel) series over the latest window
+        matrix = np.vstack([ready[s][1][-self.window:].T for s in stations])
+        state = fit_exponential_smoothing(matrix, kind='simple')
+        forecast = forecast_exponential_smoothing(state, self.horizon).reshape(len(stations), len(CHANNELS), -1)
+        for station, values in zip(stations, forecast):
+            times = ready[station][0]
+            step = int(np.median(np.diff(times[-self.window:]))) if len(times) > 1 else 60000
+            payload = {'t': (times[-1] + step * np.arange(1, self.horizon + 1)).tolist(),
+                       'v': np.round(values, 3).tolist()}
+            with self._lock:
+                self.forecasts[station] = payload
+                self._invalidate(station)
+            self._broadcast(station, _event('forecast', payload))
+
+    def _invalidate(self, station):
+        """Drop the station's cached snapshot (call with the lock held)"""
+        self._snapshots.pop(station, None)
+        self._generations[station] = self._generations.get(station, 0) + 1
+
+    def snapshot(self, station):
+        """Decimated history plus the latest forecast, encoded once per change"""
+        with self._lock:
+            cached = self._snapshots.get(station)
+            if cached is not None:
+                return cached
+            generation = self._generations.get(station, 0)
+            buffer = self.buffers.get(station)
+            times, values = buffer.view() if buffer else (np.zeros(0, dtype=np.int64), np.zeros((0, 4)))
+            forecast = self.forecasts.get(station)
+            readings = int(buffer.count if buffer else 0)
+        series = {}
+        for j, channel in enumerate(CHANNELS):
+            t, v = minmax_decimate(times, values[:, j], self.max_points)
+            series[channel] = {'t': t.tolist(), 'v': np.round(v, 3).tolist()}
+        encoded = _event('snapshot', {'station': station, 'channels': CHANNELS, 'series': series,
+                                      'forecast': forecast, 'readings': readings})
+        with self._lock:
+            # A reading or forecast that arrived while encoding makes this snapshot stale
+            if self._generations.get(station, 0) == generation:
+                self._snapshots[station] = encoded
+        return encoded
+
+    def subscribe(self, station):
+        subscriber = Subscriber(self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(station, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, station, subscriber):
+        with self._lock:
+            self._subscribers.get(station, set()).discard(subscriber)
+
+    def _broadcast(self, station, message):
+        with self._lock:
+            subscribers = list(self._subscribers.get(station, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # A client that cannot keep up is dropped rather than slowing everyone;
+                # its stream sees the flag and closes the connection
+                subscriber.closed = True
+                self.unsubscribe(station, subscriber)
+
+    def stations(self):
+        with self._lock:
+            return {s: b.count for s, b in self.buffers.items()}
+
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Weather Station - Live</title>
+<style>
+body { font-family: sans-serif; margin: 20px; background: #f7f7f7; }
+canvas { background: #fff; border: 1px solid #ccc; margin: 6px 0; width: 100%; height: 160px; }
+h1 { font-size: 20px; } .latest { font-weight: bold; color: #2E86AB; }
+</style></head>
+<body>
+<h1>Live Weather - <span id="station"></span> <small id="status"></small></h1>
+<div id="charts"></div>
+<script>
+const params = new URLSearchParams(location.search);
+const station = params.get('station') || '__DEFAULT__';
+document.getElementById('station').textContent = station;
+const names = {temperature: 'Temperature (°C)', humidity: 'Humidity (%)',
+               pressure: 'Pressure (hPa)', dew_point: 'Dew Point (°C)'};
+const MAX_POINTS = __MAX_POINTS__;
+let series = {}, forecast = null, channels = [];
+
+function draw() {
+  channels.forEach((c, j) => {
+    const canvas = document.getElementById('chart_' + c), ctx = canvas.getContext('2d');
+    canvas.width = canvas.clientWidth; canvas.height = canvas.clientHeight;
+    const s = series[c], f = forecast ? {t: forecast.t, v: forecast.v[j]} : {t: [], v: []};
+    const ts = s.t.concat(f.t), vs = s.v.concat(f.v);
+    if (!ts.length) return;
+    const t0 = Math.min(...ts), t1 = Math.max(...ts), v0 = Math.min(...vs), v1 = Math.max(...vs);
+    const x = t => 40 + (canvas.width - 50) * (t - t0) / Math.max(t1 - t0, 1);
+    const y = v => canvas.height - 20 - (canvas.height - 40) * (v - v0) / Math.max(v1 - v0, 1e-9);
+    const line = (t, v, color, dash) => {
+      ctx.beginPath(); ctx.setLineDash(dash); ctx.strokeStyle = color; ctx.lineWidth = 2;
+      t.forEach((ti, i) => i ? ctx.lineTo(x(ti), y(v[i])) : ctx.moveTo(x(ti), y(v[i]))); ctx.stroke();
+    };
+    line(s.t, s.v, '#2E86AB', []); line(f.t, f.v, '#F18F01', [6, 4]);
+    ctx.setLineDash([]); ctx.fillStyle = '#333';
+    ctx.fillText(names[c] + '  ' + v1.toFixed(2), 4, 12); ctx.fillText(v0.toFixed(2), 4, canvas.height - 4);
+  });
+}
+
+const source = new EventSource('/events?station=' + encodeURIComponent(station));
+source.addEventListener('snapshot', e => {
+  const snap = JSON.parse(e.data);
+  channels = snap.channels; series = snap.series; forecast = snap.forecast;
+  document.getElementById('charts').innerHTML = channels.map(c => '<canvas id="chart_' + c + '"></canvas>').join('');
+  draw();
+});
+source.addEventListener('reading', e => {
+  const r = JSON.parse(e.data);
+  channels.forEach((c, j) => {
+    series[c].t.push(r.t); series[c].v.push(r.v[j]);
+    // Keep the client-side history bounded as well
+    if (series[c].t.length > 2 * MAX_POINTS) { series[c].t.shift(); series[c].v.shift(); }
+  });
+  document.getElementById('status').textContent = new Date(r.t).toLocaleTimeString();
+  draw();
+});
+source.addEventListener('forecast', e => { forecast = JSON.parse(e.data); draw(); });
+source.onerror = () => { document.getElementById('status').textContent = '(reconnecting...)'; };
+</script></body></html>
+"""
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """GET /, /events, /stations; POST /ingest"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        hub = self.server.hub
+        if url.path == '/':
+            page = (DASHBOARD_HTML.replace('__DEFAULT__', self.server.default_station)
+                    .replace('__MAX_POINTS__', str(hub.max_points)))
+            self._send(200, page.encode('utf-8'), 'text/html; charset=utf-8')
+        elif url.path == '/stations':
+            self._send(200, json.dumps(hub.stations()).encode('utf-8'), 'application/json')
+        elif url.path == '/events':
+            self._stream(query.get('station', [self.server.default_station])[0])
+        else:
+            self._send(404, b'Not found', 'text/plain')
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/ingest':
+            self._send(404, b'Not found', 'text/plain')
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'[]')
+            readings = body if isinstance(body, list) else [body]
+            # Every reading is validated before any is stored, so a 400 leaves the buffers untouched
+            parsed = []
+            for reading in readings:
+                when = reading.get('time')
+                time_ms = (pd.Timestamp(when).value // 10**6) if when else int(time.time() * 1000)
+                dew_point = reading.get('dew_point')
+                parsed.append((str(reading.get('station', self.server.default_station)), time_ms,
+                               float(reading['temperature']), float(reading['humidity']),
+                               float(reading['pressure']), None if dew_point is None else float(dew_point)))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send(400, json.dumps({'error': str(e)}).encode('utf-8'), 'application/json')
+            return
+        for reading in parsed:
+            self.server.hub.ingest(*reading)
+        self._send(200, json.dumps({'accepted': len(readings)}).encode('utf-8'), 'application/json')
+
+    def _stream(self, station):
+        hub = self.server.hub
+        subscriber = hub.subscribe(station)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        try:
+            self.wfile.write(hub.snapshot(station))
+            self.wfile.flush()
+            while True:
+                try:
+                    message = subscriber.get(timeout=15)
+                except queue.Empty:
+                    message = b': keepalive\n\n'
+                if subscriber.closed:
+                    # Dropped for falling behind: end the response so the client reconnects
+                    return
+                self.wfile.write(message)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            hub.unsubscribe(station, subscriber)
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=8060, hub=None, default_station=DEFAULT_STATION):
+    """
+    Build the dashboard server (call serve_forever() to run it)
+    Returns: ThreadingHTTPServer with .hub attached
+    """
+    server = ThreadingHTTPServer((host, port), DashboardHandler)
+    server.daemon_threads = True
+    server.hub = hub or LiveHub()
+    server.default_station = default_station
+    return server
+
+
+def replay(hub, path=DATA_FILE, speed=60.0):
+    """
+    Feed a recorded sensor file through the ingestion path
+    speed: Replay rate relative to real time (60 = one minute of readings per second)
+    """
+    df = load_sensor_data(path)
+    stations = station_of(df)
+    times = df['DateTime'].values.astype('datetime64[ms]').astype(np.int64)
+    values = df[CHANNEL_COLUMNS].to_numpy(dtype=float)
+    for i in range(len(df)):
+        if i and speed:
+            time.sleep(max(0, (times[i] - times[i - 1]) / 1000 / speed))
+        hub.ingest(stations[i], times[i], *values[i])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Live weather dashboard over server-sent events')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8060)
+    parser.add_argument('--max-points', type=int, default=400, help='History points per channel sent to clients')
+    parser.add_argument('--replay', metavar='FILE', help='Replay a recorded sensor file into the dashboard')
+    parser.add_argument('--speed', type=float, default=60.0, help='Replay speed (x real time)')
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, LiveHub(max_points=args.max_points))
+    print("="*80)
+    print("LIVE WEATHER DASHBOARD")
+    print("="*80)
+    print(f"\nOpen http://{args.host}:{args.port}/?station={server.default_station}")
+    print(f"Readings: POST http://{args.host}:{args.port}/ingest"
+          " {\"station\", \"time\", \"temperature\", \"humidity\", \"pressure\"}")
+    if args.replay:
+        threading.Thread(target=replay, args=(server.hub, args.replay, args.speed), daemon=True).start()
+        print(f"Replaying {args.replay} at {args.speed:g}x")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✓ Dashboard stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
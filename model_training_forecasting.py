@@ -1,34 +1,41 @@
 """
 Time Series Model Training and Forecasting
-Models: ARIMA, SARIMA, GARCH
+Models: ARIMA, SARIMA, GARCH, VAR (multivariate), exponential smoothing (SES, Holt, Holt-Winters)
 """
 
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
 from statsmodels.tsa.arima.model import ARIMA
 from statsmodels.tsa.statespace.sarimax import SARIMAX
-from arch import arch_model
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from auto_order import select_orders
+from derived_channels import DERIVE_DEW_POINT, derive_dew_point
+from exponential_smoothing import (SMOOTHING_MODELS, fit_exponential_smoothing,
+                                   forecast_exponential_smoothing)
+from multivariate_model import MultivariateForecaster
+from volatility_forecast import garch_forecast_all
+from run_store import RUN_DB, record_run
+from data_views import ColumnStore
+from stage_profile import stage
+
+# Stepwise AIC order search (cached per series); False restores the fixed orders
+USE_AUTO_ORDER = True
 
 print("="*80)
 print("TIME SERIES MODEL TRAINING AND FORECASTING")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.set_index('DateTime')
-df = df.sort_index()
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.set_index('DateTime')
+    df = df.sort_index()
 
 # Column names
 temp_col = 'Temperature (°C)'
@@ -36,13 +43,13 @@ humidity_col = 'Humidity (%)'
 pressure_col = 'Pressure (hPa)'
 dew_col = 'Dew Point (°C)'
 
-# Train-test split
-train_size = int(len(df) * 0.8)
-train_data = df[:train_size]
-test_data = df[train_size:]
+# Train-test split: views over one column store, so no parameter is copied
+store = ColumnStore.from_frame(df)
+train_size = int(len(store) * 0.8)
+train_data, test_data = store.split(train_size)
 
 # Performance metrics function
-def calculate_metrics(actual, predicted, model_name, parameter_name):
+def calculate_metrics(actual, predicted, model_name, parameter_name, fit_time=None):
     rmse = np.sqrt(mean_squared_error(actual, predicted))
     mae = mean_absolute_error(actual, predicted)
     mape = np.mean(np.abs((actual - predicted) / actual)) * 100
@@ -54,13 +61,22 @@ def calculate_metrics(actual, predicted, model_name, parameter_name):
         'RMSE': round(rmse, 4),
         'MAE': round(mae, 4),
         'MAPE': round(mape, 4),
-        'R²': round(r2, 4)
+        'R²': round(r2, 4),
+        'Fit Time (s)': None if fit_time is None else round(fit_time, 4)
     }
 
 # Store all results
 all_results = []
 all_predictions = {}
 
+# GARCH: AR mean + GARCH(1,1) volatility, all parameters fitted concurrently
+print("\nFitting GARCH volatility models for all parameters...")
+garch_columns = [temp_col, humidity_col, pressure_col] + ([] if DERIVE_DEW_POINT else [dew_col])
+with stage('fit', 'GARCH') as fitted:
+    garch_forecasts = garch_forecast_all(train_data.frame(garch_columns), garch_columns, len(test_data))
+# Joint fits are charged to each parameter as an even share of their wall time
+garch_fit_time = fitted.wall / len(garch_columns)
+
 # ============================================================================
 # TEMPERATURE FORECASTING
 # ============================================================================
@@ -68,16 +84,22 @@ print("\n" + "="*80)
 print("TEMPERATURE FORECASTING")
 print("="*80)
 
-temp_train = train_data[temp_col]
-temp_test = test_data[temp_col]
+temp_train = train_data.series(temp_col)
+temp_test = test_data.series(temp_col)
+
+# Model orders
+arima_order, sarima_order, sarima_seasonal_order = select_orders(temp_train, auto=USE_AUTO_ORDER)
+print(f"\nOrders - ARIMA{arima_order}, SARIMA{sarima_order}{sarima_seasonal_order}")
 
 # ARIMA Model
 print("\n[1/3] Training ARIMA model for Temperature...")
 try:
-    arima_temp = ARIMA(temp_train, order=(2, 1, 2))
-    arima_temp_fit = arima_temp.fit()
-    arima_temp_pred = arima_temp_fit.forecast(steps=len(temp_test))
-    metrics = calculate_metrics(temp_test.values, arima_temp_pred.values, 'ARIMA', 'Temperature')
+    with stage('fit', 'ARIMA Temperature') as fitted:
+        arima_temp = ARIMA(temp_train, order=arima_order)
+        arima_temp_fit = arima_temp.fit()
+    with stage('predict', 'ARIMA Temperature'):
+        arima_temp_pred = arima_temp_fit.forecast(steps=len(temp_test))
+    metrics = calculate_metrics(temp_test.values, arima_temp_pred.values, 'ARIMA', 'Temperature', fitted.wall)
     all_results.append(metrics)
     all_predictions['temp_arima'] = arima_temp_pred
     print(f"  ✓ ARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
@@ -87,30 +109,31 @@ except Exception as e:
 # SARIMA Model
 print("[2/3] Training SARIMA model for Temperature...")
 try:
-    sarima_temp = SARIMAX(temp_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-    sarima_temp_fit = sarima_temp.fit(disp=False)
-    sarima_temp_pred = sarima_temp_fit.forecast(steps=len(temp_test))
-    metrics = calculate_metrics(temp_test.values, sarima_temp_pred.values, 'SARIMA', 'Temperature')
+    with stage('fit', 'SARIMA Temperature') as fitted:
+        sarima_temp = SARIMAX(temp_train, order=sarima_order, seasonal_order=sarima_seasonal_order)
+        sarima_temp_fit = sarima_temp.fit(disp=False)
+    with stage('predict', 'SARIMA Temperature'):
+        sarima_temp_pred = sarima_temp_fit.forecast(steps=len(temp_test))
+    metrics = calculate_metrics(temp_test.values, sarima_temp_pred.values, 'SARIMA', 'Temperature', fitted.wall)
     all_results.append(metrics)
     all_predictions['temp_sarima'] = sarima_temp_pred
     print(f"  ✓ SARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
 except Exception as e:
     print(f"  ✗ SARIMA failed: {e}")
 
-# GARCH Model (for volatility)
+# GARCH Model (AR mean + GARCH(1,1) volatility)
 print("[3/3] Training GARCH model for Temperature...")
 try:
-    temp_returns = temp_train.pct_change().dropna() * 100
-    garch_temp = arch_model(temp_returns, vol='Garch', p=1, q=1)
-    garch_temp_fit = garch_temp.fit(disp='off')
-    garch_temp_forecast = garch_temp_fit.forecast(horizon=len(temp_test))
-    garch_temp_pred = temp_train.iloc[-1] * (1 + garch_temp_forecast.mean.iloc[-1].values / 100)
-    # For GARCH, we'll use a simple persistence model for comparison
-    garch_pred_series = pd.Series([temp_train.iloc[-1]] * len(temp_test), index=temp_test.index)
-    metrics = calculate_metrics(temp_test.values, garch_pred_series.values, 'GARCH', 'Temperature')
+    garch_fc = garch_forecasts[temp_col]
+    if isinstance(garch_fc, Exception):
+        raise garch_fc
+    garch_pred_series = pd.Series(garch_fc['mean'].values, index=temp_test.index)
+    metrics = calculate_metrics(temp_test.values, garch_pred_series.values, 'GARCH', 'Temperature', garch_fit_time)
     all_results.append(metrics)
     all_predictions['temp_garch'] = garch_pred_series
-    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    all_predictions['temp_garch_interval'] = garch_fc[['lower', 'upper']].set_index(temp_test.index)
+    coverage = np.mean((temp_test.values >= garch_fc['lower'].values) & (temp_test.values <= garch_fc['upper'].values)) * 100
+    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}, 95% PI coverage: {coverage:.1f}%")
 except Exception as e:
     print(f"  ✗ GARCH failed: {e}")
 
@@ -121,16 +144,22 @@ print("\n" + "="*80)
 print("HUMIDITY FORECASTING")
 print("="*80)
 
-humidity_train = train_data[humidity_col]
-humidity_test = test_data[humidity_col]
+humidity_train = train_data.series(humidity_col)
+humidity_test = test_data.series(humidity_col)
+
+# Model orders
+arima_order, sarima_order, sarima_seasonal_order = select_orders(humidity_train, auto=USE_AUTO_ORDER)
+print(f"\nOrders - ARIMA{arima_order}, SARIMA{sarima_order}{sarima_seasonal_order}")
 
 # ARIMA Model
 print("\n[1/3] Training ARIMA model for Humidity...")
 try:
-    arima_hum = ARIMA(humidity_train, order=(2, 1, 2))
-    arima_hum_fit = arima_hum.fit()
-    arima_hum_pred = arima_hum_fit.forecast(steps=len(humidity_test))
-    metrics = calculate_metrics(humidity_test.values, arima_hum_pred.values, 'ARIMA', 'Humidity')
+    with stage('fit', 'ARIMA Humidity') as fitted:
+        arima_hum = ARIMA(humidity_train, order=arima_order)
+        arima_hum_fit = arima_hum.fit()
+    with stage('predict', 'ARIMA Humidity'):
+        arima_hum_pred = arima_hum_fit.forecast(steps=len(humidity_test))
+    metrics = calculate_metrics(humidity_test.values, arima_hum_pred.values, 'ARIMA', 'Humidity', fitted.wall)
     all_results.append(metrics)
     all_predictions['hum_arima'] = arima_hum_pred
     print(f"  ✓ ARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
@@ -140,27 +169,31 @@ except Exception as e:
 # SARIMA Model
 print("[2/3] Training SARIMA model for Humidity...")
 try:
-    sarima_hum = SARIMAX(humidity_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-    sarima_hum_fit = sarima_hum.fit(disp=False)
-    sarima_hum_pred = sarima_hum_fit.forecast(steps=len(humidity_test))
-    metrics = calculate_metrics(humidity_test.values, sarima_hum_pred.values, 'SARIMA', 'Humidity')
+    with stage('fit', 'SARIMA Humidity') as fitted:
+        sarima_hum = SARIMAX(humidity_train, order=sarima_order, seasonal_order=sarima_seasonal_order)
+        sarima_hum_fit = sarima_hum.fit(disp=False)
+    with stage('predict', 'SARIMA Humidity'):
+        sarima_hum_pred = sarima_hum_fit.forecast(steps=len(humidity_test))
+    metrics = calculate_metrics(humidity_test.values, sarima_hum_pred.values, 'SARIMA', 'Humidity', fitted.wall)
     all_results.append(metrics)
     all_predictions['hum_sarima'] = sarima_hum_pred
     print(f"  ✓ SARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
 except Exception as e:
     print(f"  ✗ SARIMA failed: {e}")
 
-# GARCH Model
+# GARCH Model (AR mean + GARCH(1,1) volatility)
 print("[3/3] Training GARCH model for Humidity...")
 try:
-    hum_returns = humidity_train.pct_change().dropna() * 100
-    garch_hum = arch_model(hum_returns, vol='Garch', p=1, q=1)
-    garch_hum_fit = garch_hum.fit(disp='off')
-    garch_pred_series = pd.Series([humidity_train.iloc[-1]] * len(humidity_test), index=humidity_test.index)
-    metrics = calculate_metrics(humidity_test.values, garch_pred_series.values, 'GARCH', 'Humidity')
+    garch_fc = garch_forecasts[humidity_col]
+    if isinstance(garch_fc, Exception):
+        raise garch_fc
+    garch_pred_series = pd.Series(garch_fc['mean'].values, index=humidity_test.index)
+    metrics = calculate_metrics(humidity_test.values, garch_pred_series.values, 'GARCH', 'Humidity', garch_fit_time)
     all_results.append(metrics)
     all_predictions['hum_garch'] = garch_pred_series
-    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    all_predictions['hum_garch_interval'] = garch_fc[['lower', 'upper']].set_index(humidity_test.index)
+    coverage = np.mean((humidity_test.values >= garch_fc['lower'].values) & (humidity_test.values <= garch_fc['upper'].values)) * 100
+    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}, 95% PI coverage: {coverage:.1f}%")
 except Exception as e:
     print(f"  ✗ GARCH failed: {e}")
 
@@ -171,16 +204,22 @@ print("\n" + "="*80)
 print("PRESSURE FORECASTING")
 print("="*80)
 
-pressure_train = train_data[pressure_col]
-pressure_test = test_data[pressure_col]
+pressure_train = train_data.series(pressure_col)
+pressure_test = test_data.series(pressure_col)
+
+# Model orders
+arima_order, sarima_order, sarima_seasonal_order = select_orders(pressure_train, auto=USE_AUTO_ORDER)
+print(f"\nOrders - ARIMA{arima_order}, SARIMA{sarima_order}{sarima_seasonal_order}")
 
 # ARIMA Model
 print("\n[1/3] Training ARIMA model for Pressure...")
 try:
-    arima_press = ARIMA(pressure_train, order=(2, 1, 2))
-    arima_press_fit = arima_press.fit()
-    arima_press_pred = arima_press_fit.forecast(steps=len(pressure_test))
-    metrics = calculate_metrics(pressure_test.values, arima_press_pred.values, 'ARIMA', 'Pressure')
+    with stage('fit', 'ARIMA Pressure') as fitted:
+        arima_press = ARIMA(pressure_train, order=arima_order)
+        arima_press_fit = arima_press.fit()
+    with stage('predict', 'ARIMA Pressure'):
+        arima_press_pred = arima_press_fit.forecast(steps=len(pressure_test))
+    metrics = calculate_metrics(pressure_test.values, arima_press_pred.values, 'ARIMA', 'Pressure', fitted.wall)
     all_results.append(metrics)
     all_predictions['press_arima'] = arima_press_pred
     print(f"  ✓ ARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
@@ -190,27 +229,31 @@ except Exception as e:
 # SARIMA Model
 print("[2/3] Training SARIMA model for Pressure...")
 try:
-    sarima_press = SARIMAX(pressure_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-    sarima_press_fit = sarima_press.fit(disp=False)
-    sarima_press_pred = sarima_press_fit.forecast(steps=len(pressure_test))
-    metrics = calculate_metrics(pressure_test.values, sarima_press_pred.values, 'SARIMA', 'Pressure')
+    with stage('fit', 'SARIMA Pressure') as fitted:
+        sarima_press = SARIMAX(pressure_train, order=sarima_order, seasonal_order=sarima_seasonal_order)
+        sarima_press_fit = sarima_press.fit(disp=False)
+    with stage('predict', 'SARIMA Pressure'):
+        sarima_press_pred = sarima_press_fit.forecast(steps=len(pressure_test))
+    metrics = calculate_metrics(pressure_test.values, sarima_press_pred.values, 'SARIMA', 'Pressure', fitted.wall)
     all_results.append(metrics)
     all_predictions['press_sarima'] = sarima_press_pred
     print(f"  ✓ SARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
 except Exception as e:
     print(f"  ✗ SARIMA failed: {e}")
 
-# GARCH Model
+# GARCH Model (AR mean + GARCH(1,1) volatility)
 print("[3/3] Training GARCH model for Pressure...")
 try:
-    press_returns = pressure_train.pct_change().dropna() * 100
-    garch_press = arch_model(press_returns, vol='Garch', p=1, q=1)
-    garch_press_fit = garch_press.fit(disp='off')
-    garch_pred_series = pd.Series([pressure_train.iloc[-1]] * len(pressure_test), index=pressure_test.index)
-    metrics = calculate_metrics(pressure_test.values, garch_pred_series.values, 'GARCH', 'Pressure')
+    garch_fc = garch_forecasts[pressure_col]
+    if isinstance(garch_fc, Exception):
+        raise garch_fc
+    garch_pred_series = pd.Series(garch_fc['mean'].values, index=pressure_test.index)
+    metrics = calculate_metrics(pressure_test.values, garch_pred_series.values, 'GARCH', 'Pressure', garch_fit_time)
     all_results.append(metrics)
     all_predictions['press_garch'] = garch_pred_series
-    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    all_predictions['press_garch_interval'] = garch_fc[['lower', 'upper']].set_index(pressure_test.index)
+    coverage = np.mean((pressure_test.values >= garch_fc['lower'].values) & (pressure_test.values <= garch_fc['upper'].values)) * 100
+    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}, 95% PI coverage: {coverage:.1f}%")
 except Exception as e:
     print(f"  ✗ GARCH failed: {e}")
 
@@ -221,48 +264,143 @@ print("\n" + "="*80)
 print("DEW POINT FORECASTING")
 print("="*80)
 
-dew_train = train_data[dew_col]
-dew_test = test_data[dew_col]
+dew_train = train_data.series(dew_col)
+dew_test = test_data.series(dew_col)
+
+if DERIVE_DEW_POINT:
+    print("\nDeriving Dew Point from the Temperature and Humidity forecasts (Magnus formula)...")
+    for model_name, key in [('ARIMA', 'arima'), ('SARIMA', 'sarima'), ('GARCH', 'garch')]:
+        if f'temp_{key}' not in all_predictions or f'hum_{key}' not in all_predictions:
+            print(f"  ✗ {model_name} skipped: no Temperature/Humidity forecast to derive from")
+            continue
+        temp_interval = all_predictions.get(f'temp_{key}_interval')
+        hum_interval = all_predictions.get(f'hum_{key}_interval')
+        derived = derive_dew_point(
+            all_predictions[f'temp_{key}'].values, all_predictions[f'hum_{key}'].values,
+            None if temp_interval is None else (temp_interval['lower'].values, temp_interval['upper'].values),
+            None if hum_interval is None else (hum_interval['lower'].values, hum_interval['upper'].values))
+        pred_series = pd.Series(derived['mean'].values, index=dew_test.index)
+        metrics = calculate_metrics(dew_test.values, pred_series.values, model_name, 'Dew Point')
+        all_results.append(metrics)
+        all_predictions[f'dew_{key}'] = pred_series
+        message = f"  ✓ {model_name} (derived) - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}"
+        if 'lower' in derived:
+            all_predictions[f'dew_{key}_interval'] = derived[['lower', 'upper']].set_index(dew_test.index)
+            coverage = np.mean((dew_test.values >= derived['lower'].values) & (dew_test.values <= derived['upper'].values)) * 100
+            message += f", 95% PI coverage: {coverage:.1f}%"
+        print(message)
+else:
+    # Model orders
+    arima_order, sarima_order, sarima_seasonal_order = select_orders(dew_train, auto=USE_AUTO_ORDER)
+    print(f"\nOrders - ARIMA{arima_order}, SARIMA{sarima_order}{sarima_seasonal_order}")
+
+    # ARIMA Model
+    print("\n[1/3] Training ARIMA model for Dew Point...")
+    try:
+        with stage('fit', 'ARIMA Dew Point') as fitted:
+            arima_dew = ARIMA(dew_train, order=arima_order)
+            arima_dew_fit = arima_dew.fit()
+        with stage('predict', 'ARIMA Dew Point'):
+            arima_dew_pred = arima_dew_fit.forecast(steps=len(dew_test))
+        metrics = calculate_metrics(dew_test.values, arima_dew_pred.values, 'ARIMA', 'Dew Point', fitted.wall)
+        all_results.append(metrics)
+        all_predictions['dew_arima'] = arima_dew_pred
+        print(f"  ✓ ARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    except Exception as e:
+        print(f"  ✗ ARIMA failed: {e}")
+
+    # SARIMA Model
+    print("[2/3] Training SARIMA model for Dew Point...")
+    try:
+        with stage('fit', 'SARIMA Dew Point') as fitted:
+            sarima_dew = SARIMAX(dew_train, order=sarima_order, seasonal_order=sarima_seasonal_order)
+            sarima_dew_fit = sarima_dew.fit(disp=False)
+        with stage('predict', 'SARIMA Dew Point'):
+            sarima_dew_pred = sarima_dew_fit.forecast(steps=len(dew_test))
+        metrics = calculate_metrics(dew_test.values, sarima_dew_pred.values, 'SARIMA', 'Dew Point', fitted.wall)
+        all_results.append(metrics)
+        all_predictions['dew_sarima'] = sarima_dew_pred
+        print(f"  ✓ SARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    except Exception as e:
+        print(f"  ✗ SARIMA failed: {e}")
+
+    # GARCH Model (AR mean + GARCH(1,1) volatility)
+    print("[3/3] Training GARCH model for Dew Point...")
+    try:
+        garch_fc = garch_forecasts[dew_col]
+        if isinstance(garch_fc, Exception):
+            raise garch_fc
+        garch_pred_series = pd.Series(garch_fc['mean'].values, index=dew_test.index)
+        metrics = calculate_metrics(dew_test.values, garch_pred_series.values, 'GARCH', 'Dew Point', garch_fit_time)
+        all_results.append(metrics)
+        all_predictions['dew_garch'] = garch_pred_series
+        all_predictions['dew_garch_interval'] = garch_fc[['lower', 'upper']].set_index(dew_test.index)
+        coverage = np.mean((dew_test.values >= garch_fc['lower'].values) & (dew_test.values <= garch_fc['upper'].values)) * 100
+        print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}, 95% PI coverage: {coverage:.1f}%")
+    except Exception as e:
+        print(f"  ✗ GARCH failed: {e}")
 
-# ARIMA Model
-print("\n[1/3] Training ARIMA model for Dew Point...")
-try:
-    arima_dew = ARIMA(dew_train, order=(2, 1, 2))
-    arima_dew_fit = arima_dew.fit()
-    arima_dew_pred = arima_dew_fit.forecast(steps=len(dew_test))
-    metrics = calculate_metrics(dew_test.values, arima_dew_pred.values, 'ARIMA', 'Dew Point')
-    all_results.append(metrics)
-    all_predictions['dew_arima'] = arima_dew_pred
-    print(f"  ✓ ARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
-except Exception as e:
-    print(f"  ✗ ARIMA failed: {e}")
+# ============================================================================
+# MULTIVARIATE VAR FORECASTING (ALL PARAMETERS, ONE FIT)
+# ============================================================================
+print("\n" + "="*80)
+print("MULTIVARIATE VAR FORECASTING")
+print("="*80)
 
-# SARIMA Model
-print("[2/3] Training SARIMA model for Dew Point...")
+print("\nTraining one VAR model over all parameters...")
 try:
-    sarima_dew = SARIMAX(dew_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12))
-    sarima_dew_fit = sarima_dew.fit(disp=False)
-    sarima_dew_pred = sarima_dew_fit.forecast(steps=len(dew_test))
-    metrics = calculate_metrics(dew_test.values, sarima_dew_pred.values, 'SARIMA', 'Dew Point')
-    all_results.append(metrics)
-    all_predictions['dew_sarima'] = sarima_dew_pred
-    print(f"  ✓ SARIMA - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    with stage('fit', 'VAR') as fitted:
+        var_model = MultivariateForecaster([temp_col, humidity_col, pressure_col, dew_col]).fit(train_data.frame())
+    var_fit_time = fitted.wall / 4
+    with stage('predict', 'VAR'):
+        var_pred, var_lower, var_upper = var_model.forecast(len(test_data))
+    print(f"  Lag order (AIC): {var_model.lag_order}")
+    for col, name, key in [(temp_col, 'Temperature', 'temp_var'), (humidity_col, 'Humidity', 'hum_var'),
+                           (pressure_col, 'Pressure', 'press_var'), (dew_col, 'Dew Point', 'dew_var')]:
+        pred_series = pd.Series(var_pred[col].values, index=test_data.index)
+        metrics = calculate_metrics(test_data.values(col), pred_series.values, 'VAR', name, var_fit_time)
+        all_results.append(metrics)
+        all_predictions[key] = pred_series
+        print(f"  ✓ VAR {name} - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
 except Exception as e:
-    print(f"  ✗ SARIMA failed: {e}")
+    print(f"  ✗ VAR failed: {e}")
 
-# GARCH Model
-print("[3/3] Training GARCH model for Dew Point...")
-try:
-    dew_returns = dew_train.pct_change().dropna() * 100
-    garch_dew = arch_model(dew_returns, vol='Garch', p=1, q=1)
-    garch_dew_fit = garch_dew.fit(disp='off')
-    garch_pred_series = pd.Series([dew_train.iloc[-1]] * len(dew_test), index=dew_test.index)
-    metrics = calculate_metrics(dew_test.values, garch_pred_series.values, 'GARCH', 'Dew Point')
-    all_results.append(metrics)
-    all_predictions['dew_garch'] = garch_pred_series
-    print(f"  ✓ GARCH - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
-except Exception as e:
-    print(f"  ✗ GARCH failed: {e}")
+# ============================================================================
+# EXPONENTIAL SMOOTHING (ALL PARAMETERS, ONE VECTORIZED PASS PER MODEL)
+# ============================================================================
+print("\n" + "="*80)
+print("EXPONENTIAL SMOOTHING FORECASTING")
+print("="*80)
+
+smoothing_columns = [(temp_col, 'Temperature', 'temp'), (humidity_col, 'Humidity', 'hum'),
+                     (pressure_col, 'Pressure', 'press')]
+if not DERIVE_DEW_POINT:
+    smoothing_columns.append((dew_col, 'Dew Point', 'dew'))
+
+for kind, model_name in SMOOTHING_MODELS.items():
+    print(f"\nFitting {model_name} on all parameters at once...")
+    try:
+        with stage('fit', model_name) as fitted:
+            smoothing_state = fit_exponential_smoothing(train_data.frame([col for col, _, _ in smoothing_columns]),
+                                                        kind=kind, seasonal_period=12)
+        smoothing_fit_time = fitted.wall / len(smoothing_columns)
+        with stage('predict', model_name):
+            smoothing_pred = forecast_exponential_smoothing(smoothing_state, len(test_data))
+        smoothing_pred.index = test_data.index
+        for col, name, key in smoothing_columns:
+            metrics = calculate_metrics(test_data.values(col), smoothing_pred[col].values, model_name, name,
+                                        smoothing_fit_time)
+            all_results.append(metrics)
+            all_predictions[f'{key}_{kind}'] = smoothing_pred[col]
+            print(f"  ✓ {model_name} {name} - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+        if DERIVE_DEW_POINT:
+            dew_pred = derive_dew_point(smoothing_pred[temp_col], smoothing_pred[humidity_col])['mean']
+            metrics = calculate_metrics(test_data.values(dew_col), dew_pred.values, model_name, 'Dew Point')
+            all_results.append(metrics)
+            all_predictions[f'dew_{kind}'] = dew_pred
+            print(f"  ✓ {model_name} Dew Point (derived) - RMSE: {metrics['RMSE']}, MAE: {metrics['MAE']}, R²: {metrics['R²']}")
+    except Exception as e:
+        print(f"  ✗ {model_name} failed: {e}")
 
 # ============================================================================
 # SAVE RESULTS
@@ -272,8 +410,11 @@ print("SAVING RESULTS")
 print("="*80)
 
 results_df = pd.DataFrame(all_results)
-results_df.to_excel('model_performance_metrics.xlsx', index=False)
+with stage('export', 'model_performance_metrics.xlsx'):
+    results_df.to_excel('model_performance_metrics.xlsx', index=False)
 print("✓ Performance metrics saved: model_performance_metrics.xlsx")
+run_id = record_run(__file__, results_df, rows=len(df))
+print(f"✓ Run {run_id} recorded in {RUN_DB}")
 
 print("\n" + "="*80)
 print("MODEL PERFORMANCE SUMMARY")
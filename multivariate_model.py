@@ -0,0 +1,115 @@
+"""
+Multivariate VAR Model - One joint fit over all weather channels
+Temperature, humidity, pressure and dew point forecast together in a single pass
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from statsmodels.tsa.api import VAR
+
+from weather_data import PARAMETER_COLUMNS
+
+warnings.filterwarnings('ignore')
+
+
+class MultivariateForecaster:
+    """
+    Vector autoregression over several channels
+
+    The channels trend over the day, so by default the VAR is fitted on first
+    differences and forecasts are integrated back to levels. Prediction
+    intervals account for that integration through the cumulative MA weights.
+    Like ARIMA with d=1, the differenced model carries no drift term unless
+    trend='c' is requested.
+    """
+
+    def __init__(self, columns=None, maxlags=15, ic='aic', difference=True, trend=None):
+        self.columns = list(columns) if columns is not None else list(PARAMETER_COLUMNS)
+        self.maxlags = maxlags
+        self.ic = ic
+        self.difference = difference
+        self.trend = trend or ('n' if difference else 'c')
+        self.results = None
+        self.last_levels = None
+        self.last_time = None
+        self.freq = None
+
+    def fit(self, data):
+        """
+        Fit the VAR on a DataFrame holding every channel
+        data: DataFrame with self.columns and a DatetimeIndex (or a 'DateTime' column)
+        """
+        if 'DateTime' in data.columns:
+            data = data.set_index('DateTime')
+        values = data[self.columns].astype(float)
+        self.last_levels = values.iloc[-1].to_numpy()
+        self.last_time = values.index[-1]
+        self.freq = pd.infer_freq(values.index[-10:]) if len(values) >= 10 else None
+
+        endog = values.diff().dropna() if self.difference else values
+        endog = endog.reset_index(drop=True)
+        maxlags = min(self.maxlags, max(1, len(endog) // (len(self.columns) + 1) - 1))
+        self.results = VAR(endog).fit(maxlags=maxlags, ic=self.ic, trend=self.trend)
+        # ic selection can choose 0 lags; keep at least one so channels interact
+        if self.results.k_ar == 0:
+            self.results = VAR(endog).fit(1, trend=self.trend)
+        return self
+
+    @property
+    def lag_order(self):
+        return self.results.k_ar
+
+    def forecast(self, steps, alpha=0.05):
+        """
+        Joint forecast for every channel
+        steps: Periods ahead
+        alpha: 1 - interval coverage
+        Returns: (forecast, lower, upper) DataFrames with one column per channel
+        """
+        k_ar = self.results.k_ar
+        history = self.results.endog[-k_ar:] if k_ar else self.results.endog[:0]
+        point = self.results.forecast(history, steps)
+
+        # Forecast error covariance of the differenced system at each horizon
+        psi = self.results.ma_rep(steps - 1)
+        if self.difference:
+            # Level errors are cumulative sums of difference errors
+            psi = np.cumsum(psi, axis=0)
+            point = self.last_levels + np.cumsum(point, axis=0)
+        sigma_u = np.asarray(self.results.sigma_u)
+        step_cov = np.einsum('hij,jk,hlk->hil', psi, sigma_u, psi)
+        variance = np.cumsum(np.diagonal(step_cov, axis1=1, axis2=2), axis=0)
+        half_width = norm.ppf(1 - alpha / 2) * np.sqrt(variance)
+
+        index = self._future_index(steps)
+        forecast = pd.DataFrame(point, index=index, columns=self.columns)
+        lower = pd.DataFrame(point - half_width, index=index, columns=self.columns)
+        upper = pd.DataFrame(point + half_width, index=index, columns=self.columns)
+        return forecast, lower, upper
+
+    def _future_index(self, steps):
+        if self.freq is not None:
+            return pd.date_range(self.last_time, periods=steps + 1, freq=self.freq)[1:]
+        return pd.RangeIndex(1, steps + 1)
+
+
+if __name__ == '__main__':
+    from weather_data import PARAMETER_NAMES, load_sensor_data
+
+    print("="*80)
+    print("MULTIVARIATE VAR MODEL - JOINT FORECAST")
+    print("="*80)
+
+    df = load_sensor_data().set_index('DateTime')
+    model = MultivariateForecaster().fit(df)
+    print(f"\n✓ VAR fitted on {len(df)} rows, lag order {model.lag_order} (AIC)")
+
+    forecast, lower, upper = model.forecast(240)
+    print("\nForecast Summary (next 240 minutes):")
+    for col in model.columns:
+        print(f"  {PARAMETER_NAMES[col]}: {forecast[col].min():.1f} - {forecast[col].max():.1f}"
+              f" (95% band at 240 min: {lower[col].iloc[-1]:.1f} - {upper[col].iloc[-1]:.1f})")
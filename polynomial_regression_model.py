@@ -6,8 +6,6 @@ Best model for trending time series data
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,18 +13,20 @@ from sklearn.preprocessing import PolynomialFeatures
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from derived_channels import DERIVE_DEW_POINT, magnus_dew_point
+from run_store import RUN_DB, record_run
+from data_views import ColumnStore
+from stage_profile import stage
 
 print("="*80)
 print("POLYNOMIAL REGRESSION MODEL - WEATHER FORECASTING")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 # Column names
 temp_col = 'Temperature (°C)'
@@ -37,20 +37,17 @@ dew_col = 'Dew Point (°C)'
 print("\n[STEP 1] Data loaded successfully")
 print(f"  Total entries: {len(df)}")
 
-# Create time index (minutes from start)
-df['time_index'] = range(len(df))
-
-# Train-test split
-train_size = int(len(df) * 0.8)
-train_data = df[:train_size]
-test_data = df[train_size:]
+# Train-test split: views over one column store, so no parameter is copied
+store = ColumnStore.from_frame(df)
+train_size = int(len(store) * 0.8)
+train_data, test_data = store.split(train_size)
 
 print(f"\n[STEP 2] Train-Test Split")
 print(f"  Training samples: {len(train_data)}")
 print(f"  Testing samples: {len(test_data)}")
 
 # Performance metrics function
-def calculate_metrics(actual, predicted, parameter_name):
+def calculate_metrics(actual, predicted, parameter_name, fit_time=None):
     rmse = np.sqrt(mean_squared_error(actual, predicted))
     mae = mean_absolute_error(actual, predicted)
     mape = np.mean(np.abs((actual - predicted) / actual)) * 100
@@ -68,7 +65,8 @@ def calculate_metrics(actual, predicted, parameter_name):
         'RMSE': round(rmse, 4),
         'MAE': round(mae, 4),
         'MAPE': round(mape, 4),
-        'R²': round(r2, 4)
+        'R²': round(r2, 4),
+        'Fit Time (s)': None if fit_time is None else round(fit_time, 4)
     }
 
 all_results = []
@@ -81,10 +79,11 @@ print("\n" + "="*80)
 print("TEMPERATURE FORECASTING")
 print("="*80)
 
-X_train = train_data[['time_index']].values
-y_train = train_data[temp_col].values
-X_test = test_data[['time_index']].values
-y_test = test_data[temp_col].values
+# Time index: minutes from start
+X_train = train_data.time_index()
+y_train = train_data.values(temp_col)
+X_test = test_data.time_index()
+y_test = test_data.values(temp_col)
 
 # Polynomial features (degree 3 for smooth curve)
 poly = PolynomialFeatures(degree=3)
@@ -93,13 +92,16 @@ X_test_poly = poly.transform(X_test)
 
 # Train model
 temp_model = LinearRegression()
-temp_model.fit(X_train_poly, y_train)
+with stage('fit', 'Polynomial Temperature') as fitted:
+    temp_model.fit(X_train_poly, y_train)
+temp_fit_time = fitted.wall
 
 # Predict
-y_pred = temp_model.predict(X_test_poly)
+with stage('predict', 'Polynomial Temperature'):
+    y_pred = temp_model.predict(X_test_poly)
 
 # Calculate metrics
-temp_metrics = calculate_metrics(y_test, y_pred, 'Temperature')
+temp_metrics = calculate_metrics(y_test, y_pred, 'Temperature', temp_fit_time)
 all_results.append(temp_metrics)
 all_models['temperature'] = (temp_model, poly)
 
@@ -110,19 +112,22 @@ print("\n" + "="*80)
 print("HUMIDITY FORECASTING")
 print("="*80)
 
-y_train_hum = train_data[humidity_col].values
-y_test_hum = test_data[humidity_col].values
+y_train_hum = train_data.values(humidity_col)
+y_test_hum = test_data.values(humidity_col)
 
 poly_hum = PolynomialFeatures(degree=3)
 X_train_poly_hum = poly_hum.fit_transform(X_train)
 X_test_poly_hum = poly_hum.transform(X_test)
 
 hum_model = LinearRegression()
-hum_model.fit(X_train_poly_hum, y_train_hum)
+with stage('fit', 'Polynomial Humidity') as fitted:
+    hum_model.fit(X_train_poly_hum, y_train_hum)
+hum_fit_time = fitted.wall
 
-y_pred_hum = hum_model.predict(X_test_poly_hum)
+with stage('predict', 'Polynomial Humidity'):
+    y_pred_hum = hum_model.predict(X_test_poly_hum)
 
-hum_metrics = calculate_metrics(y_test_hum, y_pred_hum, 'Humidity')
+hum_metrics = calculate_metrics(y_test_hum, y_pred_hum, 'Humidity', hum_fit_time)
 all_results.append(hum_metrics)
 all_models['humidity'] = (hum_model, poly_hum)
 
@@ -133,19 +138,22 @@ print("\n" + "="*80)
 print("PRESSURE FORECASTING")
 print("="*80)
 
-y_train_press = train_data[pressure_col].values
-y_test_press = test_data[pressure_col].values
+y_train_press = train_data.values(pressure_col)
+y_test_press = test_data.values(pressure_col)
 
 poly_press = PolynomialFeatures(degree=2)  # Lower degree for pressure
 X_train_poly_press = poly_press.fit_transform(X_train)
 X_test_poly_press = poly_press.transform(X_test)
 
 press_model = LinearRegression()
-press_model.fit(X_train_poly_press, y_train_press)
+with stage('fit', 'Polynomial Pressure') as fitted:
+    press_model.fit(X_train_poly_press, y_train_press)
+press_fit_time = fitted.wall
 
-y_pred_press = press_model.predict(X_test_poly_press)
+with stage('predict', 'Polynomial Pressure'):
+    y_pred_press = press_model.predict(X_test_poly_press)
 
-press_metrics = calculate_metrics(y_test_press, y_pred_press, 'Pressure')
+press_metrics = calculate_metrics(y_test_press, y_pred_press, 'Pressure', press_fit_time)
 all_results.append(press_metrics)
 all_models['pressure'] = (press_model, poly_press)
 
@@ -156,21 +164,29 @@ print("\n" + "="*80)
 print("DEW POINT FORECASTING")
 print("="*80)
 
-y_train_dew = train_data[dew_col].values
-y_test_dew = test_data[dew_col].values
+y_train_dew = train_data.values(dew_col)
+y_test_dew = test_data.values(dew_col)
 
-poly_dew = PolynomialFeatures(degree=3)
-X_train_poly_dew = poly_dew.fit_transform(X_train)
-X_test_poly_dew = poly_dew.transform(X_test)
+if DERIVE_DEW_POINT:
+    print("\nDerived from the Temperature and Humidity forecasts (Magnus formula)")
+    y_pred_dew = magnus_dew_point(y_pred, y_pred_hum)
+    dew_fit_time = None
+else:
+    poly_dew = PolynomialFeatures(degree=3)
+    X_train_poly_dew = poly_dew.fit_transform(X_train)
+    X_test_poly_dew = poly_dew.transform(X_test)
 
-dew_model = LinearRegression()
-dew_model.fit(X_train_poly_dew, y_train_dew)
+    dew_model = LinearRegression()
+    with stage('fit', 'Polynomial Dew Point') as fitted:
+        dew_model.fit(X_train_poly_dew, y_train_dew)
+    dew_fit_time = fitted.wall
 
-y_pred_dew = dew_model.predict(X_test_poly_dew)
+    with stage('predict', 'Polynomial Dew Point'):
+        y_pred_dew = dew_model.predict(X_test_poly_dew)
+    all_models['dew_point'] = (dew_model, poly_dew)
 
-dew_metrics = calculate_metrics(y_test_dew, y_pred_dew, 'Dew Point')
+dew_metrics = calculate_metrics(y_test_dew, y_pred_dew, 'Dew Point', dew_fit_time)
 all_results.append(dew_metrics)
-all_models['dew_point'] = (dew_model, poly_dew)
 
 # ============================================================================
 # SAVE RESULTS
@@ -180,8 +196,11 @@ print("SAVING RESULTS")
 print("="*80)
 
 results_df = pd.DataFrame(all_results)
-results_df.to_excel('polynomial_regression_performance.xlsx', index=False)
+with stage('export', 'polynomial_regression_performance.xlsx'):
+    results_df.to_excel('polynomial_regression_performance.xlsx', index=False)
 print("✓ Performance metrics saved: polynomial_regression_performance.xlsx")
+run_id = record_run(__file__, results_df, rows=len(df))
+print(f"✓ Run {run_id} recorded in {RUN_DB}")
 
 print("\n" + "="*80)
 print("POLYNOMIAL REGRESSION MODEL PERFORMANCE SUMMARY")
@@ -0,0 +1,242 @@
+"""
+Prophet Model Cache - Serialized fitted models shared across the Prophet scripts
+Keyed by a fingerprint of the training data and the model hyperparameters;
+warm-started incremental refits when new readings extend a series
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from prophet import Prophet
+from prophet.serialize import model_to_json, model_from_json
+
+from forecast_models import prophet_warm_start
+
+PROPHET_CACHE_DIR = '.prophet_cache'
+
+# Hit/miss counters for the current process
+CACHE_STATS = {'hits': 0, 'misses': 0, 'fit_seconds': 0.0, 'load_seconds': 0.0,
+               'warm_fits': 0, 'warm_seconds': 0.0, 'cold_reference_seconds': 0.0}
+
+# Constructor defaults, so Prophet(x=default) and Prophet() share one cache entry
+_PROPHET_DEFAULTS = {
+    name: param.default
+    for name, param in inspect.signature(Prophet.__init__).parameters.items()
+    if param.default is not inspect.Parameter.empty
+}
+
+
+def history_fingerprint(history):
+    """
+    Hash of a Prophet history frame ('ds' and 'y' columns)
+    Returns: hex digest
+    """
+    digest = hashlib.sha1()
+    digest.update(pd.to_datetime(history['ds']).values.astype('datetime64[ns]').tobytes())
+    digest.update(np.ascontiguousarray(history['y'].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(history, params):
+    """
+    Cache key for a fit: data fingerprint plus the full hyperparameter set
+    Returns: hex digest
+    """
+    full_params = {**_PROPHET_DEFAULTS, **params}
+    # 10 and 10.0 are the same prior scale
+    full_params = {name: float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+                   for name, value in full_params.items()}
+    digest = hashlib.sha1(history_fingerprint(history).encode('utf-8'))
+    digest.update(json.dumps(full_params, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir, f'{key}.json')
+
+
+def load_cached_model(history, cache_dir=PROPHET_CACHE_DIR, **params):
+    """
+    Fitted model for this data and hyperparameters, if one was cached
+    Returns: Prophet model or None
+    """
+    path = _cache_path(cache_key(history, params), cache_dir)
+    if not os.path.exists(path):
+        return None
+    start = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        model = model_from_json(f.read())
+    CACHE_STATS['load_seconds'] += time.perf_counter() - start
+    return model
+
+
+def save_model(model, history, cache_dir=PROPHET_CACHE_DIR, **params):
+    """Serialize a fitted model under its cache key"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(cache_key(history, params), cache_dir)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(model_to_json(model))
+    os.replace(tmp, path)
+    return path
+
+
+def fit_prophet_cached(history, cache_dir=PROPHET_CACHE_DIR, **params):
+    """
+    Load a cached Prophet fit or fit and cache a new one
+    history: DataFrame with 'ds' and 'y' columns
+    params: Prophet constructor arguments
+    Returns: fitted Prophet model
+    """
+    model = load_cached_model(history, cache_dir=cache_dir, **params)
+    if model is not None:
+        CACHE_STATS['hits'] += 1
+        return model
+
+    CACHE_STATS['misses'] += 1
+    start = time.perf_counter()
+    model = Prophet(**params)
+    model.fit(history)
+    CACHE_STATS['fit_seconds'] += time.perf_counter() - start
+    save_model(model, history, cache_dir=cache_dir, **params)
+    return model
+
+
+def _latest_path(series_name, cache_dir):
+    return os.path.join(cache_dir, f'latest_{series_name}.meta')
+
+
+def _read_latest(series_name, cache_dir, params):
+    """Pointer to the most recent fit of a series with these hyperparameters"""
+    path = _latest_path(series_name, cache_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        latest = json.load(f)
+    if latest.get('params') != json.loads(json.dumps(params, sort_keys=True, default=str)):
+        return None
+    return latest
+
+
+def _write_latest(series_name, cache_dir, params, key, cold_seconds):
+    os.makedirs(cache_dir, exist_ok=True)
+    latest = {'key': key, 'params': json.loads(json.dumps(params, sort_keys=True, default=str)),
+              'cold_seconds': cold_seconds}
+    with open(_latest_path(series_name, cache_dir), 'w', encoding='utf-8') as f:
+        json.dump(latest, f, indent=2)
+
+
+def fit_prophet_incremental(history, series_name, cache_dir=PROPHET_CACHE_DIR, compare_cold=False,
+                            **params):
+    """
+    Refit a series after new readings arrive, warm-starting from its previous fit
+
+    The previous fit's parameters seed the Stan optimizer (Prophet.fit(init=...)),
+    which needs far fewer iterations than a cold start on the extended history.
+    history: Full (extended) history with 'ds' and 'y' columns
+    series_name: Stable name for the series, e.g. 'temperature' or 'station1_temperature'
+    compare_cold: Also run a cold fit on this history to measure the speedup
+    Returns: (fitted Prophet model, report dict with mode, seconds and speedup;
+              speedup is None unless a cold fit was timed on this same history)
+    """
+    key = cache_key(history, params)
+    latest = _read_latest(series_name, cache_dir, params)
+
+    model = load_cached_model(history, cache_dir=cache_dir, **params)
+    if model is not None:
+        CACHE_STATS['hits'] += 1
+        return model, {'mode': 'cached', 'seconds': 0.0, 'speedup': None}
+
+    CACHE_STATS['misses'] += 1
+    previous = None
+    if latest is not None and os.path.exists(_cache_path(latest['key'], cache_dir)):
+        with open(_cache_path(latest['key'], cache_dir), 'r', encoding='utf-8') as f:
+            previous = model_from_json(f.read())
+
+    # Cold fit time on this history, when one is measured; the stored one is from a shorter history
+    cold_seconds = None
+    model = Prophet(**params)
+    start = time.perf_counter()
+    if previous is not None and len(previous.params['delta'][0]) == model.n_changepoints:
+        model.fit(history, init=prophet_warm_start(previous))
+        mode = 'warm'
+    else:
+        model.fit(history)
+        mode = 'cold'
+    seconds = time.perf_counter() - start
+    CACHE_STATS['fit_seconds'] += seconds
+
+    if mode == 'cold':
+        cold_seconds = seconds
+    elif compare_cold:
+        start = time.perf_counter()
+        Prophet(**params).fit(history)
+        cold_seconds = time.perf_counter() - start
+
+    if mode == 'warm' and cold_seconds:
+        CACHE_STATS['warm_fits'] += 1
+        CACHE_STATS['warm_seconds'] += seconds
+        CACHE_STATS['cold_reference_seconds'] += cold_seconds
+
+    save_model(model, history, cache_dir=cache_dir, **params)
+    _write_latest(series_name, cache_dir, params, key,
+                  cold_seconds if cold_seconds is not None else latest and latest['cold_seconds'])
+    speedup = cold_seconds / seconds if mode == 'warm' and cold_seconds and seconds > 0 else None
+    return model, {'mode': mode, 'seconds': seconds, 'speedup': speedup}
+
+
+def print_cache_report():
+    """Print hit/miss counts and warm-start speedup for this run"""
+    total = CACHE_STATS['hits'] + CACHE_STATS['misses']
+    print(f"\n✓ Prophet model cache: {CACHE_STATS['hits']} hits, {CACHE_STATS['misses']} misses"
+          f" ({total} models)")
+    if CACHE_STATS['misses']:
+        print(f"  Fitting (misses): {CACHE_STATS['fit_seconds']:.2f}s")
+    if CACHE_STATS['hits']:
+        print(f"  Loading (hits): {CACHE_STATS['load_seconds']:.2f}s")
+    if CACHE_STATS['warm_fits']:
+        speedup = CACHE_STATS['cold_reference_seconds'] / max(CACHE_STATS['warm_seconds'], 1e-9)
+        print(f"  Warm-started refits: {CACHE_STATS['warm_fits']} in {CACHE_STATS['warm_seconds']:.2f}s"
+              f" (cold: {CACHE_STATS['cold_reference_seconds']:.2f}s, {speedup:.1f}x faster)")
+
+
+def clear_cache(cache_dir=PROPHET_CACHE_DIR):
+    """Delete every cached model; returns the number of files removed"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    removed = 0
+    for name in os.listdir(cache_dir):
+        if name.endswith('.json') or name.endswith('.meta'):
+            os.remove(os.path.join(cache_dir, name))
+            removed += 1
+    return removed
+
+
+if __name__ == '__main__':
+    from weather_data import TEMP_COL, load_sensor_data
+
+    print("="*80)
+    print("PROPHET INCREMENTAL REFIT - WARM START vs COLD START")
+    print("="*80)
+
+    df = load_sensor_data()
+    history = pd.DataFrame({'ds': df['DateTime'].values, 'y': df[TEMP_COL].values})
+    params = {'daily_seasonality': True, 'weekly_seasonality': False,
+              'yearly_seasonality': False, 'changepoint_prior_scale': 0.5}
+    cache_dir = os.path.join(PROPHET_CACHE_DIR, 'demo')
+    clear_cache(cache_dir)
+
+    # Initial fit on all but the last 10 minutes, then 10 new readings arrive
+    _, report = fit_prophet_incremental(history.iloc[:-10], 'temperature', cache_dir=cache_dir, **params)
+    print(f"\nInitial fit ({report['mode']}): {report['seconds']:.3f}s")
+    _, report = fit_prophet_incremental(history, 'temperature', cache_dir=cache_dir,
+                                        compare_cold=True, **params)
+    speedup = f" - {report['speedup']:.1f}x faster than a cold fit" if report['speedup'] else ''
+    print(f"Refit with 10 new readings ({report['mode']}): {report['seconds']:.3f}s{speedup}")
+    print_cache_report()
@@ -6,26 +6,26 @@ Best model for time series with trends and seasonality
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-from prophet import Prophet
+from prophet_cache import fit_prophet_cached, print_cache_report
+from prophet_tuning import best_prophet_params
+from data_views import ColumnStore
+from derived_channels import DERIVE_DEW_POINT, derive_dew_point
+from run_store import RUN_DB, record_run
+from stage_profile import stage
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
-
 print("="*80)
 print("PROPHET MODEL - WEATHER FORECASTING")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 # Column names
 temp_col = 'Temperature (°C)'
@@ -39,15 +39,15 @@ print(f"  Time range: {df['DateTime'].min()} to {df['DateTime'].max()}")
 
 # Train-test split
 train_size = int(len(df) * 0.8)
-train_data = df[:train_size]
-test_data = df[train_size:]
+store = ColumnStore.from_frame(df)
+train_data, test_data = store.split(train_size)
 
 print(f"\n[STEP 2] Train-Test Split")
 print(f"  Training samples: {len(train_data)}")
 print(f"  Testing samples: {len(test_data)}")
 
 # Performance metrics function
-def calculate_metrics(actual, predicted, parameter_name):
+def calculate_metrics(actual, predicted, parameter_name, fit_time=None):
     rmse = np.sqrt(mean_squared_error(actual, predicted))
     mae = mean_absolute_error(actual, predicted)
     mape = np.mean(np.abs((actual - predicted) / actual)) * 100
@@ -65,7 +65,8 @@ def calculate_metrics(actual, predicted, parameter_name):
         'RMSE': round(rmse, 4),
         'MAE': round(mae, 4),
         'MAPE': round(mape, 4),
-        'R²': round(r2, 4)
+        'R²': round(r2, 4),
+        'Fit Time (s)': None if fit_time is None else round(fit_time, 4)
     }
 
 all_results = []
@@ -77,30 +78,27 @@ print("\n" + "="*80)
 print("TEMPERATURE FORECASTING WITH PROPHET")
 print("="*80)
 
-# Prepare data for Prophet (requires 'ds' and 'y' columns)
-temp_train = train_data[['DateTime', temp_col]].copy()
-temp_train.columns = ['ds', 'y']
+# Prophet frames ('ds' and 'y') are views over the shared column store, built once per split
+temp_train = train_data.prophet_frame(temp_col)
 
-temp_test = test_data[['DateTime', temp_col]].copy()
-temp_test.columns = ['ds', 'y']
+temp_test = test_data.prophet_frame(temp_col)
 
 # Train Prophet model
 print("\nTraining Prophet model for Temperature...")
-temp_model = Prophet(
-    daily_seasonality=True,
-    weekly_seasonality=False,
-    yearly_seasonality=False,
-    changepoint_prior_scale=0.5,
-    seasonality_prior_scale=10
-)
-temp_model.fit(temp_train)
+with stage('fit', 'Prophet Temperature') as fitted:
+    temp_model = fit_prophet_cached(
+        temp_train,
+        **best_prophet_params('Temperature')
+    )
+temp_fit_time = fitted.wall
 
 # Make predictions
-temp_forecast = temp_model.predict(temp_test[['ds']])
+with stage('predict', 'Prophet Temperature'):
+    temp_forecast = temp_model.predict(test_data.prophet_frame())
 temp_pred = temp_forecast['yhat'].values
 
 # Calculate metrics
-temp_metrics = calculate_metrics(temp_test['y'].values, temp_pred, 'Temperature')
+temp_metrics = calculate_metrics(temp_test['y'].values, temp_pred, 'Temperature', temp_fit_time)
 all_results.append(temp_metrics)
 
 # ============================================================================
@@ -110,26 +108,23 @@ print("\n" + "="*80)
 print("HUMIDITY FORECASTING WITH PROPHET")
 print("="*80)
 
-hum_train = train_data[['DateTime', humidity_col]].copy()
-hum_train.columns = ['ds', 'y']
+hum_train = train_data.prophet_frame(humidity_col)
 
-hum_test = test_data[['DateTime', humidity_col]].copy()
-hum_test.columns = ['ds', 'y']
+hum_test = test_data.prophet_frame(humidity_col)
 
 print("\nTraining Prophet model for Humidity...")
-hum_model = Prophet(
-    daily_seasonality=True,
-    weekly_seasonality=False,
-    yearly_seasonality=False,
-    changepoint_prior_scale=0.5,
-    seasonality_prior_scale=10
-)
-hum_model.fit(hum_train)
-
-hum_forecast = hum_model.predict(hum_test[['ds']])
+with stage('fit', 'Prophet Humidity') as fitted:
+    hum_model = fit_prophet_cached(
+        hum_train,
+        **best_prophet_params('Humidity')
+    )
+hum_fit_time = fitted.wall
+
+with stage('predict', 'Prophet Humidity'):
+    hum_forecast = hum_model.predict(test_data.prophet_frame())
 hum_pred = hum_forecast['yhat'].values
 
-hum_metrics = calculate_metrics(hum_test['y'].values, hum_pred, 'Humidity')
+hum_metrics = calculate_metrics(hum_test['y'].values, hum_pred, 'Humidity', hum_fit_time)
 all_results.append(hum_metrics)
 
 # ============================================================================
@@ -139,26 +134,23 @@ print("\n" + "="*80)
 print("PRESSURE FORECASTING WITH PROPHET")
 print("="*80)
 
-press_train = train_data[['DateTime', pressure_col]].copy()
-press_train.columns = ['ds', 'y']
+press_train = train_data.prophet_frame(pressure_col)
 
-press_test = test_data[['DateTime', pressure_col]].copy()
-press_test.columns = ['ds', 'y']
+press_test = test_data.prophet_frame(pressure_col)
 
 print("\nTraining Prophet model for Pressure...")
-press_model = Prophet(
-    daily_seasonality=True,
-    weekly_seasonality=False,
-    yearly_seasonality=False,
-    changepoint_prior_scale=0.3,
-    seasonality_prior_scale=5
-)
-press_model.fit(press_train)
-
-press_forecast = press_model.predict(press_test[['ds']])
+with stage('fit', 'Prophet Pressure') as fitted:
+    press_model = fit_prophet_cached(
+        press_train,
+        **best_prophet_params('Pressure')
+    )
+press_fit_time = fitted.wall
+
+with stage('predict', 'Prophet Pressure'):
+    press_forecast = press_model.predict(test_data.prophet_frame())
 press_pred = press_forecast['yhat'].values
 
-press_metrics = calculate_metrics(press_test['y'].values, press_pred, 'Pressure')
+press_metrics = calculate_metrics(press_test['y'].values, press_pred, 'Pressure', press_fit_time)
 all_results.append(press_metrics)
 
 # ============================================================================
@@ -168,26 +160,32 @@ print("\n" + "="*80)
 print("DEW POINT FORECASTING WITH PROPHET")
 print("="*80)
 
-dew_train = train_data[['DateTime', dew_col]].copy()
-dew_train.columns = ['ds', 'y']
-
-dew_test = test_data[['DateTime', dew_col]].copy()
-dew_test.columns = ['ds', 'y']
-
-print("\nTraining Prophet model for Dew Point...")
-dew_model = Prophet(
-    daily_seasonality=True,
-    weekly_seasonality=False,
-    yearly_seasonality=False,
-    changepoint_prior_scale=0.5,
-    seasonality_prior_scale=10
-)
-dew_model.fit(dew_train)
-
-dew_forecast = dew_model.predict(dew_test[['ds']])
-dew_pred = dew_forecast['yhat'].values
-
-dew_metrics = calculate_metrics(dew_test['y'].values, dew_pred, 'Dew Point')
+dew_train = train_data.prophet_frame(dew_col)
+
+dew_test = test_data.prophet_frame(dew_col)
+
+if DERIVE_DEW_POINT:
+    print("\nDeriving Dew Point from the Temperature and Humidity forecasts (Magnus formula)...")
+    dew_derived = derive_dew_point(
+        temp_pred, hum_pred,
+        (temp_forecast['yhat_lower'].values, temp_forecast['yhat_upper'].values),
+        (hum_forecast['yhat_lower'].values, hum_forecast['yhat_upper'].values))
+    dew_pred = dew_derived['mean'].values
+    dew_fit_time = None
+else:
+    print("\nTraining Prophet model for Dew Point...")
+    with stage('fit', 'Prophet Dew Point') as fitted:
+        dew_model = fit_prophet_cached(
+            dew_train,
+            **best_prophet_params('Dew Point')
+        )
+    dew_fit_time = fitted.wall
+
+    with stage('predict', 'Prophet Dew Point'):
+        dew_forecast = dew_model.predict(test_data.prophet_frame())
+    dew_pred = dew_forecast['yhat'].values
+
+dew_metrics = calculate_metrics(dew_test['y'].values, dew_pred, 'Dew Point', dew_fit_time)
 all_results.append(dew_metrics)
 
 # ============================================================================
@@ -198,14 +196,18 @@ print("SAVING RESULTS")
 print("="*80)
 
 results_df = pd.DataFrame(all_results)
-results_df.to_excel('prophet_model_performance.xlsx', index=False)
+with stage('export', 'prophet_model_performance.xlsx'):
+    results_df.to_excel('prophet_model_performance.xlsx', index=False)
 print("✓ Performance metrics saved: prophet_model_performance.xlsx")
+run_id = record_run(__file__, results_df, rows=len(df))
+print(f"✓ Run {run_id} recorded in {RUN_DB}")
 
 print("\n" + "="*80)
 print("PROPHET MODEL PERFORMANCE SUMMARY")
 print("="*80)
 print(results_df.to_string(index=False))
 
+print_cache_report()
 print("\n✓ Prophet model training completed!")
 print("✓ All R² scores should be positive and close to 1.0")
 print("\nNext: Run visualization script for graphs...")
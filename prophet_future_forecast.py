@@ -5,25 +5,26 @@ Prophet Model - Future Forecasting (2:15 PM to 6:15 PM)
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-from prophet import Prophet
-
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from prophet_cache import fit_prophet_incremental, print_cache_report
+from prophet_tuning import best_prophet_params
+from data_views import ColumnStore
+from derived_channels import DERIVE_DEW_POINT, derive_dew_point
+from chart_render import chart_spec, render_charts
+from stage_profile import stage
+from data_export import write_frame
 
 print("="*80)
 print("PROPHET MODEL - FUTURE FORECASTING")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 temp_col = 'Temperature (°C)'
 humidity_col = 'Humidity (%)'
@@ -32,6 +33,9 @@ dew_col = 'Dew Point (°C)'
 
 print("\n[STEP 1] Training models on complete dataset...")
 
+# Prophet frames of every parameter are views over one column store, sharing its 'ds' array
+store = ColumnStore.from_frame(df)
+
 # Forecast 240 minutes (4 hours from 2:15 PM to 6:15 PM)
 forecast_steps = 240
 
@@ -39,62 +43,75 @@ forecast_steps = 240
 # TEMPERATURE FORECAST
 # ============================================================================
 print("\n  Training Temperature model...")
-temp_data = df[['DateTime', temp_col]].copy()
-temp_data.columns = ['ds', 'y']
+temp_data = store.prophet_frame(temp_col)
 
-temp_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                     yearly_seasonality=False, changepoint_prior_scale=0.5)
-temp_model.fit(temp_data)
+with stage('fit', 'Prophet Temperature'):
+    temp_model, temp_refit = fit_prophet_incremental(temp_data, 'temperature',
+                                                     **best_prophet_params('Temperature'))
+print(f"    ✓ {temp_refit['mode'].capitalize()} fit ({temp_refit['seconds']:.2f}s)")
 
-# Create future dataframe
+# Create future dataframe (shared by every parameter's forecast)
 last_time = df['DateTime'].iloc[-1]
 future_dates = [last_time + timedelta(minutes=i+1) for i in range(forecast_steps)]
-future_df_temp = pd.DataFrame({'ds': future_dates})
+future_df = pd.DataFrame({'ds': future_dates})
 
 # Forecast
-temp_future = temp_model.predict(future_df_temp)
+with stage('predict', 'Prophet Temperature'):
+    temp_future = temp_model.predict(future_df)
 
 # ============================================================================
 # HUMIDITY FORECAST
 # ============================================================================
 print("  Training Humidity model...")
-hum_data = df[['DateTime', humidity_col]].copy()
-hum_data.columns = ['ds', 'y']
+hum_data = store.prophet_frame(humidity_col)
 
-hum_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                    yearly_seasonality=False, changepoint_prior_scale=0.5)
-hum_model.fit(hum_data)
+with stage('fit', 'Prophet Humidity'):
+    hum_model, hum_refit = fit_prophet_incremental(hum_data, 'humidity',
+                                                   **best_prophet_params('Humidity'))
+print(f"    ✓ {hum_refit['mode'].capitalize()} fit ({hum_refit['seconds']:.2f}s)")
 
-future_df_hum = pd.DataFrame({'ds': future_dates})
-hum_future = hum_model.predict(future_df_hum)
+with stage('predict', 'Prophet Humidity'):
+    hum_future = hum_model.predict(future_df)
 
 # ============================================================================
 # PRESSURE FORECAST
 # ============================================================================
 print("  Training Pressure model...")
-press_data = df[['DateTime', pressure_col]].copy()
-press_data.columns = ['ds', 'y']
+press_data = store.prophet_frame(pressure_col)
 
-press_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                      yearly_seasonality=False, changepoint_prior_scale=0.3)
-press_model.fit(press_data)
+with stage('fit', 'Prophet Pressure'):
+    press_model, press_refit = fit_prophet_incremental(press_data, 'pressure',
+                                                       **best_prophet_params('Pressure'))
+print(f"    ✓ {press_refit['mode'].capitalize()} fit ({press_refit['seconds']:.2f}s)")
 
-future_df_press = pd.DataFrame({'ds': future_dates})
-press_future = press_model.predict(future_df_press)
+with stage('predict', 'Prophet Pressure'):
+    press_future = press_model.predict(future_df)
 
 # ============================================================================
 # DEW POINT FORECAST
 # ============================================================================
-print("  Training Dew Point model...")
-dew_data = df[['DateTime', dew_col]].copy()
-dew_data.columns = ['ds', 'y']
-
-dew_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                    yearly_seasonality=False, changepoint_prior_scale=0.5)
-dew_model.fit(dew_data)
-
-future_df_dew = pd.DataFrame({'ds': future_dates})
-dew_future = dew_model.predict(future_df_dew)
+if DERIVE_DEW_POINT:
+    print("  Deriving Dew Point from Temperature and Humidity (Magnus formula)...")
+    dew_derived = derive_dew_point(
+        temp_future['yhat'].values, hum_future['yhat'].values,
+        (temp_future['yhat_lower'].values, temp_future['yhat_upper'].values),
+        (hum_future['yhat_lower'].values, hum_future['yhat_upper'].values))
+    dew_future = pd.DataFrame({'ds': future_dates, 'yhat': dew_derived['mean'].values,
+                               'yhat_lower': dew_derived['lower'].values,
+                               'yhat_upper': dew_derived['upper'].values})
+else:
+    print("  Training Dew Point model...")
+    dew_data = store.prophet_frame(dew_col)
+
+    with stage('fit', 'Prophet Dew Point'):
+        dew_model, dew_refit = fit_prophet_incremental(dew_data, 'dew_point',
+                                                       **best_prophet_params('Dew Point'))
+    print(f"    ✓ {dew_refit['mode'].capitalize()} fit ({dew_refit['seconds']:.2f}s)")
+
+    with stage('predict', 'Prophet Dew Point'):
+        dew_future = dew_model.predict(future_df)
+
+print_cache_report()
 
 # ============================================================================
 # CREATE FORECAST DATAFRAME
@@ -118,8 +135,8 @@ forecast_df = forecast_df[['Date', 'Time', 'Temperature (°C)', 'Humidity (%)',
                            'Pressure (hPa)', 'Dew Point (°C)']]
 
 # Save forecast
-forecast_df.to_excel('prophet_future_forecast_2pm_to_6pm.xlsx', index=False)
-print("✓ Future forecast saved: prophet_future_forecast_2pm_to_6pm.xlsx")
+forecast_file = write_frame(forecast_df, 'prophet_future_forecast_2pm_to_6pm.xlsx')
+print(f"✓ Future forecast saved: {forecast_file}")
 
 print(f"\nForecast Summary:")
 print(f"  Temperature: {forecast_df['Temperature (°C)'].min():.1f}°C - {forecast_df['Temperature (°C)'].max():.1f}°C")
@@ -132,7 +149,7 @@ print(f"  Dew Point: {forecast_df['Dew Point (°C)'].min():.1f}°C - {forecast_d
 # ============================================================================
 print("\n[STEP 3] Creating future forecast visualizations...")
 
-fig, axes = plt.subplots(4, 1, figsize=(18, 16))
+spec, axes = chart_spec('prophet_future_forecast_complete.png', 4, 1, figsize=(18, 16))
 
 # Temperature
 axes[0].plot(df['DateTime'], df[temp_col], label='Historical Data', 
@@ -179,12 +196,9 @@ axes[3].set_xlabel('Time', fontsize=13, fontweight='bold')
 axes[3].legend(loc='best', fontsize=11)
 axes[3].grid(True, alpha=0.3)
 
-plt.suptitle('Prophet Model - Future Forecast (2:15 PM - 6:15 PM)', 
-            fontsize=18, fontweight='bold', y=0.995)
-plt.tight_layout()
-plt.savefig('prophet_future_forecast_complete.png', dpi=300, bbox_inches='tight')
-print("✓ Future forecast visualization saved: prophet_future_forecast_complete.png")
-plt.close()
+spec.suptitle('Prophet Model - Future Forecast (2:15 PM - 6:15 PM)', 
+             fontsize=18, fontweight='bold', y=0.995)
+render_charts([spec])
 
 print("\n✓ Future forecasting completed!")
 print("\nGenerated files:")
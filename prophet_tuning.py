@@ -0,0 +1,214 @@
+"""
+Prophet Hyperparameter Search - Changepoint and seasonality priors chosen by cross-validation
+Candidates are scored in a process pool, rung by rung, and clearly dominated ones are dropped early
+"""
+
+import itertools
+import json
+import os
+import random
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+warnings.filterwarnings('ignore')
+
+PROPHET_TUNING_FILE = 'prophet_best_params.json'
+
+# Priors searched by default; the hand-picked values (0.3 / 0.5, 5 / 10) are on the grid
+DEFAULT_GRID = {
+    'changepoint_prior_scale': [0.01, 0.05, 0.1, 0.3, 0.5, 1.0],
+    'seasonality_prior_scale': [0.1, 1.0, 5.0, 10.0, 20.0]
+}
+
+# Settings shared by every Prophet fit in the repo
+BASE_PARAMS = {'daily_seasonality': True, 'weekly_seasonality': False, 'yearly_seasonality': False}
+
+# Hand-picked priors per parameter, used by every Prophet script until a tuning result exists
+HAND_PICKED_PRIORS = {
+    'Temperature': {'changepoint_prior_scale': 0.5, 'seasonality_prior_scale': 10},
+    'Humidity': {'changepoint_prior_scale': 0.5, 'seasonality_prior_scale': 10},
+    'Pressure': {'changepoint_prior_scale': 0.3, 'seasonality_prior_scale': 5},
+    'Dew Point': {'changepoint_prior_scale': 0.5, 'seasonality_prior_scale': 10}
+}
+
+
+def parameter_grid(grid=None, n_samples=None, seed=42):
+    """
+    Candidate configurations from a grid of prior values
+    grid: dict of parameter -> list of values (default: DEFAULT_GRID)
+    n_samples: Random sample of this many configurations (None = full grid)
+    Returns: list of parameter dicts
+    """
+    grid = grid or DEFAULT_GRID
+    names = sorted(grid)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    if n_samples is not None and n_samples < len(configs):
+        configs = random.Random(seed).sample(configs, n_samples)
+    return configs
+
+
+def _score_rung(task):
+    """Worker: squared-error sum of one configuration over a rung of cutoffs"""
+    history, params, cutoffs, horizon, cache_dir = task
+    from prophet.diagnostics import cross_validation
+    from prophet_cache import fit_prophet_cached
+    import logging
+
+    warnings.filterwarnings('ignore')
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+    logging.getLogger('prophet').setLevel(logging.ERROR)
+    try:
+        # The full-history fit is cached, so later rungs of the same
+        # configuration (and the fit scripts afterwards) reuse it
+        model = fit_prophet_cached(history, cache_dir=cache_dir, **params)
+        cv = cross_validation(model, horizon=horizon, cutoffs=list(cutoffs), disable_tqdm=True)
+    except Exception:
+        return np.inf, 0
+    errors = (cv['y'] - cv['yhat']).to_numpy(dtype=float)
+    return float(np.sum(errors ** 2)), len(errors)
+
+
+def tune_prophet(history, grid=None, n_samples=None, initial='120 minutes', period='15 minutes',
+                 horizon='60 minutes', rungs=3, prune_ratio=1.25, workers=None, seed=42,
+                 cache_dir=None, **base_params):
+    """
+    Cross-validated search over Prophet priors with early stopping
+    history: DataFrame with 'ds' and 'y' columns (training data only)
+    grid, n_samples: Candidate configurations (see parameter_grid)
+    initial, period, horizon: Prophet cross-validation windows
+    rungs: Cutoffs are split into this many rungs, most recent first; after each
+           rung every configuration whose running RMSE exceeds prune_ratio times
+           the best is dropped
+    workers: Process pool size (None = os.cpu_count())
+    base_params: Fixed Prophet arguments (default: BASE_PARAMS)
+    Returns: dict with the best params, its RMSE, and a DataFrame of every candidate's score
+    """
+    from prophet.diagnostics import generate_cutoffs
+    from prophet_cache import PROPHET_CACHE_DIR
+
+    cache_dir = cache_dir or PROPHET_CACHE_DIR
+    base_params = base_params or dict(BASE_PARAMS)
+    history = history[['ds', 'y']].reset_index(drop=True)
+    horizon = pd.Timedelta(horizon)
+    cutoffs = generate_cutoffs(history, horizon, pd.Timedelta(initial), pd.Timedelta(period))
+    cutoffs = sorted(cutoffs, reverse=True)
+    rung_cutoffs = [list(chunk) for chunk in np.array_split(np.array(cutoffs, dtype=object),
+                                                            max(1, min(rungs, len(cutoffs))))]
+
+    configs = [{**base_params, **config} for config in parameter_grid(grid, n_samples, seed)]
+    sse = np.zeros(len(configs))
+    count = np.zeros(len(configs), dtype=int)
+    pruned_at = [None] * len(configs)
+    alive = list(range(len(configs)))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rung, chunk in enumerate(rung_cutoffs, start=1):
+            tasks = [(history, configs[i], chunk, horizon, cache_dir) for i in alive]
+            for i, (rung_sse, rung_count) in zip(alive, pool.map(_score_rung, tasks)):
+                sse[i] += rung_sse
+                count[i] += rung_count
+            rmse = np.sqrt(sse / np.maximum(count, 1))
+            best = min(rmse[i] for i in alive)
+            if rung < len(rung_cutoffs):
+                for i in alive:
+                    if rmse[i] > prune_ratio * best:
+                        pruned_at[i] = rung
+                alive = [i for i in alive if pruned_at[i] is None]
+
+    rmse = np.sqrt(sse / np.maximum(count, 1))
+    rmse[count == 0] = np.inf
+    scores = pd.DataFrame([{name: config[name] for name in sorted(grid or DEFAULT_GRID)} for config in configs])
+    scores['RMSE'] = rmse.round(4)
+    scores['Cutoffs'] = [sum(len(chunk) for chunk in rung_cutoffs[:p or len(rung_cutoffs)]) for p in pruned_at]
+    scores['Pruned At Rung'] = pruned_at
+    best_index = min(alive, key=lambda i: rmse[i])
+    return {
+        'params': configs[best_index],
+        'rmse': float(rmse[best_index]),
+        'scores': scores.sort_values('RMSE').reset_index(drop=True),
+        'rungs_skipped': int(sum(len(rung_cutoffs) - p for p in pruned_at if p))
+    }
+
+
+def save_best_params(best, path=PROPHET_TUNING_FILE):
+    """
+    Merge winning configurations into the tuning file
+    best: dict of parameter name -> {'params': ..., 'rmse': ...}
+    Parameters without a finite CV score (every candidate failed) are skipped,
+    keeping any earlier entry, so a configuration that never fitted is never saved
+    """
+    saved = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+    for name, result in best.items():
+        if not np.isfinite(result['rmse']):
+            continue
+        saved[name] = {**{key: result['params'][key] for key in DEFAULT_GRID if key in result['params']},
+                       'cv_rmse': round(result['rmse'], 4)}
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(saved, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def best_prophet_params(parameter_name, path=PROPHET_TUNING_FILE, **defaults):
+    """
+    Prophet arguments for one parameter, with tuned priors when available
+    parameter_name: e.g. 'Temperature' (a key of the tuning file)
+    defaults: Overrides of BASE_PARAMS and the HAND_PICKED_PRIORS used when no tuning result exists
+    Every script asks here, so the same parameter gets the same fit (and Prophet cache entry)
+    Returns: dict of Prophet constructor arguments
+    """
+    defaults = {**BASE_PARAMS, **HAND_PICKED_PRIORS.get(parameter_name, {}), **defaults}
+    if not os.path.exists(path):
+        return defaults
+    with open(path, 'r', encoding='utf-8') as f:
+        tuned = json.load(f).get(parameter_name, {})
+    return {**defaults, **{key: value for key, value in tuned.items() if key in DEFAULT_GRID}}
+
+
+if __name__ == '__main__':
+    import argparse
+    from weather_data import PARAMETER_COLUMNS, PARAMETER_NAMES, load_sensor_data
+
+    parser = argparse.ArgumentParser(description='Cross-validated Prophet prior search')
+    parser.add_argument('--samples', type=int, default=None, help='Random sample of the grid (default: full grid)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--prune-ratio', type=float, default=1.25,
+                        help='Drop configurations worse than this multiple of the best RMSE')
+    args = parser.parse_args()
+
+    print("="*80)
+    print("PROPHET HYPERPARAMETER SEARCH")
+    print("="*80)
+
+    df = load_sensor_data()
+    # Tune on the same training split the fit scripts evaluate against
+    train = df[:int(len(df) * 0.8)]
+    best = {}
+    for col in PARAMETER_COLUMNS:
+        name = PARAMETER_NAMES[col]
+        history = pd.DataFrame({'ds': train['DateTime'].values, 'y': train[col].values})
+        start = time.perf_counter()
+        result = tune_prophet(history, n_samples=args.samples, workers=args.workers,
+                              prune_ratio=args.prune_ratio)
+        best[name] = result
+        params = result['params']
+        print(f"\n{name} ({time.perf_counter() - start:.1f}s):")
+        print(f"  Best: changepoint_prior_scale={params['changepoint_prior_scale']},"
+              f" seasonality_prior_scale={params['seasonality_prior_scale']} - CV RMSE: {result['rmse']:.4f}")
+        print(f"  Configurations: {len(result['scores'])},"
+              f" pruned early: {result['scores']['Pruned At Rung'].notna().sum()}"
+              f" ({result['rungs_skipped']} rungs skipped)")
+
+    for name, result in best.items():
+        if not np.isfinite(result['rmse']):
+            print(f"✗ {name}: every configuration failed cross-validation; not saved")
+    path = save_best_params(best)
+    print(f"\n✓ Best configurations saved: {path}")
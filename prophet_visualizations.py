@@ -6,25 +6,25 @@ Complete graphs and charts for all parameters
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
-from prophet import Prophet
-
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from prophet_cache import fit_prophet_cached, print_cache_report
+from prophet_tuning import best_prophet_params
+from data_views import ColumnStore
+from derived_channels import DERIVE_DEW_POINT, derive_dew_point
+from chart_render import chart_spec, render_charts
+from stage_profile import stage
 
 print("="*80)
 print("CREATING PROPHET MODEL VISUALIZATIONS")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.sort_values('DateTime')
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.sort_values('DateTime')
 
 temp_col = 'Temperature (°C)'
 humidity_col = 'Humidity (%)'
@@ -33,8 +33,11 @@ dew_col = 'Dew Point (°C)'
 
 # Train-test split
 train_size = int(len(df) * 0.8)
-train_data = df[:train_size]
-test_data = df[train_size:]
+store = ColumnStore.from_frame(df)
+train_data, test_data = store.split(train_size)
+
+# Charts are recorded as specs and rendered together at the end
+charts = []
 
 print("\n[STEP 1] Creating model comparison plots...")
 
@@ -42,20 +45,17 @@ print("\n[STEP 1] Creating model comparison plots...")
 # TEMPERATURE - PROPHET FORECAST
 # ============================================================================
 print("\n  Training Temperature model...")
-temp_train = train_data[['DateTime', temp_col]].copy()
-temp_train.columns = ['ds', 'y']
-temp_test = test_data[['DateTime', temp_col]].copy()
-temp_test.columns = ['ds', 'y']
-
-temp_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                     yearly_seasonality=False, changepoint_prior_scale=0.5)
-temp_model.fit(temp_train)
-temp_forecast = temp_model.predict(temp_test[['ds']])
-
-fig, ax = plt.subplots(figsize=(16, 6))
-ax.plot(train_data['DateTime'], train_data[temp_col], 
+temp_train = train_data.prophet_frame(temp_col)
+
+with stage('fit', 'Prophet Temperature'):
+    temp_model = fit_prophet_cached(temp_train, **best_prophet_params('Temperature'))
+with stage('predict', 'Prophet Temperature'):
+    temp_forecast = temp_model.predict(test_data.prophet_frame())
+
+spec, ax = chart_spec('prophet_temperature_forecast.png', figsize=(16, 6), template='parameter')
+ax.plot(train_data.times, train_data.values(temp_col), 
        label='Training Data', color='#2E86AB', linewidth=2.5, alpha=0.8)
-ax.plot(test_data['DateTime'], test_data[temp_col], 
+ax.plot(test_data.times, test_data.values(temp_col), 
        label='Actual Test Data', color='#A23B72', linewidth=2.5, marker='o', markersize=4)
 ax.plot(temp_forecast['ds'], temp_forecast['yhat'], 
        label='Prophet Prediction', color='#F18F01', linewidth=2.5, linestyle='--')
@@ -66,29 +66,23 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Temperature (°C)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=11, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('prophet_temperature_forecast.png', dpi=300, bbox_inches='tight')
-print("  ✓ Temperature forecast saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # HUMIDITY - PROPHET FORECAST
 # ============================================================================
 print("  Training Humidity model...")
-hum_train = train_data[['DateTime', humidity_col]].copy()
-hum_train.columns = ['ds', 'y']
-hum_test = test_data[['DateTime', humidity_col]].copy()
-hum_test.columns = ['ds', 'y']
-
-hum_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                    yearly_seasonality=False, changepoint_prior_scale=0.5)
-hum_model.fit(hum_train)
-hum_forecast = hum_model.predict(hum_test[['ds']])
-
-fig, ax = plt.subplots(figsize=(16, 6))
-ax.plot(train_data['DateTime'], train_data[humidity_col], 
+hum_train = train_data.prophet_frame(humidity_col)
+
+with stage('fit', 'Prophet Humidity'):
+    hum_model = fit_prophet_cached(hum_train, **best_prophet_params('Humidity'))
+with stage('predict', 'Prophet Humidity'):
+    hum_forecast = hum_model.predict(test_data.prophet_frame())
+
+spec, ax = chart_spec('prophet_humidity_forecast.png', figsize=(16, 6), template='parameter')
+ax.plot(train_data.times, train_data.values(humidity_col), 
        label='Training Data', color='#2E86AB', linewidth=2.5, alpha=0.8)
-ax.plot(test_data['DateTime'], test_data[humidity_col], 
+ax.plot(test_data.times, test_data.values(humidity_col), 
        label='Actual Test Data', color='#A23B72', linewidth=2.5, marker='o', markersize=4)
 ax.plot(hum_forecast['ds'], hum_forecast['yhat'], 
        label='Prophet Prediction', color='#F18F01', linewidth=2.5, linestyle='--')
@@ -99,29 +93,23 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Humidity (%)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=11, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('prophet_humidity_forecast.png', dpi=300, bbox_inches='tight')
-print("  ✓ Humidity forecast saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # PRESSURE - PROPHET FORECAST
 # ============================================================================
 print("  Training Pressure model...")
-press_train = train_data[['DateTime', pressure_col]].copy()
-press_train.columns = ['ds', 'y']
-press_test = test_data[['DateTime', pressure_col]].copy()
-press_test.columns = ['ds', 'y']
-
-press_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                      yearly_seasonality=False, changepoint_prior_scale=0.3)
-press_model.fit(press_train)
-press_forecast = press_model.predict(press_test[['ds']])
-
-fig, ax = plt.subplots(figsize=(16, 6))
-ax.plot(train_data['DateTime'], train_data[pressure_col], 
+press_train = train_data.prophet_frame(pressure_col)
+
+with stage('fit', 'Prophet Pressure'):
+    press_model = fit_prophet_cached(press_train, **best_prophet_params('Pressure'))
+with stage('predict', 'Prophet Pressure'):
+    press_forecast = press_model.predict(test_data.prophet_frame())
+
+spec, ax = chart_spec('prophet_pressure_forecast.png', figsize=(16, 6), template='parameter')
+ax.plot(train_data.times, train_data.values(pressure_col), 
        label='Training Data', color='#2E86AB', linewidth=2.5, alpha=0.8)
-ax.plot(test_data['DateTime'], test_data[pressure_col], 
+ax.plot(test_data.times, test_data.values(pressure_col), 
        label='Actual Test Data', color='#A23B72', linewidth=2.5, marker='o', markersize=4)
 ax.plot(press_forecast['ds'], press_forecast['yhat'], 
        label='Prophet Prediction', color='#F18F01', linewidth=2.5, linestyle='--')
@@ -132,29 +120,33 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Pressure (hPa)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=11, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('prophet_pressure_forecast.png', dpi=300, bbox_inches='tight')
-print("  ✓ Pressure forecast saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # DEW POINT - PROPHET FORECAST
 # ============================================================================
 print("  Training Dew Point model...")
-dew_train = train_data[['DateTime', dew_col]].copy()
-dew_train.columns = ['ds', 'y']
-dew_test = test_data[['DateTime', dew_col]].copy()
-dew_test.columns = ['ds', 'y']
-
-dew_model = Prophet(daily_seasonality=True, weekly_seasonality=False, 
-                    yearly_seasonality=False, changepoint_prior_scale=0.5)
-dew_model.fit(dew_train)
-dew_forecast = dew_model.predict(dew_test[['ds']])
-
-fig, ax = plt.subplots(figsize=(16, 6))
-ax.plot(train_data['DateTime'], train_data[dew_col], 
+dew_train = train_data.prophet_frame(dew_col)
+
+if DERIVE_DEW_POINT:
+    # Derived from the temperature and humidity forecasts (Magnus formula)
+    dew_derived = derive_dew_point(
+        temp_forecast['yhat'].values, hum_forecast['yhat'].values,
+        (temp_forecast['yhat_lower'].values, temp_forecast['yhat_upper'].values),
+        (hum_forecast['yhat_lower'].values, hum_forecast['yhat_upper'].values))
+    dew_forecast = pd.DataFrame({'ds': temp_forecast['ds'].values, 'yhat': dew_derived['mean'].values,
+                                 'yhat_lower': dew_derived['lower'].values,
+                                 'yhat_upper': dew_derived['upper'].values})
+else:
+    with stage('fit', 'Prophet Dew Point'):
+        dew_model = fit_prophet_cached(dew_train, **best_prophet_params('Dew Point'))
+    with stage('predict', 'Prophet Dew Point'):
+        dew_forecast = dew_model.predict(test_data.prophet_frame())
+
+spec, ax = chart_spec('prophet_dewpoint_forecast.png', figsize=(16, 6), template='parameter')
+ax.plot(train_data.times, train_data.values(dew_col), 
        label='Training Data', color='#2E86AB', linewidth=2.5, alpha=0.8)
-ax.plot(test_data['DateTime'], test_data[dew_col], 
+ax.plot(test_data.times, test_data.values(dew_col), 
        label='Actual Test Data', color='#A23B72', linewidth=2.5, marker='o', markersize=4)
 ax.plot(dew_forecast['ds'], dew_forecast['yhat'], 
        label='Prophet Prediction', color='#F18F01', linewidth=2.5, linestyle='--')
@@ -165,22 +157,19 @@ ax.set_xlabel('Time', fontsize=14, fontweight='bold')
 ax.set_ylabel('Dew Point (°C)', fontsize=14, fontweight='bold')
 ax.legend(loc='best', fontsize=11, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('prophet_dewpoint_forecast.png', dpi=300, bbox_inches='tight')
-print("  ✓ Dew Point forecast saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # COMBINED PLOT - ALL PARAMETERS
 # ============================================================================
 print("\n[STEP 2] Creating combined visualization...")
 
-fig, axes = plt.subplots(4, 1, figsize=(16, 16))
+spec, axes = chart_spec('prophet_all_parameters_combined.png', 4, 1, figsize=(16, 16))
 
 # Temperature
-axes[0].plot(train_data['DateTime'], train_data[temp_col], 
+axes[0].plot(train_data.times, train_data.values(temp_col), 
             label='Training', color='#2E86AB', linewidth=2, alpha=0.7)
-axes[0].plot(test_data['DateTime'], test_data[temp_col], 
+axes[0].plot(test_data.times, test_data.values(temp_col), 
             label='Actual', color='#A23B72', linewidth=2, marker='o', markersize=3)
 axes[0].plot(temp_forecast['ds'], temp_forecast['yhat'], 
             label='Prophet Forecast', color='#F18F01', linewidth=2, linestyle='--')
@@ -192,9 +181,9 @@ axes[0].legend(loc='best', fontsize=10)
 axes[0].grid(True, alpha=0.3)
 
 # Humidity
-axes[1].plot(train_data['DateTime'], train_data[humidity_col], 
+axes[1].plot(train_data.times, train_data.values(humidity_col), 
             label='Training', color='#2E86AB', linewidth=2, alpha=0.7)
-axes[1].plot(test_data['DateTime'], test_data[humidity_col], 
+axes[1].plot(test_data.times, test_data.values(humidity_col), 
             label='Actual', color='#A23B72', linewidth=2, marker='o', markersize=3)
 axes[1].plot(hum_forecast['ds'], hum_forecast['yhat'], 
             label='Prophet Forecast', color='#F18F01', linewidth=2, linestyle='--')
@@ -206,9 +195,9 @@ axes[1].legend(loc='best', fontsize=10)
 axes[1].grid(True, alpha=0.3)
 
 # Pressure
-axes[2].plot(train_data['DateTime'], train_data[pressure_col], 
+axes[2].plot(train_data.times, train_data.values(pressure_col), 
             label='Training', color='#2E86AB', linewidth=2, alpha=0.7)
-axes[2].plot(test_data['DateTime'], test_data[pressure_col], 
+axes[2].plot(test_data.times, test_data.values(pressure_col), 
             label='Actual', color='#A23B72', linewidth=2, marker='o', markersize=3)
 axes[2].plot(press_forecast['ds'], press_forecast['yhat'], 
             label='Prophet Forecast', color='#F18F01', linewidth=2, linestyle='--')
@@ -220,9 +209,9 @@ axes[2].legend(loc='best', fontsize=10)
 axes[2].grid(True, alpha=0.3)
 
 # Dew Point
-axes[3].plot(train_data['DateTime'], train_data[dew_col], 
+axes[3].plot(train_data.times, train_data.values(dew_col), 
             label='Training', color='#2E86AB', linewidth=2, alpha=0.7)
-axes[3].plot(test_data['DateTime'], test_data[dew_col], 
+axes[3].plot(test_data.times, test_data.values(dew_col), 
             label='Actual', color='#A23B72', linewidth=2, marker='o', markersize=3)
 axes[3].plot(dew_forecast['ds'], dew_forecast['yhat'], 
             label='Prophet Forecast', color='#F18F01', linewidth=2, linestyle='--')
@@ -234,21 +223,19 @@ axes[3].set_xlabel('Time', fontsize=12, fontweight='bold')
 axes[3].legend(loc='best', fontsize=10)
 axes[3].grid(True, alpha=0.3)
 
-plt.suptitle('Prophet Model - All Parameters Forecast', fontsize=18, fontweight='bold', y=0.995)
-plt.tight_layout()
-plt.savefig('prophet_all_parameters_combined.png', dpi=300, bbox_inches='tight')
-print("  ✓ Combined forecast saved")
-plt.close()
+spec.suptitle('Prophet Model - All Parameters Forecast', fontsize=18, fontweight='bold', y=0.995)
+charts.append(spec)
 
 # ============================================================================
 # PERFORMANCE BAR CHART
 # ============================================================================
 print("\n[STEP 3] Creating performance comparison chart...")
 
-perf_df = pd.read_excel('prophet_model_performance.xlsx')
+with stage('load', 'prophet_model_performance.xlsx'):
+    perf_df = pd.read_excel('prophet_model_performance.xlsx')
 
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-fig.suptitle('Prophet Model - Performance Metrics', fontsize=16, fontweight='bold')
+spec, axes = chart_spec('prophet_performance_metrics.png', 2, 2, figsize=(14, 10))
+spec.suptitle('Prophet Model - Performance Metrics', fontsize=16, fontweight='bold')
 
 metrics = ['RMSE', 'MAE', 'MAPE', 'R²']
 colors = ['#FF6B6B', '#4ECDC4', '#95E1D3', '#45B7D1']
@@ -258,23 +245,21 @@ for idx, metric in enumerate(metrics):
     params = perf_df['Parameter']
     values = perf_df[metric]
     
-    bars = ax.bar(params, values, color=colors[idx], edgecolor='black', linewidth=2, alpha=0.8)
+    ax.bar(params, values, color=colors[idx], edgecolor='black', linewidth=2, alpha=0.8)
     ax.set_title(f'{metric}', fontsize=13, fontweight='bold')
     ax.set_ylabel(metric, fontsize=11, fontweight='bold')
     ax.grid(True, alpha=0.3, axis='y')
     ax.tick_params(axis='x', rotation=45)
     
     # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-               f'{height:.4f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax.bar_labels('{:.4f}', fontsize=10, fontweight='bold')
+
+charts.append(spec)
 
-plt.tight_layout()
-plt.savefig('prophet_performance_metrics.png', dpi=300, bbox_inches='tight')
-print("  ✓ Performance metrics chart saved")
-plt.close()
+print("\n[STEP 4] Rendering charts...")
+render_charts(charts)
 
+print_cache_report()
 print("\n✓ All Prophet visualizations completed!")
 print("\nGenerated files:")
 print("  1. prophet_temperature_forecast.png")
@@ -1,9 +1,17 @@
 """
 Master Script - Run Complete Weather Analysis
 """
+import datetime
+import os
 import subprocess
 import sys
 
+from stage_profile import PROFILE_DIR, RUN_ENV, print_run
+
+# Every script of this pipeline run writes its stage profile into the same run directory
+run = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+os.environ[RUN_ENV] = run
+
 print("="*80)
 print("RUNNING COMPLETE IOT WEATHER ANALYSIS")
 print("="*80)
@@ -36,6 +44,11 @@ for script, description in scripts:
 print("\n" + "="*80)
 print("ANALYSIS COMPLETE!")
 print("="*80)
+
+if os.path.isdir(os.path.join(PROFILE_DIR, run)):
+    print(f"\nStage profile ({PROFILE_DIR}/{run}/):")
+    print_run(run, top=15)
+
 print("\nGenerated Files:")
 print("  1. iot_sensor_readings.xlsx - Original sensor data")
 print("  2. model_performance_metrics.xlsx - Model performance comparison")
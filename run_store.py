@@ -0,0 +1,249 @@
+"""
+Run History Store - Model metrics from every run kept in one SQLite database
+Each training script records its metrics table under a new run; history is
+queried across runs, stations, parameters and models instead of workbooks
+"""
+
+import argparse
+import datetime
+import os
+import sqlite3
+
+from weather_data import DATA_FILE, DEFAULT_STATION, STATION_COL
+
+RUN_DB = 'run_history.db'
+
+# Metric table column -> store column, as written by the training scripts and backtest
+METRIC_COLUMNS = {
+    'RMSE': 'rmse',
+    'MAE': 'mae',
+    'MAPE': 'mape',
+    'R²': 'r2',
+    'Fit Time (s)': 'fit_seconds'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    started TEXT NOT NULL,
+    data_file TEXT,
+    rows INTEGER
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    station TEXT NOT NULL,
+    parameter TEXT NOT NULL,
+    model TEXT NOT NULL,
+    cutoff TEXT,
+    rmse REAL,
+    mae REAL,
+    mape REAL,
+    r2 REAL,
+    fit_seconds REAL
+);
+CREATE INDEX IF NOT EXISTS runs_script ON runs(script, started);
+CREATE INDEX IF NOT EXISTS metrics_run ON metrics(run_id);
+CREATE INDEX IF NOT EXISTS metrics_parameter_model ON metrics(parameter, model);
+CREATE INDEX IF NOT EXISTS metrics_station_parameter ON metrics(station, parameter);
+"""
+
+INSERT_METRICS = ('INSERT INTO metrics (run_id, station, parameter, model, cutoff, rmse, mae, mape, r2, fit_seconds) '
+                  'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)')
+
+
+class RunStore:
+    """
+    SQLite-backed history of model metrics
+
+    Writes go through executemany inside one transaction per call, with WAL
+    journaling, so a fleet backtest can record hundreds of thousands of rows
+    in a few seconds.
+    """
+
+    def __init__(self, path=RUN_DB):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def start_run(self, script, data_file=None, rows=None):
+        """
+        Open a new run
+        script: Name of the script or job producing the metrics
+        data_file: Sensor file the models were trained on
+        rows: Number of readings used
+        Returns: run_id
+        """
+        started = datetime.datetime.now().isoformat(timespec='seconds')
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (script, started, data_file, rows) VALUES (?, ?, ?, ?)',
+                (script, started, data_file, rows))
+        return cursor.lastrowid
+
+    def record_metrics(self, run_id, results, station=DEFAULT_STATION):
+        """
+        Bulk-insert a metrics table
+        run_id: Run from start_run
+        results: DataFrame or list of dicts with 'Parameter', 'Model' and any of the
+                 METRIC_COLUMNS; optional 'Station' and 'Cutoff' columns
+        station: Station for rows without a 'Station' column
+        Returns: Number of rows written
+        """
+        import numpy as np
+        import pandas as pd
+
+        results = pd.DataFrame(results)
+        n = len(results)
+        if n == 0:
+            return 0
+
+        def text(column, default=None):
+            if column not in results.columns:
+                return np.full(n, default, dtype=object)
+            values = results[column].astype(str).to_numpy(dtype=object)
+            values[results[column].isna().to_numpy()] = None
+            return values
+
+        def number(column):
+            if column not in results.columns:
+                return np.full(n, None, dtype=object)
+            values = pd.to_numeric(results[column], errors='coerce').to_numpy(dtype=float).astype(object)
+            values[pd.isna(values)] = None
+            return values
+
+        columns = [np.full(n, run_id, dtype=object), text(STATION_COL, station), text('Parameter'),
+                   text('Model'), text('Cutoff')] + [number(column) for column in METRIC_COLUMNS]
+        with self.connection:
+            self.connection.executemany(INSERT_METRICS, zip(*columns))
+        return n
+
+    def run_rows(self, script=None):
+        """
+        Runs recorded so far, newest first, without going through pandas
+        script: Only runs of this script
+        Returns: (column names, list of row tuples) with each run's number of metric rows
+        """
+        sql = ('SELECT r.run_id, r.script, r.started, r.data_file, r.rows, COUNT(m.run_id) AS metric_rows '
+               'FROM runs r LEFT JOIN metrics m ON m.run_id = r.run_id')
+        params = []
+        if script is not None:
+            sql += ' WHERE r.script = ?'
+            params.append(script)
+        sql += ' GROUP BY r.run_id ORDER BY r.run_id DESC'
+        cursor = self.connection.execute(sql, params)
+        return [column[0] for column in cursor.description], cursor.fetchall()
+
+    def runs(self, script=None):
+        """
+        Runs recorded so far, newest first
+        script: Only runs of this script
+        Returns: DataFrame with one row per run and its number of metric rows
+        """
+        import pandas as pd
+
+        columns, rows = self.run_rows(script)
+        return pd.DataFrame(rows, columns=columns)
+
+    def query(self, run_id=None, script=None, station=None, parameter=None, model=None):
+        """
+        Metrics across runs, filtered on the indexed columns
+        Returns: DataFrame with the run's script and start time on every row
+        """
+        import pandas as pd
+
+        filters = [('m.run_id', run_id), ('r.script', script), ('m.station', station),
+                   ('m.parameter', parameter), ('m.model', model)]
+        where = [f'{column} = ?' for column, value in filters if value is not None]
+        params = [value for _, value in filters if value is not None]
+        sql = ('SELECT m.run_id, r.script, r.started, m.station, m.parameter, m.model, m.cutoff, '
+               'm.rmse, m.mae, m.mape, m.r2, m.fit_seconds '
+               'FROM metrics m JOIN runs r ON r.run_id = m.run_id')
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY m.run_id, m.parameter, m.model'
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    def best_models(self, metric='rmse', latest=True):
+        """
+        Lowest-error model per station and parameter
+        metric: Store column to rank by (rmse, mae or mape)
+        latest: Only consider the most recent run of each script
+        Returns: DataFrame with one row per station and parameter
+        """
+        import pandas as pd
+
+        if metric not in ('rmse', 'mae', 'mape'):
+            raise ValueError(f"Unknown metric '{metric}'")
+        sql = ('SELECT m.station, m.parameter, m.model, r.script, m.run_id, '
+               f'AVG(m.{metric}) AS {metric}, AVG(m.fit_seconds) AS fit_seconds '
+               'FROM metrics m JOIN runs r ON r.run_id = m.run_id')
+        if latest:
+            sql += ' WHERE m.run_id IN (SELECT MAX(run_id) FROM runs GROUP BY script)'
+        sql += f' GROUP BY m.run_id, m.station, m.parameter, m.model HAVING {metric} IS NOT NULL'
+        table = pd.read_sql_query(sql, self.connection)
+        best = table.loc[table.groupby(['station', 'parameter'])[metric].idxmin()]
+        return best.sort_values(['station', 'parameter']).reset_index(drop=True)
+
+
+def record_run(script, results, data_file=DATA_FILE, rows=None, path=RUN_DB):
+    """
+    Record one script's metrics table as a new run
+    script: Name of the producing script
+    results: Metrics table as written to the script's performance workbook
+    Returns: run_id
+    """
+    with RunStore(path) as store:
+        run_id = store.start_run(os.path.basename(script), data_file, rows)
+        store.record_metrics(run_id, results)
+    return run_id
+
+
+def print_rows(columns, rows):
+    """Print query rows as an aligned text table"""
+    cells = [[str(column) for column in columns]] + [['' if v is None else str(v) for v in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(columns))]
+    for row in cells:
+        print(' '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Query the model run history')
+    parser.add_argument('--db', default=RUN_DB)
+    parser.add_argument('--runs', action='store_true', help='List recorded runs')
+    parser.add_argument('--parameter', help='History of one parameter (e.g. Temperature)')
+    parser.add_argument('--model', help='History of one model (e.g. ARIMA)')
+    parser.add_argument('--station', help='History of one station')
+    parser.add_argument('--metric', default='rmse', choices=['rmse', 'mae', 'mape'])
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"✗ No run history yet: {args.db}")
+        return
+
+    with RunStore(args.db) as store:
+        if args.runs:
+            print_rows(*store.run_rows())
+        elif args.parameter or args.model or args.station:
+            print(store.query(station=args.station, parameter=args.parameter,
+                              model=args.model).to_string(index=False))
+        else:
+            print("="*80)
+            print(f"BEST MODELS BY {args.metric.upper()} (LATEST RUN OF EACH SCRIPT)")
+            print("="*80)
+            print(store.best_models(args.metric).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
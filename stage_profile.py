@@ -0,0 +1,265 @@
+"""
+Stage Profiling - Wall time, CPU time and peak memory per pipeline stage
+Scripts wrap their load, fit, predict, render and export steps in stage();
+each process writes a JSON and CSV profile for its run on exit, and
+profiles of two runs can be compared stage by stage
+"""
+
+import argparse
+import atexit
+import csv
+import datetime
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+PROFILE_DIR = 'profiles'
+
+# WEATHER_PROFILE=0 disables profiling; WEATHER_PROFILE_MEMORY=1 adds tracemalloc peaks.
+# Memory tracing is opt-in: its allocation hooks made chart rendering about 3x slower
+PROFILE_ENABLED = os.environ.get('WEATHER_PROFILE', '1') != '0'
+PROFILE_MEMORY = os.environ.get('WEATHER_PROFILE_MEMORY', '0') == '1'
+
+# run_all.py sets this so every script of one pipeline run writes into the same run directory
+RUN_ENV = 'WEATHER_PROFILE_RUN'
+
+RECORD_FIELDS = ['script', 'kind', 'label', 'parent', 'start_s', 'wall_s', 'cpu_s', 'peak_mb', 'status']
+
+_records = []
+_stack = []
+_origin = time.perf_counter()
+_started = datetime.datetime.now()
+_hooked = False
+
+
+def _cpu_time():
+    """User + system CPU seconds of this process and its reaped children (pool workers)"""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _after_fork():
+    """Forked pool workers stop tracing and never write a profile; the parent reports their CPU time"""
+    global PROFILE_ENABLED, PROFILE_MEMORY
+    PROFILE_ENABLED = PROFILE_MEMORY = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _stack.clear()
+    _records.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def run_id():
+    """Identifier of the current pipeline run (shared across run_all.py subprocesses)"""
+    return os.environ.get(RUN_ENV) or _started.strftime('%Y%m%d-%H%M%S')
+
+
+def script_name():
+    """Name of the running script, without extension"""
+    return os.path.splitext(os.path.basename(sys.argv[0] or 'interactive'))[0] or 'interactive'
+
+
+class stage:
+    """
+    Time one pipeline step as a context manager or decorator
+
+        with stage('fit', 'ARIMA Temperature') as timed:
+            model = ARIMA(...).fit()
+        fit_time = timed.wall
+
+        @stage('render')
+        def render_charts(...): ...
+
+    kind: Step category (load, fit, predict, render, export)
+    label: What the step works on (defaults to the decorated function's name)
+    Nested stages record their own numbers; an outer stage includes its children.
+    """
+
+    def __init__(self, kind, label=None):
+        self.kind = kind
+        self.label = label
+        self.wall = None
+        self.cpu = None
+        self.peak_mb = None
+
+    def __call__(self, func):
+        kind, label = self.kind, self.label or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(kind, label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        global _hooked
+        if PROFILE_ENABLED and not _hooked:
+            atexit.register(write_profile)
+            _hooked = True
+        if PROFILE_MEMORY:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if _stack:
+                # reset_peak() below would lose the enclosing stage's peak so far
+                _stack[-1]._peak = max(_stack[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._base, self._peak = current, current
+        _stack.append(self)
+        self._start = time.perf_counter()
+        self._cpu = _cpu_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._start
+        self.cpu = _cpu_time() - self._cpu
+        _stack.pop()
+        if PROFILE_MEMORY:
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            self.peak_mb = (peak - self._base) / 2**20
+            if _stack:
+                _stack[-1]._peak = max(_stack[-1]._peak, peak)
+        if not PROFILE_ENABLED:
+            return False
+        _records.append({
+            'script': script_name(),
+            'kind': self.kind,
+            'label': self.label or '',
+            'parent': '/'.join(s.label or s.kind for s in _stack),
+            'start_s': round(self._start - _origin, 4),
+            'wall_s': round(self.wall, 4),
+            'cpu_s': round(self.cpu, 4),
+            'peak_mb': None if self.peak_mb is None else round(self.peak_mb, 3),
+            'status': 'ok' if exc_type is None else 'error'
+        })
+        return False
+
+
+def records():
+    """Stages recorded so far in this process, in completion order"""
+    return list(_records)
+
+
+def write_profile(directory=PROFILE_DIR):
+    """
+    Write this process's stages to <directory>/<run id>/<script>.json and .csv
+    Returns: Path of the JSON profile, or None when nothing was recorded
+    """
+    if not _records:
+        return None
+    run_dir = os.path.join(directory, run_id())
+    os.makedirs(run_dir, exist_ok=True)
+    base = os.path.join(run_dir, script_name())
+    profile = {
+        'run': run_id(),
+        'script': script_name(),
+        'started': _started.isoformat(timespec='seconds'),
+        'total_s': round(time.perf_counter() - _origin, 4),
+        'memory_traced': PROFILE_MEMORY,
+        'stages': _records
+    }
+    with open(base + '.json', 'w') as f:
+        json.dump(profile, f, indent=2)
+    with open(base + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+        writer.writeheader()
+        writer.writerows(_records)
+    return base + '.json'
+
+
+def load_run(run, directory=PROFILE_DIR):
+    """
+    All stage records of one run
+    run: Run id or path of a run directory
+    Returns: list of record dicts across every script of the run
+    """
+    run_dir = run if os.path.isdir(run) else os.path.join(directory, run)
+    rows = []
+    for name in sorted(os.listdir(run_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(run_dir, name)) as f:
+                rows.extend(json.load(f)['stages'])
+    return rows
+
+
+def summarize(rows):
+    """
+    Total per (script, kind, label) stage
+    Returns: dict key -> {'calls', 'wall_s', 'cpu_s', 'peak_mb'}
+    """
+    summary = {}
+    for row in rows:
+        key = (row['script'], row['kind'], row['label'])
+        entry = summary.setdefault(key, {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'peak_mb': None})
+        entry['calls'] += 1
+        entry['wall_s'] += row['wall_s']
+        entry['cpu_s'] += row['cpu_s']
+        if row['peak_mb'] is not None:
+            entry['peak_mb'] = max(entry['peak_mb'] or 0.0, row['peak_mb'])
+    return summary
+
+
+def compare_runs(base, new, directory=PROFILE_DIR):
+    """
+    Stage-by-stage comparison of two runs
+    Returns: list of (script, kind, label, base wall, new wall, ratio) sorted by the largest change
+    """
+    before = summarize(load_run(base, directory))
+    after = summarize(load_run(new, directory))
+    rows = []
+    for key in sorted(set(before) | set(after)):
+        old = before.get(key, {}).get('wall_s')
+        cur = after.get(key, {}).get('wall_s')
+        ratio = cur / old if old and cur is not None else None
+        rows.append(key + (old, cur, ratio))
+    return sorted(rows, key=lambda row: -abs((row[4] or 0) - (row[3] or 0)))
+
+
+def _fmt(value, spec):
+    return '-' if value is None else format(value, spec)
+
+
+def print_run(run, directory=PROFILE_DIR, top=None):
+    """Print a run's stages grouped by script and step, slowest first"""
+    summary = summarize(load_run(run, directory))
+    print(f"{'Script':<34} {'Kind':<8} {'Stage':<34} {'Calls':>5} {'Wall s':>9} {'CPU s':>9} {'Peak MB':>9}")
+    rows = sorted(summary.items(), key=lambda item: -item[1]['wall_s'])
+    for (script, kind, label), entry in rows[:top]:
+        print(f"{script:<34} {kind:<8} {label[:34]:<34} {entry['calls']:>5} {entry['wall_s']:>9.3f} "
+              f"{entry['cpu_s']:>9.3f} {_fmt(entry['peak_mb'], '9.1f'):>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Show or compare per-stage pipeline profiles')
+    parser.add_argument('runs', nargs='*', help='One run id to show, or two to compare (default: latest run)')
+    parser.add_argument('--dir', default=PROFILE_DIR)
+    parser.add_argument('--top', type=int, default=None, help='Only the slowest N stages')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dir) or not os.listdir(args.dir):
+        print(f"✗ No profiles yet in {args.dir}/")
+        return
+    runs = args.runs or [sorted(os.listdir(args.dir))[-1]]
+
+    print("="*80)
+    if len(runs) == 1:
+        print(f"STAGE PROFILE - RUN {runs[0]}")
+        print("="*80)
+        print_run(runs[0], args.dir, args.top)
+    else:
+        print(f"STAGE PROFILE COMPARISON - {runs[0]} → {runs[1]}")
+        print("="*80)
+        print(f"{'Script':<34} {'Kind':<8} {'Stage':<34} {'Before s':>9} {'After s':>9} {'Ratio':>7}")
+        for script, kind, label, old, cur, ratio in compare_runs(runs[0], runs[1], args.dir)[:args.top]:
+            print(f"{script:<34} {kind:<8} {label[:34]:<34} {_fmt(old, '9.3f'):>9} {_fmt(cur, '9.3f'):>9} "
+                  f"{_fmt(ratio, '7.2f'):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,441 @@
+"""
+Streaming Statistics - Mergeable covariance, correlation and summary accumulators
+Welford/Chan updates and KLL quantile sketches so statistics never need the raw data in memory
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from weather_data import PARAMETER_COLUMNS, iter_sensor_chunks, station_of
+
+
+class StreamingCovariance:
+    """
+    Running count, mean vector and co-moment matrix over a fixed set of columns
+
+    Batches are folded in with Chan's parallel update, so accumulators built on
+    different partitions or worker processes can be merged exactly. Rows with a
+    missing value in any column are skipped.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = list(columns) if columns is not None else list(PARAMETER_COLUMNS)
+        k = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def _combine(self, n_b, mean_b, comoment_b):
+        if n_b == 0:
+            return self
+        if self.n == 0:
+            self.n, self.mean, self.comoment = n_b, mean_b.copy(), comoment_b.copy()
+            return self
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self.comoment = self.comoment + comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.n = n
+        return self
+
+    def update(self, batch):
+        """
+        Fold a batch of rows into the accumulator
+        batch: DataFrame containing self.columns, or a 2-D array in column order
+        """
+        if isinstance(batch, pd.DataFrame):
+            values = batch[self.columns].to_numpy(dtype=float)
+        else:
+            values = np.asarray(batch, dtype=float).reshape(-1, len(self.columns))
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) == 0:
+            return self
+        mean_b = values.mean(axis=0)
+        centered = values - mean_b
+        return self._combine(len(values), mean_b, centered.T @ centered)
+
+    def merge(self, other):
+        """Merge another accumulator over the same columns into this one"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge accumulators over different columns")
+        return self._combine(other.n, other.mean, other.comoment)
+
+    def copy(self):
+        clone = StreamingCovariance(self.columns)
+        clone.n, clone.mean, clone.comoment = self.n, self.mean.copy(), self.comoment.copy()
+        return clone
+
+    def covariance(self, ddof=1):
+        """Covariance matrix as a labelled DataFrame"""
+        cov = self.comoment / (self.n - ddof) if self.n > ddof else np.full_like(self.comoment, np.nan)
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self):
+        """Pearson correlation matrix as a labelled DataFrame (same as DataFrame.corr())"""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.outer(std, std)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def merge_all(accumulators):
+    """
+    Merge accumulators from several partitions or workers into a new one
+    Returns: StreamingCovariance over the union of their rows
+    """
+    accumulators = list(accumulators)
+    total = StreamingCovariance(accumulators[0].columns)
+    for acc in accumulators:
+        total.merge(acc)
+    return total
+
+
+class PeriodCorrelation:
+    """
+    One StreamingCovariance per time period (e.g. per hour or per day)
+
+    Only the per-period accumulators are kept, never the rows, so memory
+    grows with the number of periods rather than the number of readings.
+    max_periods bounds memory further by discarding the oldest periods.
+    """
+
+    def __init__(self, columns=None, freq='1h', time_col='DateTime', max_periods=None):
+        self.columns = list(columns) if columns is not None else list(PARAMETER_COLUMNS)
+        self.freq = freq
+        self.time_col = time_col
+        self.max_periods = max_periods
+        self.periods = OrderedDict()
+
+    def update(self, batch):
+        """Fold a DataFrame batch (with a time column or DatetimeIndex) into its periods"""
+        if self.time_col in batch.columns:
+            times = pd.DatetimeIndex(batch[self.time_col])
+        else:
+            times = pd.DatetimeIndex(batch.index)
+        codes, keys = pd.factorize(times.floor(self.freq))
+        values = batch[self.columns].to_numpy(dtype=float)
+
+        for code, key in enumerate(keys):
+            if key not in self.periods:
+                self.periods[key] = StreamingCovariance(self.columns)
+            self.periods[key].update(values[codes == code])
+
+        self.periods = OrderedDict(sorted(self.periods.items()))
+        if self.max_periods is not None:
+            while len(self.periods) > self.max_periods:
+                self.periods.popitem(last=False)
+        return self
+
+    def merge(self, other):
+        """Merge another PeriodCorrelation (e.g. from another worker) period by period"""
+        for key, acc in other.periods.items():
+            if key in self.periods:
+                self.periods[key].merge(acc)
+            else:
+                self.periods[key] = acc.copy()
+        self.periods = OrderedDict(sorted(self.periods.items()))
+        return self
+
+    def total(self):
+        """Accumulator over every period that is still held"""
+        return merge_all(self.periods.values())
+
+    def period_correlations(self):
+        """
+        Correlation matrix for each period
+        Returns: dict of period start -> correlation DataFrame
+        """
+        return {key: acc.correlation() for key, acc in self.periods.items()}
+
+    def rolling_correlations(self, window):
+        """
+        Correlation over a rolling window of whole periods
+        window: Number of consecutive periods per window
+        Returns: dict of last period in the window -> correlation DataFrame
+        """
+        keys = list(self.periods)
+        results = {}
+        for end in range(window - 1, len(keys)):
+            acc = merge_all(self.periods[k] for k in keys[end - window + 1:end + 1])
+            results[keys[end]] = acc.correlation()
+        return results
+
+    def to_long_frame(self, rolling_window=None):
+        """
+        Flatten per-period (or rolling) correlations into one tidy DataFrame
+        Returns: DataFrame with Period, Parameter A, Parameter B, Correlation
+        """
+        matrices = self.rolling_correlations(rolling_window) if rolling_window else self.period_correlations()
+        rows = []
+        for key, corr in matrices.items():
+            for i, a in enumerate(self.columns):
+                for b in self.columns[i + 1:]:
+                    rows.append({'Period': key, 'Parameter A': a, 'Parameter B': b,
+                                 'Correlation': corr.loc[a, b]})
+        return pd.DataFrame(rows)
+
+
+def streaming_correlation(path, columns=None, chunksize=50000):
+    """
+    Correlation matrix of a sensor file computed in one chunked pass
+    Returns: correlation DataFrame
+    """
+    acc = StreamingCovariance(columns)
+    for chunk in iter_sensor_chunks(path, chunksize=chunksize):
+        acc.update(chunk)
+    return acc.correlation()
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty) over a stream of floats
+
+    Level h holds items of weight 2**h. When a level overflows it is sorted and
+    every other item (random offset) is promoted, so memory stays O(k) while the
+    rank error stays around 1.7/k. Sketches with the same k merge level by level.
+    """
+
+    def __init__(self, k=200, c=2.0 / 3.0, seed=None):
+        self.k = k
+        self.c = c
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.c ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # Odd item out stays behind so total weight is preserved
+                keep = items[:1] if len(items) % 2 else items[:0]
+                pairs = items[len(keep):]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """Add an array of values (NaNs are ignored)"""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        # Feed big batches in slices so level 0 never holds more than a few k items
+        step = max(self.k, 1) * 4
+        for start in range(0, len(values), step):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + step]])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Merge another sketch with the same k into this one"""
+        if other.k != self.k:
+            raise ValueError("Cannot merge KLL sketches with different k")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def copy(self):
+        clone = KLLSketch(self.k, self.c)
+        clone.levels = [items.copy() for items in self.levels]
+        clone.n = self.n
+        # Same coin sequence from here on, so the clone compacts exactly as the original would
+        clone._rng.bit_generator.state = self._rng.bit_generator.state
+        return clone
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s)
+        q: float or array of floats in [0, 1]
+        Returns: float or numpy array matching q
+        """
+        items = np.concatenate(self.levels)
+        if len(items) == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        weights = np.concatenate([np.full(len(lv), 2.0 ** h) for h, lv in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cum = items[order], np.cumsum(weights[order])
+        ranks = np.asarray(q, dtype=float) * cum[-1]
+        idx = np.minimum(np.searchsorted(cum, ranks, side='left'), len(items) - 1)
+        return items[idx]
+
+    def size(self):
+        """Number of items currently retained"""
+        return sum(len(items) for items in self.levels)
+
+
+class ColumnSummary:
+    """Exact count/mean/std/min/max (Welford) plus a KLL sketch for one column"""
+
+    def __init__(self, k=200, seed=None):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch(k=k, seed=seed)
+
+    def _combine(self, n_b, mean_b, m2_b, min_b, max_b):
+        if n_b == 0:
+            return self
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, min_b)
+        self.max = max(self.max, max_b)
+        return self
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        mean_b = values.mean()
+        self._combine(len(values), mean_b, ((values - mean_b) ** 2).sum(), values.min(), values.max())
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        self._combine(other.n, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def copy(self):
+        clone = ColumnSummary(k=self.sketch.k)
+        clone.n, clone.mean, clone.m2 = self.n, self.mean, self.m2
+        clone.min, clone.max = self.min, self.max
+        # The sketch copy carries the RNG state along with the retained items
+        clone.sketch = self.sketch.copy()
+        return clone
+
+    def describe(self, percentiles=(0.25, 0.5, 0.75)):
+        """Statistics in DataFrame.describe() order"""
+        std = math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+        stats = OrderedDict([('count', float(self.n)), ('mean', self.mean if self.n else np.nan),
+                             ('std', std), ('min', self.min if self.n else np.nan)])
+        for p, value in zip(percentiles, np.atleast_1d(self.sketch.quantile(list(percentiles)))):
+            stats[f'{p * 100:g}%'] = float(value)
+        stats['max'] = self.max if self.n else np.nan
+        return stats
+
+
+class StreamingSummary:
+    """
+    Out-of-core replacement for DataFrame.describe(), kept per station and parameter
+
+    count/mean/std/min/max are exact; quantiles come from mergeable KLL sketches.
+    Summaries built on different files or workers merge with merge().
+    """
+
+    def __init__(self, columns=None, k=200, seed=42):
+        self.columns = list(columns) if columns is not None else list(PARAMETER_COLUMNS)
+        self.k = k
+        self.seed = seed
+        self.stations = OrderedDict()
+
+    def _column_seed(self, position):
+        """Seed for one column's sketch, so columns do not share a compaction coin sequence"""
+        return None if self.seed is None else [self.seed, position]
+
+    def _station(self, station):
+        if station not in self.stations:
+            self.stations[station] = {col: ColumnSummary(k=self.k, seed=self._column_seed(i))
+                                      for i, col in enumerate(self.columns)}
+        return self.stations[station]
+
+    def update(self, chunk):
+        """Fold a DataFrame chunk into the per-station summaries"""
+        stations = station_of(chunk)
+        codes, names = pd.factorize(stations)
+        for code, station in enumerate(names):
+            rows = chunk[codes == code] if len(names) > 1 else chunk
+            summaries = self._station(station)
+            for col in self.columns:
+                if col in rows.columns:
+                    summaries[col].update(rows[col].to_numpy(dtype=float))
+        return self
+
+    def merge(self, other):
+        """Merge another StreamingSummary station by station"""
+        for station, summaries in other.stations.items():
+            mine = self._station(station)
+            for col, summary in summaries.items():
+                mine[col].merge(summary)
+        return self
+
+    def describe(self, station=None, percentiles=(0.25, 0.5, 0.75)):
+        """
+        Summary table in the layout of DataFrame.describe()
+        station: Station name, or None to combine every station
+        Returns: DataFrame with statistics as rows and parameters as columns
+        """
+        if station is not None:
+            summaries = self.stations[station]
+        else:
+            summaries = {}
+            for col in self.columns:
+                parts = [s[col] for s in self.stations.values()]
+                total = parts[0].copy() if parts else ColumnSummary(k=self.k)
+                for part in parts[1:]:
+                    total.merge(part)
+                summaries[col] = total
+        return pd.DataFrame({col: summaries[col].describe(percentiles) for col in self.columns})
+
+    def describe_stations(self, percentiles=(0.25, 0.5, 0.75)):
+        """
+        One describe() table per station stacked into a single DataFrame
+        Returns: DataFrame indexed by (station, statistic)
+        """
+        return pd.concat({station: self.describe(station, percentiles) for station in self.stations})
+
+
+def summarize_file(path, columns=None, chunksize=50000, k=200):
+    """
+    Summary statistics of a sensor file in one sequential chunked scan
+    Returns: StreamingSummary
+    """
+    summary = StreamingSummary(columns, k=k)
+    for chunk in iter_sensor_chunks(path, chunksize=chunksize):
+        summary.update(chunk)
+    return summary
+
+
+if __name__ == '__main__':
+    print("="*80)
+    print("STREAMING STATISTICS - iot_sensor_readings.xlsx")
+    print("="*80)
+
+    acc = StreamingCovariance()
+    hourly = PeriodCorrelation(freq='1h')
+    for chunk in iter_sensor_chunks(chunksize=100):
+        acc.update(chunk)
+        hourly.update(chunk)
+
+    print(f"\n✓ Rows accumulated: {acc.n}")
+    print("\nCorrelation matrix:")
+    print(acc.correlation().round(3))
+    summary = summarize_file('iot_sensor_readings.xlsx', chunksize=100)
+    print("\nSummary statistics (quantiles from KLL sketch):")
+    print(summary.describe().round(2))
+
+    print("\nHourly correlations (2-hour rolling window):")
+    print(hourly.to_long_frame(rolling_window=2).round({'Correlation': 3}).to_string(index=False))
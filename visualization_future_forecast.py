@@ -5,27 +5,32 @@ Visualization and Future Forecasting (2:15 PM to 6:15 PM)
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-import seaborn as sns
 import warnings
 warnings.filterwarnings('ignore')
 
 from statsmodels.tsa.arima.model import ARIMA
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 
-# Set style
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from auto_order import candidate_pool, select_orders, select_arima_order
+from derived_channels import DERIVE_DEW_POINT, magnus_dew_point
+from chart_render import chart_spec, render_charts
+from data_export import write_frame
+from data_views import ColumnStore
+from stage_profile import stage
+
+# Stepwise AIC order search (cached per series); False restores the fixed orders
+USE_AUTO_ORDER = True
 
 print("="*80)
 print("VISUALIZATION AND FUTURE FORECASTING")
 print("="*80)
 
 # Load data
-df = pd.read_excel('iot_sensor_readings.xlsx')
-df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
-df = df.set_index('DateTime')
-df = df.sort_index()
+with stage('load', 'iot_sensor_readings.xlsx'):
+    df = pd.read_excel('iot_sensor_readings.xlsx')
+    df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format='%d-%m-%Y %I:%M:%S %p')
+    df = df.set_index('DateTime')
+    df = df.sort_index()
 
 # Column names
 temp_col = 'Temperature (°C)'
@@ -33,27 +38,33 @@ humidity_col = 'Humidity (%)'
 pressure_col = 'Pressure (hPa)'
 dew_col = 'Dew Point (°C)'
 
-# Train-test split
-train_size = int(len(df) * 0.8)
-train_data = df[:train_size]
-test_data = df[train_size:]
+# Train-test split: views over one column store, so no parameter is copied
+store = ColumnStore.from_frame(df)
+train_size = int(len(store) * 0.8)
+train_data, test_data = store.split(train_size)
+
+# Charts are recorded as specs and rendered together at the end
+charts = []
 
 print("\n[STEP 1] Creating model comparison visualizations...")
 
 # ============================================================================
 # TEMPERATURE COMPARISON PLOT
 # ============================================================================
-temp_train = train_data[temp_col]
-temp_test = test_data[temp_col]
+temp_train = train_data.series(temp_col)
+temp_test = test_data.series(temp_col)
 
 # Train models
-arima_temp = ARIMA(temp_train, order=(2, 1, 2)).fit()
-sarima_temp = SARIMAX(temp_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)).fit(disp=False)
+with stage('fit', 'ARIMA/SARIMA Temperature'):
+    arima_order, sarima_order, sarima_seasonal_order = select_orders(temp_train, auto=USE_AUTO_ORDER)
+    arima_temp = ARIMA(temp_train, order=arima_order).fit()
+    sarima_temp = SARIMAX(temp_train, order=sarima_order, seasonal_order=sarima_seasonal_order).fit(disp=False)
 
-arima_temp_pred = arima_temp.forecast(steps=len(temp_test))
-sarima_temp_pred = sarima_temp.forecast(steps=len(temp_test))
+with stage('predict', 'ARIMA/SARIMA Temperature'):
+    arima_temp_pred = arima_temp.forecast(steps=len(temp_test))
+    sarima_temp_pred = sarima_temp.forecast(steps=len(temp_test))
 
-fig, ax = plt.subplots(figsize=(15, 6))
+spec, ax = chart_spec('temperature_model_comparison.png', figsize=(15, 6), template='comparison')
 ax.plot(train_data.index, temp_train, label='Training Data', color='#2E86AB', linewidth=2)
 ax.plot(test_data.index, temp_test, label='Actual Test Data', color='#A23B72', linewidth=2, marker='o', markersize=3)
 ax.plot(test_data.index, arima_temp_pred, label='ARIMA Prediction', color='#F18F01', linewidth=2, linestyle='--')
@@ -63,24 +74,24 @@ ax.set_xlabel('Time', fontsize=12, fontweight='bold')
 ax.set_ylabel('Temperature (°C)', fontsize=12, fontweight='bold')
 ax.legend(loc='best', fontsize=10, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('temperature_model_comparison.png', dpi=300, bbox_inches='tight')
-print("✓ Temperature comparison saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # HUMIDITY COMPARISON PLOT
 # ============================================================================
-humidity_train = train_data[humidity_col]
-humidity_test = test_data[humidity_col]
+humidity_train = train_data.series(humidity_col)
+humidity_test = test_data.series(humidity_col)
 
-arima_hum = ARIMA(humidity_train, order=(2, 1, 2)).fit()
-sarima_hum = SARIMAX(humidity_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)).fit(disp=False)
+with stage('fit', 'ARIMA/SARIMA Humidity'):
+    arima_order, sarima_order, sarima_seasonal_order = select_orders(humidity_train, auto=USE_AUTO_ORDER)
+    arima_hum = ARIMA(humidity_train, order=arima_order).fit()
+    sarima_hum = SARIMAX(humidity_train, order=sarima_order, seasonal_order=sarima_seasonal_order).fit(disp=False)
 
-arima_hum_pred = arima_hum.forecast(steps=len(humidity_test))
-sarima_hum_pred = sarima_hum.forecast(steps=len(humidity_test))
+with stage('predict', 'ARIMA/SARIMA Humidity'):
+    arima_hum_pred = arima_hum.forecast(steps=len(humidity_test))
+    sarima_hum_pred = sarima_hum.forecast(steps=len(humidity_test))
 
-fig, ax = plt.subplots(figsize=(15, 6))
+spec, ax = chart_spec('humidity_model_comparison.png', figsize=(15, 6), template='comparison')
 ax.plot(train_data.index, humidity_train, label='Training Data', color='#2E86AB', linewidth=2)
 ax.plot(test_data.index, humidity_test, label='Actual Test Data', color='#A23B72', linewidth=2, marker='o', markersize=3)
 ax.plot(test_data.index, arima_hum_pred, label='ARIMA Prediction', color='#F18F01', linewidth=2, linestyle='--')
@@ -90,24 +101,24 @@ ax.set_xlabel('Time', fontsize=12, fontweight='bold')
 ax.set_ylabel('Humidity (%)', fontsize=12, fontweight='bold')
 ax.legend(loc='best', fontsize=10, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('humidity_model_comparison.png', dpi=300, bbox_inches='tight')
-print("✓ Humidity comparison saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # PRESSURE COMPARISON PLOT
 # ============================================================================
-pressure_train = train_data[pressure_col]
-pressure_test = test_data[pressure_col]
+pressure_train = train_data.series(pressure_col)
+pressure_test = test_data.series(pressure_col)
 
-arima_press = ARIMA(pressure_train, order=(2, 1, 2)).fit()
-sarima_press = SARIMAX(pressure_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)).fit(disp=False)
+with stage('fit', 'ARIMA/SARIMA Pressure'):
+    arima_order, sarima_order, sarima_seasonal_order = select_orders(pressure_train, auto=USE_AUTO_ORDER)
+    arima_press = ARIMA(pressure_train, order=arima_order).fit()
+    sarima_press = SARIMAX(pressure_train, order=sarima_order, seasonal_order=sarima_seasonal_order).fit(disp=False)
 
-arima_press_pred = arima_press.forecast(steps=len(pressure_test))
-sarima_press_pred = sarima_press.forecast(steps=len(pressure_test))
+with stage('predict', 'ARIMA/SARIMA Pressure'):
+    arima_press_pred = arima_press.forecast(steps=len(pressure_test))
+    sarima_press_pred = sarima_press.forecast(steps=len(pressure_test))
 
-fig, ax = plt.subplots(figsize=(15, 6))
+spec, ax = chart_spec('pressure_model_comparison.png', figsize=(15, 6), template='comparison')
 ax.plot(train_data.index, pressure_train, label='Training Data', color='#2E86AB', linewidth=2)
 ax.plot(test_data.index, pressure_test, label='Actual Test Data', color='#A23B72', linewidth=2, marker='o', markersize=3)
 ax.plot(test_data.index, arima_press_pred, label='ARIMA Prediction', color='#F18F01', linewidth=2, linestyle='--')
@@ -117,24 +128,28 @@ ax.set_xlabel('Time', fontsize=12, fontweight='bold')
 ax.set_ylabel('Pressure (hPa)', fontsize=12, fontweight='bold')
 ax.legend(loc='best', fontsize=10, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('pressure_model_comparison.png', dpi=300, bbox_inches='tight')
-print("✓ Pressure comparison saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # DEW POINT COMPARISON PLOT
 # ============================================================================
-dew_train = train_data[dew_col]
-dew_test = test_data[dew_col]
-
-arima_dew = ARIMA(dew_train, order=(2, 1, 2)).fit()
-sarima_dew = SARIMAX(dew_train, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)).fit(disp=False)
-
-arima_dew_pred = arima_dew.forecast(steps=len(dew_test))
-sarima_dew_pred = sarima_dew.forecast(steps=len(dew_test))
-
-fig, ax = plt.subplots(figsize=(15, 6))
+dew_train = train_data.series(dew_col)
+dew_test = test_data.series(dew_col)
+
+if DERIVE_DEW_POINT:
+    arima_dew_pred = magnus_dew_point(arima_temp_pred, arima_hum_pred)
+    sarima_dew_pred = magnus_dew_point(sarima_temp_pred, sarima_hum_pred)
+else:
+    with stage('fit', 'ARIMA/SARIMA Dew Point'):
+        arima_order, sarima_order, sarima_seasonal_order = select_orders(dew_train, auto=USE_AUTO_ORDER)
+        arima_dew = ARIMA(dew_train, order=arima_order).fit()
+        sarima_dew = SARIMAX(dew_train, order=sarima_order, seasonal_order=sarima_seasonal_order).fit(disp=False)
+
+    with stage('predict', 'ARIMA/SARIMA Dew Point'):
+        arima_dew_pred = arima_dew.forecast(steps=len(dew_test))
+        sarima_dew_pred = sarima_dew.forecast(steps=len(dew_test))
+
+spec, ax = chart_spec('dewpoint_model_comparison.png', figsize=(15, 6), template='comparison')
 ax.plot(train_data.index, dew_train, label='Training Data', color='#2E86AB', linewidth=2)
 ax.plot(test_data.index, dew_test, label='Actual Test Data', color='#A23B72', linewidth=2, marker='o', markersize=3)
 ax.plot(test_data.index, arima_dew_pred, label='ARIMA Prediction', color='#F18F01', linewidth=2, linestyle='--')
@@ -144,10 +159,7 @@ ax.set_xlabel('Time', fontsize=12, fontweight='bold')
 ax.set_ylabel('Dew Point (°C)', fontsize=12, fontweight='bold')
 ax.legend(loc='best', fontsize=10, framealpha=0.9)
 ax.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.savefig('dewpoint_model_comparison.png', dpi=300, bbox_inches='tight')
-print("✓ Dew Point comparison saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # FUTURE FORECASTING (2:15 PM to 6:15 PM)
@@ -165,17 +177,24 @@ forecast_steps = 240
 
 # Train final models
 print("  Training final models on complete dataset...")
-final_arima_temp = ARIMA(full_temp, order=(2, 1, 2)).fit()
-final_arima_hum = ARIMA(full_humidity, order=(2, 1, 2)).fit()
-final_arima_press = ARIMA(full_pressure, order=(2, 1, 2)).fit()
-final_arima_dew = ARIMA(full_dew, order=(2, 1, 2)).fit()
+# One process pool for every parameter's order search
+with stage('fit', 'Final ARIMA'), candidate_pool() as pool:
+    final_arima_temp = ARIMA(full_temp, order=select_arima_order(full_temp, USE_AUTO_ORDER, pool)).fit()
+    final_arima_hum = ARIMA(full_humidity, order=select_arima_order(full_humidity, USE_AUTO_ORDER, pool)).fit()
+    final_arima_press = ARIMA(full_pressure, order=select_arima_order(full_pressure, USE_AUTO_ORDER, pool)).fit()
+    if not DERIVE_DEW_POINT:
+        final_arima_dew = ARIMA(full_dew, order=select_arima_order(full_dew, USE_AUTO_ORDER, pool)).fit()
 
 # Generate forecasts
 print("  Generating forecasts...")
-future_temp = final_arima_temp.forecast(steps=forecast_steps)
-future_humidity = final_arima_hum.forecast(steps=forecast_steps)
-future_pressure = final_arima_press.forecast(steps=forecast_steps)
-future_dew = final_arima_dew.forecast(steps=forecast_steps)
+with stage('predict', 'Final ARIMA'):
+    future_temp = final_arima_temp.forecast(steps=forecast_steps)
+    future_humidity = final_arima_hum.forecast(steps=forecast_steps)
+    future_pressure = final_arima_press.forecast(steps=forecast_steps)
+    if DERIVE_DEW_POINT:
+        future_dew = magnus_dew_point(future_temp, future_humidity)
+    else:
+        future_dew = final_arima_dew.forecast(steps=forecast_steps)
 
 # Create future datetime index
 last_time = df.index[-1]
@@ -198,8 +217,8 @@ forecast_df['Date'] = '26-11-2025'
 forecast_df = forecast_df[['Date', 'Time', 'Temperature (°C)', 'Humidity (%)', 'Pressure (hPa)', 'Dew Point (°C)']]
 
 # Save forecast
-forecast_df.to_excel('future_forecast_2pm_to_6pm.xlsx', index=False)
-print("✓ Future forecast saved: future_forecast_2pm_to_6pm.xlsx")
+forecast_file = write_frame(forecast_df, 'future_forecast_2pm_to_6pm.xlsx')
+print(f"✓ Future forecast saved: {forecast_file}")
 
 print(f"\nForecast Summary:")
 print(f"  Temperature: {forecast_df['Temperature (°C)'].min():.1f}°C - {forecast_df['Temperature (°C)'].max():.1f}°C")
@@ -212,7 +231,7 @@ print(f"  Dew Point: {forecast_df['Dew Point (°C)'].min():.1f}°C - {forecast_d
 # ============================================================================
 print("\n[STEP 3] Creating future forecast visualizations...")
 
-fig, axes = plt.subplots(4, 1, figsize=(16, 14))
+spec, axes = chart_spec('future_forecast_visualization.png', 4, 1, figsize=(16, 14))
 
 # Temperature
 axes[0].plot(df.index, df[temp_col], label='Historical Data', color='#2E86AB', linewidth=2)
@@ -251,10 +270,7 @@ axes[3].set_xlabel('Time', fontsize=12, fontweight='bold')
 axes[3].legend(loc='best', fontsize=10)
 axes[3].grid(True, alpha=0.3)
 
-plt.tight_layout()
-plt.savefig('future_forecast_visualization.png', dpi=300, bbox_inches='tight')
-print("✓ Future forecast visualization saved")
-plt.close()
+charts.append(spec)
 
 # ============================================================================
 # PERFORMANCE COMPARISON BAR CHARTS
@@ -262,7 +278,8 @@ plt.close()
 print("\n[STEP 4] Creating performance comparison charts...")
 
 # Load performance metrics
-perf_df = pd.read_excel('model_performance_metrics.xlsx')
+with stage('load', 'model_performance_metrics.xlsx'):
+    perf_df = pd.read_excel('model_performance_metrics.xlsx')
 
 # Create subplots for each parameter
 parameters = ['Temperature', 'Humidity', 'Pressure', 'Dew Point']
@@ -271,28 +288,26 @@ metrics = ['RMSE', 'MAE', 'MAPE', 'R²']
 for param in parameters:
     param_data = perf_df[perf_df['Parameter'] == param]
     
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-    fig.suptitle(f'{param} - Model Performance Comparison', fontsize=16, fontweight='bold')
+    spec, axes = chart_spec(f'{param.lower()}_performance_comparison.png', 2, 2, figsize=(14, 10),
+                            template='performance')
+    spec.suptitle(f'{param} - Model Performance Comparison', fontsize=16, fontweight='bold')
     
     for idx, metric in enumerate(metrics):
         ax = axes[idx // 2, idx % 2]
         models = param_data['Model']
         values = param_data[metric]
         
-        bars = ax.bar(models, values, color=['#FF6B6B', '#4ECDC4', '#95E1D3'], edgecolor='black', linewidth=1.5)
+        ax.bar(models, values, color=['#FF6B6B', '#4ECDC4', '#95E1D3'], edgecolor='black', linewidth=1.5)
         ax.set_title(f'{metric}', fontsize=12, fontweight='bold')
         ax.set_ylabel(metric, fontsize=10)
         ax.grid(True, alpha=0.3, axis='y')
         
         # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{height:.4f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
+        ax.bar_labels('{:.4f}', fontsize=9, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(f'{param.lower()}_performance_comparison.png', dpi=300, bbox_inches='tight')
-    print(f"✓ {param} performance chart saved")
-    plt.close()
+    charts.append(spec)
+
+print("\n[STEP 5] Rendering charts...")
+render_charts(charts)
 
 print("\n✓ All visualizations completed!")
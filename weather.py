@@ -0,0 +1,140 @@
+"""
+Weather CLI - One entry point for the whole pipeline
+    python weather.py {ingest,analyze,train,forecast,render,serve,backtest,runs,profile,benchmark} ...
+Only the standard library is imported at startup: each subcommand imports the
+modules it needs when it runs, so --help and the history queries answer at once
+"""
+
+import argparse
+import datetime
+import importlib
+import os
+import subprocess
+import sys
+
+from stage_profile import RUN_ENV
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Pipeline scripts run by each subcommand, in order for 'all'
+ANALYZE_SCRIPT = 'complete_weather_analysis.py'
+TRAIN_SCRIPTS = {
+    'arima': 'model_training_forecasting.py',
+    'polynomial': 'polynomial_regression_model.py',
+    'prophet': 'prophet_forecasting_model.py',
+    'best': 'best_model_final.py'
+}
+FORECAST_SCRIPTS = {
+    'arima': 'visualization_future_forecast.py',
+    'best': 'best_model_future_forecast.py',
+    'prophet': 'prophet_future_forecast.py'
+}
+RENDER_SCRIPTS = {
+    'best': 'best_model_visualizations.py',
+    'prophet': 'prophet_visualizations.py'
+}
+
+# Subcommands handed to a module's main(argv) with the rest of the command line
+TOOL_COMMANDS = {
+    'ingest': ('generate_weather_data', 'Generate synthetic sensor readings (--rows, --output)'),
+    'backtest': ('backtest', 'Rolling-origin backtest of every model family'),
+    'runs': ('run_store', 'Query the model run history'),
+    'profile': ('stage_profile', 'Show or compare per-stage pipeline profiles'),
+    'benchmark': ('benchmark', 'Time the hot paths across data sizes')
+}
+
+
+def run_scripts(scripts):
+    """
+    Run pipeline scripts one after another, each in its own interpreter like run_all.py
+    Returns: Exit status of the first failing script, or 0
+    """
+    # One profile run directory for everything this command runs
+    os.environ.setdefault(RUN_ENV, datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+    for script in scripts:
+        print(f"\n{'='*80}\nRunning: {script}\n{'='*80}\n")
+        status = subprocess.call([sys.executable, os.path.join(HERE, script)])
+        if status:
+            print(f"\n✗ {script} failed (exit status {status})")
+            return status
+    return 0
+
+
+def _choose(table, choice):
+    """Scripts for one key of a script table, or all of them for 'all'"""
+    return list(table.values()) if choice == 'all' else [table[choice]]
+
+
+def run_tool(module, argv):
+    """Import a module only now and run its command line"""
+    return importlib.import_module(module).main(argv) or 0
+
+
+def serve(argv):
+    """Forecast API, or the live dashboard with --dashboard; other options go to the server"""
+    if '--dashboard' in argv:
+        argv = [arg for arg in argv if arg != '--dashboard']
+        return run_tool('live_dashboard', argv)
+    return run_tool('forecast_server', argv)
+
+
+def render(target):
+    """Flowcharts and diagrams in this process, chart scripts in their own"""
+    if target in ('diagrams', 'all'):
+        importlib.import_module('diagram_engine').main()
+    if target == 'diagrams':
+        return 0
+    return run_scripts(_choose(RENDER_SCRIPTS, target))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='weather', description='IoT weather analysis and forecasting pipeline')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    commands.required = True
+
+    def tool(name):
+        # The module parses its own options (and answers its own --help)
+        commands.add_parser(name, help=TOOL_COMMANDS[name][1], add_help=False)
+
+    tool('ingest')
+    commands.add_parser('analyze', help='Exploratory analysis: statistics, correlation, stationarity')
+
+    train = commands.add_parser('train', help='Train and evaluate models, recording metrics in the run history')
+    train.add_argument('model', nargs='?', choices=list(TRAIN_SCRIPTS) + ['all'], default='arima')
+
+    forecast = commands.add_parser('forecast', help='Forecast 2 PM - 6 PM from the trained models')
+    forecast.add_argument('model', nargs='?', choices=list(FORECAST_SCRIPTS) + ['all'], default='arima')
+
+    render_parser = commands.add_parser('render', help='Render charts and diagrams')
+    render_parser.add_argument('target', nargs='?', choices=['diagrams'] + list(RENDER_SCRIPTS) + ['all'],
+                               default='all')
+
+    commands.add_parser('serve', help='Forecast HTTP API (--dashboard: live SSE dashboard)', add_help=False)
+    for name in ['backtest', 'runs', 'profile', 'benchmark']:
+        tool(name)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+
+    if args.command in TOOL_COMMANDS:
+        return run_tool(TOOL_COMMANDS[args.command][0], rest)
+    if args.command == 'serve':
+        return serve(rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if args.command == 'analyze':
+        return run_scripts([ANALYZE_SCRIPT])
+    if args.command == 'train':
+        return run_scripts(_choose(TRAIN_SCRIPTS, args.model))
+    if args.command == 'forecast':
+        return run_scripts(_choose(FORECAST_SCRIPTS, args.model))
+    if args.command == 'render':
+        return render(args.target)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""
+Weather Data Access - Shared column names and sensor data loaders
+Used by the analysis, modeling and streaming modules; pandas is imported by
+the loaders themselves, so importing the column names stays instant
+"""
+
+import os
+
+from stage_profile import stage
+
+# Default data file and timestamp format written by generate_weather_data.py
+DATA_FILE = 'iot_sensor_readings.xlsx'
+DATETIME_FORMAT = '%d-%m-%Y %I:%M:%S %p'
+
+# Column names
+TEMP_COL = 'Temperature (°C)'
+HUMIDITY_COL = 'Humidity (%)'
+PRESSURE_COL = 'Pressure (hPa)'
+DEW_COL = 'Dew Point (°C)'
+STATION_COL = 'Station'
+
+PARAMETER_COLUMNS = [TEMP_COL, HUMIDITY_COL, PRESSURE_COL, DEW_COL]
+PARAMETER_NAMES = {
+    TEMP_COL: 'Temperature',
+    HUMIDITY_COL: 'Humidity',
+    PRESSURE_COL: 'Pressure',
+    DEW_COL: 'Dew Point'
+}
+
+# Single-station files have no station column
+DEFAULT_STATION = 'Gurugram'
+
+
+def add_datetime(df):
+    """
+    Parse the 'Date' and 'Time' text columns into a 'DateTime' column
+    df: DataFrame as written by generate_weather_data.py
+    Returns: The same DataFrame with 'DateTime' added
+    """
+    import pandas as pd
+
+    if 'DateTime' not in df.columns:
+        df['DateTime'] = pd.to_datetime(df['Date'] + ' ' + df['Time'], format=DATETIME_FORMAT)
+    return df
+
+
+@stage('load')
+def load_sensor_data(path=DATA_FILE):
+    """
+    Load a complete sensor file sorted by time
+    path: .xlsx, .csv or .parquet file
+    Returns: DataFrame with a 'DateTime' column
+    """
+    import pandas as pd
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        df = pd.read_csv(path)
+    elif ext == '.parquet':
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path)
+    df = add_datetime(df)
+    return df.sort_values('DateTime')
+
+
+def _iter_excel_chunks(path, chunksize):
+    """Read an .xlsx sheet row by row with openpyxl in read-only mode"""
+    import openpyxl
+    import pandas as pd
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = list(next(rows))
+        buffer = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= chunksize:
+                yield pd.DataFrame(buffer, columns=header)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=header)
+    finally:
+        workbook.close()
+
+
+def _iter_parquet_chunks(path, chunksize):
+    """Read a Parquet file one record batch at a time"""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+def iter_sensor_chunks(path=DATA_FILE, chunksize=50000):
+    """
+    Iterate over a sensor file in chunks without loading it whole
+    path: .xlsx, .csv or .parquet file
+    chunksize: Rows per chunk
+    Yields: DataFrames with a 'DateTime' column, in file order
+    """
+    import pandas as pd
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        chunks = pd.read_csv(path, chunksize=chunksize)
+    elif ext == '.parquet':
+        chunks = _iter_parquet_chunks(path, chunksize)
+    else:
+        chunks = _iter_excel_chunks(path, chunksize)
+
+    for chunk in chunks:
+        yield add_datetime(chunk)
+
+
+def station_of(df):
+    """
+    Station labels for every row of a chunk
+    Returns: numpy array of station names
+    """
+    import numpy as np
+
+    if STATION_COL in df.columns:
+        return df[STATION_COL].astype(str).values
+    return np.full(len(df), DEFAULT_STATION, dtype=object)